@@ -0,0 +1,190 @@
+import arviz as az
+import numpy as np
+import pymc as pm
+import xarray as xr
+
+
+from pymc.step_methods.hmc.quadpotential import QuadPotentialDiagAdapt
+
+
+# had diagnostik bagi 'diagnostik'. r_hat di atas RHAT_MAKS, ESS bulk di bawah
+# ESS_MIN_SERANTAI bagi setiap rantai atau sebarang divergens bermakna model perlu
+# dilatih semula sepenuhnya.
+RHAT_MAKS: float = 1.01
+ESS_MIN_SERANTAI: int = 100
+
+# berat anggaran jisim daripada posterior lama, dalam bilangan draw setara.
+BERAT_JISIM: int = 100
+
+
+def _draw_terjelma(model_pymc: pm.Model, idata: az.InferenceData) -> dict:
+    '''
+    Mengembalikan draw posterior lama dalam ruang tanpa kekangan (ruang nilai NUTS)
+    bagi setiap pemboleh ubah nilai model, disusun semula mengikut koordinat model
+    baharu. Aras baharu (contohnya tahun:Ticker bagi tahun baharu) bernilai NaN.
+
+    Returns:
+        dict: Kamus nama pemboleh ubah nilai kepada tatasusunan (draw, *bentuk).
+    '''
+    posterior = idata.posterior.stack(sampel=("chain", "draw"))
+    semua_draw: dict = dict()
+
+    for nilai_var in model_pymc.continuous_value_vars:
+        rv = model_pymc.values_to_rvs[nilai_var]
+
+        if rv.name not in posterior:
+            continue
+
+        x: xr.DataArray = posterior[rv.name]
+
+        for dimensi in model_pymc.named_vars_to_dims.get(rv.name, ()):
+            x = x.reindex({dimensi: list(model_pymc.coords[dimensi])})
+
+        x = x.transpose("sampel", ...)
+        jelmaan = model_pymc.rvs_to_transforms.get(rv)
+        draw: np.ndarray = x.to_numpy()
+
+        if jelmaan is not None:
+            draw = jelmaan.forward(draw, *rv.owner.inputs).eval()
+
+        semua_draw[nilai_var.name] = draw
+
+    return semua_draw
+
+
+def titik_mula(
+        model_pymc: pm.Model,
+        idata: az.InferenceData,
+        bil_rantai: int,
+        benih: int = 0,
+    ) -> list:
+    '''
+    Memilih satu draw rawak daripada posterior lama sebagai titik mula bagi setiap
+    rantai. Aras baharu bermula pada titik mula lalai model.
+
+    Returns:
+        list: Senarai kamus initvals (nama pemboleh ubah rawak kepada nilai dalam ruang
+        asal), satu bagi setiap rantai, untuk 'pm.sample(initvals=...)'.
+    '''
+    rng: np.random.Generator = np.random.default_rng(benih)
+    semua_draw: dict = _draw_terjelma(model_pymc, idata)
+    titik_lalai: dict = model_pymc.initial_point()
+    semua_titik: list = []
+
+    for _ in range(bil_rantai):
+        titik: dict = dict()
+
+        for nilai_var in model_pymc.continuous_value_vars:
+            if nilai_var.name not in semua_draw:
+                continue
+
+            draw: np.ndarray = semua_draw[nilai_var.name]
+            nilai: np.ndarray = draw[rng.integers(len(draw))]
+            nilai = np.where(np.isnan(nilai), titik_lalai[nilai_var.name], nilai)
+
+            rv = model_pymc.values_to_rvs[nilai_var]
+            jelmaan = model_pymc.rvs_to_transforms.get(rv)
+
+            if jelmaan is not None:
+                nilai = jelmaan.backward(nilai, *rv.owner.inputs).eval()
+
+            titik[rv.name] = nilai
+
+        semua_titik.append(titik)
+
+    return semua_titik
+
+
+def langkah_nuts(
+        model_pymc: pm.Model,
+        idata: az.InferenceData,
+        target_accept: float,
+    ) -> pm.NUTS:
+    '''
+    Membina langkah NUTS yang meneruskan penyesuaian daripada larian lama: matriks
+    jisim pepenjuru bermula daripada varians posterior lama (dengan berat BERAT_JISIM
+    draw) dan saiz langkah bermula daripada median saiz langkah akhir larian lama.
+    Penyesuaian diteruskan semasa tune, jadi tune yang lebih pendek mencukupi jika
+    hanya bulan terbaharu berubah.
+    '''
+    semua_draw: dict = _draw_terjelma(model_pymc, idata)
+    titik_lalai: dict = model_pymc.initial_point()
+    semua_purata: list = []
+    semua_varians: list = []
+
+    for nilai_var in model_pymc.continuous_value_vars:
+        lalai: np.ndarray = np.ravel(titik_lalai[nilai_var.name])
+
+        if nilai_var.name not in semua_draw:
+            semua_purata.append(lalai)
+            semua_varians.append(np.ones_like(lalai))
+            continue
+
+        draw: np.ndarray = semua_draw[nilai_var.name].reshape(len(semua_draw[nilai_var.name]), -1)
+        purata: np.ndarray = draw.mean(axis=0)
+        varians: np.ndarray = draw.var(axis=0)
+
+# aras baharu: purata lalai, dan varians median aras lain pemboleh ubah yang sama.
+        baharu: np.ndarray = np.isnan(purata)
+        purata[baharu] = lalai[baharu]
+        varians[baharu] = np.nanmedian(varians) if (~baharu).any() else 1.
+
+        semua_purata.append(purata)
+        semua_varians.append(np.maximum(varians, 1e-8))
+
+    purata: np.ndarray = np.concatenate(semua_purata)
+    varians: np.ndarray = np.concatenate(semua_varians)
+
+    potensi: QuadPotentialDiagAdapt = QuadPotentialDiagAdapt(
+        len(purata), purata, varians, BERAT_JISIM
+    )
+    saiz_langkah: float = float(idata.sample_stats["step_size"].median())
+
+# NUTS memulakan saiz langkah pada step_scale / n^(1/4).
+    with model_pymc:
+        return pm.NUTS(
+            potential=potensi,
+            step_scale=saiz_langkah * len(purata) ** .25,
+            target_accept=target_accept,
+        )
+
+
+def diagnostik(idata: az.InferenceData, mcmc: bool = True) -> dict:
+    '''
+    Meringkaskan diagnostik penumpuan posterior.
+
+    Args:
+        idata (az.InferenceData): Posterior.
+        mcmc (bool): False bagi anggaran posterior (contohnya ADVI atau Pathfinder),
+        yang diagnostik penumpuan MCMC tidak bermakna.
+
+    Returns:
+        dict: Kamus dengan kunci 'rhat_maks', 'ess_bulk_min', 'ess_tail_min',
+        'divergens' dan 'perlu_latih_penuh' (True jika mana-mana had dilanggar atau
+        r_hat NaN), atau None jika posterior bukan MCMC atau hanya satu rantai, kerana
+        r_hat tidak dapat dikira.
+    '''
+    bil_rantai: int = idata.posterior.sizes["chain"]
+
+    if not mcmc or bil_rantai < 2:
+        return None
+
+    ringkasan = az.summary(idata, kind="diagnostics")
+    divergens: int = 0
+
+    if "sample_stats" in idata and "diverging" in idata.sample_stats:
+        divergens = int(idata.sample_stats["diverging"].sum())
+
+    hasil: dict = {
+        "rhat_maks": float(ringkasan["r_hat"].max()),
+        "ess_bulk_min": float(ringkasan["ess_bulk"].min()),
+        "ess_tail_min": float(ringkasan["ess_tail"].min()),
+        "divergens": divergens,
+    }
+    hasil["perlu_latih_penuh"] = bool(
+        not hasil["rhat_maks"] <= RHAT_MAKS
+        or min(hasil["ess_bulk_min"], hasil["ess_tail_min"]) < ESS_MIN_SERANTAI * bil_rantai
+        or divergens > 0
+    )
+
+    return hasil
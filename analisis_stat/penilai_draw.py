@@ -0,0 +1,190 @@
+import math
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+# bilangan draw posterior yang dinilai serentak dalam 'ringkas_draw'; memori puncak
+# ialah kira-kira SAIZ_CEBISAN_DRAW x bilangan baris nilai.
+SAIZ_CEBISAN_DRAW: int = 500
+
+
+def _sebutan(posterior: xr.Dataset, baris: pd.DataFrame, istilah: list) -> list:
+    '''
+    Menukar setiap istilah peramal linear kepada draw posteriornya, indeks aras bagi
+    setiap baris dan pekali bagi setiap baris.
+
+    Istilah 'Intercept' mempunyai pekali 1; istilah umum lain ialah lajur berangka
+    dalam baris. Istilah kumpulan 'ungkapan|faktor' (contohnya 'bulan|tahun:Ticker')
+    mempunyai satu aras bagi setiap label faktor (contohnya '2025:1155.KL') dan
+    pekali 1 (bagi '1') atau lajur ungkapan.
+
+    Returns:
+        list: Senarai tuple (draw, indeks, pekali). draw ialah pandangan (sampel,
+        aras) ke atas posterior tanpa salinan, indeks ialah aras setiap baris (atau
+        None bagi istilah tanpa aras) dan pekali ialah tatasusunan atau None bagi 1.
+    '''
+    semua_sebutan: list = []
+
+    for nama in istilah:
+        if "|" not in nama:
+            draw: np.ndarray = posterior[nama].transpose("chain", "draw").to_numpy()
+            pekali = None if nama == "Intercept" else baris[nama].to_numpy()
+            semua_sebutan.append((draw.reshape(-1, 1), None, pekali))
+            continue
+
+        ungkapan, _, faktor = nama.partition("|")
+        dimensi: str = f'{faktor}__factor_dim'
+        semua_lajur: list = faktor.split(":")
+        label: pd.Series = baris[semua_lajur[0]].astype(str)
+
+        for lajur in semua_lajur[1:]:
+            label = label + ":" + baris[lajur].astype(str)
+
+        indeks: np.ndarray = posterior.indexes[dimensi].get_indexer(label.to_numpy())
+
+        if (indeks < 0).any():
+            raise KeyError(f'Aras {nama} tiada dalam posterior: {set(label[indeks < 0])}')
+
+        draw = posterior[nama].transpose("chain", "draw", dimensi).to_numpy()
+        pekali = None if ungkapan == "1" else baris[ungkapan].to_numpy()
+
+        semua_sebutan.append((draw.reshape(-1, draw.shape[-1]), indeks, pekali))
+
+    return semua_sebutan
+
+
+def nilai_draw(
+        posterior: xr.Dataset,
+        baris: pd.DataFrame,
+        istilah: list,
+        saiz_cebisan: int = SAIZ_CEBISAN_DRAW,
+        jenis: str = "float64",
+    ):
+    '''
+    Menilai peramal linear bagi setiap baris dan setiap draw posterior, satu cebisan
+    draw pada satu masa.
+
+    Args:
+        posterior (xr.Dataset): Posterior (chain, draw) model.
+        baris (pd.DataFrame): Baris ramalan dengan lajur yang digunakan oleh istilah.
+        istilah (list): Nama istilah peramal linear, contohnya
+        ['Intercept', '1|Ticker', '1|tahun:Ticker', 'bulan|tahun:Ticker'].
+        saiz_cebisan (int): Bilangan draw bagi setiap cebisan.
+        jenis (str): Jenis data cebisan, 'float64' atau 'float32'.
+
+    Yields:
+        np.ndarray: Tatasusunan (draw cebisan, baris).
+    '''
+    semua_sebutan: list = _sebutan(posterior, baris, istilah)
+    bil_sampel: int = posterior.sizes["chain"] * posterior.sizes["draw"]
+
+    for mula in range(0, bil_sampel, saiz_cebisan):
+        cebisan: np.ndarray = np.zeros(
+            (min(saiz_cebisan, bil_sampel - mula), len(baris)), dtype=jenis
+        )
+
+        for draw, indeks, pekali in semua_sebutan:
+            nilai: np.ndarray = draw[mula:mula + saiz_cebisan]
+            nilai = (nilai[:, indeks] if indeks is not None else nilai).astype(jenis, copy=False)
+
+            if pekali is not None:
+                nilai = nilai * pekali.astype(jenis, copy=False)
+
+            cebisan += nilai
+
+        yield cebisan
+
+
+def ringkas_draw(
+        posterior: xr.Dataset,
+        baris: pd.DataFrame,
+        istilah: list,
+        kuantil: list,
+        saiz_cebisan: int = SAIZ_CEBISAN_DRAW,
+        jenis: str = "float64",
+        hdi_prob: float = None,
+    ) -> np.ndarray:
+    '''
+    Mengira purata, kuantil dan HDI peramal linear bagi setiap baris tanpa menyimpan
+    matriks penuh draw x baris.
+
+    Purata dikumpul dalam float64. Bagi kuantil q, hanya statistik tertib yang
+    diperlukan untuk interpolasi linear (kaedah lalai 'np.quantile') disimpan: k nilai
+    terkecil bagi q <= 0.5 dan k nilai terbesar bagi q > 0.5, dikemas kini dengan
+    'np.partition' bagi setiap cebisan. Hasilnya sama dengan 'np.quantile' atas semua
+    draw, tetapi memori hanya kira-kira (saiz_cebisan + 2k) x baris. Bagi kuantil 3% dan
+    97% daripada 16000 draw, k ialah 481.
+
+    HDI dikira seperti 'az.hdi': dengan m = floor(hdi_prob x n), selang terpendek
+    [x(i), x(i + m)] bagi i < n - m. Hujung bawah setiap selang ialah salah satu n - m
+    nilai terkecil dan hujung atasnya salah satu n - m nilai terbesar, jadi k = n - m
+    (960 bagi HDI 94% daripada 16000 draw) dan hasilnya sama dengan 'az.hdi'.
+
+    Args:
+        posterior, baris, istilah, saiz_cebisan, jenis: Seperti 'nilai_draw'.
+        kuantil (list): Kuantil dalam (0, 1), contohnya [0.03, 0.97], atau [].
+        hdi_prob (float): Kebarangkalian HDI, contohnya 0.94. Jika None, HDI tidak
+        dikira.
+
+    Returns:
+        np.ndarray: Tatasusunan (baris, 1 + len(kuantil)) dengan purata diikuti kuantil,
+        ditambah dua lajur (had bawah dan atas HDI) jika hdi_prob diberi.
+    '''
+    bil_sampel: int = posterior.sizes["chain"] * posterior.sizes["draw"]
+    kedudukan: list = [q * (bil_sampel - 1) for q in kuantil]
+    k_hdi: int = 0 if hdi_prob is None else bil_sampel - math.floor(hdi_prob * bil_sampel)
+
+# bilangan statistik tertib terkecil dan terbesar yang perlu disimpan.
+    k_bawah: int = max(
+        [min(math.floor(h) + 2, bil_sampel) for q, h in zip(kuantil, kedudukan) if q <= .5],
+        default=0,
+    )
+    k_atas: int = max(
+        [bil_sampel - math.floor(h) for q, h in zip(kuantil, kedudukan) if q > .5],
+        default=0,
+    )
+    k_bawah, k_atas = max(k_bawah, k_hdi), max(k_atas, k_hdi)
+
+    jumlah: np.ndarray = np.zeros(len(baris), dtype="float64")
+    bawah: np.ndarray = np.empty((len(baris), 0), dtype=jenis)
+    atas: np.ndarray = np.empty((len(baris), 0), dtype=jenis)
+
+    for cebisan in nilai_draw(posterior, baris, istilah, saiz_cebisan, jenis):
+        jumlah += cebisan.sum(axis=0, dtype="float64")
+
+        if k_bawah:
+            bawah = np.concatenate([bawah, cebisan.T], axis=1)
+
+            if bawah.shape[1] > k_bawah:
+                bawah = np.partition(bawah, k_bawah - 1, axis=1)[:, :k_bawah]
+
+        if k_atas:
+            atas = np.concatenate([atas, cebisan.T], axis=1)
+
+            if atas.shape[1] > k_atas:
+                atas = np.partition(atas, atas.shape[1] - k_atas, axis=1)[:, -k_atas:]
+
+    bawah = np.sort(bawah, axis=1)
+    atas = np.sort(atas, axis=1)
+    hasil: list = [jumlah / bil_sampel]
+
+    for q, h in zip(kuantil, kedudukan):
+        rendah: int = math.floor(h)
+        tinggi: int = min(rendah + 1, bil_sampel - 1)
+
+# statistik tertib ke-i ialah bawah[:, i], atau atas[:, i - (bil_sampel - k_atas)].
+        tertib: tuple = (
+            (bawah[:, rendah], bawah[:, tinggi]) if q <= .5
+            else (atas[:, rendah - bil_sampel + k_atas], atas[:, tinggi - bil_sampel + k_atas])
+        )
+        hasil.append(tertib[0] + (h - rendah) * (tertib[1] - tertib[0]))
+
+    if k_hdi:
+# lebar selang ke-i ialah x(i + m) - x(i), iaitu atas[:, -k_hdi:] - bawah[:, :k_hdi].
+        lebar: np.ndarray = np.subtract(atas[:, -k_hdi:], bawah[:, :k_hdi], dtype="float64")
+        i: np.ndarray = lebar.argmin(axis=1)
+        semua_baris: np.ndarray = np.arange(len(baris))
+        hasil += [bawah[semua_baris, i], atas[semua_baris, i + k_atas - k_hdi]]
+
+    return np.column_stack(hasil).astype("float64")
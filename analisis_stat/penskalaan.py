@@ -0,0 +1,149 @@
+import json
+import numpy as np
+import pandas as pd
+
+
+class PenskalaKumpulan:
+    '''
+    Penskala piawai bagi setiap kumpulan (contohnya setiap ticker), setara dengan satu
+    StandardScaler sklearn bagi setiap kumpulan.
+
+    Purata dan sisihan piawai (ddof=0) semua kumpulan dikira dalam satu penurunan
+    groupby dan disimpan sebagai tatasusunan yang sejajar dengan 'kumpulan'. Penjelmaan
+    ke hadapan dan songsang bagi sebarang bilangan lajur dilakukan serentak dengan
+    pengindeksan NumPy, tanpa gelung bagi setiap kumpulan. Parameter boleh disimpan
+    ke file JSON dan dimuat semula, supaya ramalan boleh dikembalikan ke skala asal
+    tanpa memadankan semula penskala.
+
+    Contoh:
+        penskala = PenskalaKumpulan().padan(data["Ticker"], data["Close"])
+        data["harga_piawai"] = penskala.jelmakan(data["Ticker"], data["Close"])
+        ramalan[["harga_ramalan", "bawah", "atas"]] = penskala.jelmakan_songsang(
+            ramalan["Ticker"], ramalan[["estimate", "lower_3.0%", "upper_97.0%"]]
+        )
+
+    Catatan:
+        - Seperti StandardScaler, sisihan piawai sifar digantikan dengan 1.
+    '''
+    def __init__(
+            self,
+            kumpulan: list = None,
+            purata: np.ndarray = None,
+            sisihan: np.ndarray = None,
+        ) -> None:
+        self.kumpulan: pd.Index = pd.Index([] if kumpulan is None else kumpulan)
+        self.purata: np.ndarray = np.asarray([] if purata is None else purata, dtype=np.float64)
+        self.sisihan: np.ndarray = np.asarray([] if sisihan is None else sisihan, dtype=np.float64)
+
+    def padan(self, kumpulan: pd.Series, nilai: pd.Series) -> "PenskalaKumpulan":
+        '''
+        Mengira purata dan sisihan piawai (ddof=0) nilai bagi setiap kumpulan.
+
+        Args:
+            kumpulan (pd.Series): Label kumpulan bagi setiap baris.
+            nilai (pd.Series): Nilai bagi setiap baris. Nilai kosong (NaN) diabaikan.
+
+        Returns:
+            PenskalaKumpulan: Objek ini sendiri.
+        '''
+        kumpulan_nilai = (
+            pd.Series(np.asarray(nilai, dtype=np.float64), index=pd.Index(kumpulan))
+            .groupby(level=0, observed=True, sort=True)
+        )
+        purata: pd.Series = kumpulan_nilai.mean()
+        sisihan: np.ndarray = kumpulan_nilai.std(ddof=0).to_numpy()
+
+        self.kumpulan = pd.Index(purata.index.astype(object))
+        self.purata = purata.to_numpy()
+        self.sisihan = np.where(sisihan == 0, 1., sisihan)
+
+        return self
+
+    def _indeks(self, kumpulan) -> np.ndarray:
+        indeks: np.ndarray = self.kumpulan.get_indexer(np.asarray(kumpulan, dtype=object))
+
+        if (indeks < 0).any():
+            tiada: list = sorted(set(np.asarray(kumpulan, dtype=object)[indeks < 0]))
+            raise KeyError(f'Kumpulan tiada dalam penskala: {tiada[:5]}')
+
+        return indeks
+
+    def _jelma(self, kumpulan, nilai, songsang: bool):
+        x: np.ndarray = np.asarray(nilai)
+        jenis: np.dtype = x.dtype if np.issubdtype(x.dtype, np.floating) else np.float64
+        indeks: np.ndarray = self._indeks(kumpulan)
+
+        purata: np.ndarray = self.purata[indeks].astype(jenis)
+        sisihan: np.ndarray = self.sisihan[indeks].astype(jenis)
+
+        if x.ndim == 2:
+            purata, sisihan = purata[:, None], sisihan[:, None]
+
+        hasil: np.ndarray = x * sisihan + purata if songsang else (x - purata) / sisihan
+
+        if isinstance(nilai, pd.DataFrame):
+            return pd.DataFrame(hasil, index=nilai.index, columns=nilai.columns)
+        if isinstance(nilai, pd.Series):
+            return pd.Series(hasil, index=nilai.index, name=nilai.name)
+
+        return hasil
+
+    def jelmakan(self, kumpulan, nilai):
+        '''
+        Mengembalikan (nilai - purata) / sisihan bagi kumpulan setiap baris.
+
+        Args:
+            kumpulan: Label kumpulan bagi setiap baris.
+            nilai: Series, DataFrame atau tatasusunan (1-D atau 2-D, satu baris bagi
+            setiap label). Semua lajur dijelmakan dengan parameter kumpulan baris itu.
+
+        Returns:
+            Jenis yang sama seperti nilai (Series, DataFrame atau tatasusunan), dengan
+            jenis data titik terapung yang sama.
+        '''
+        return self._jelma(kumpulan, nilai, songsang=False)
+
+    def jelmakan_songsang(self, kumpulan, nilai):
+        '''
+        Mengembalikan nilai * sisihan + purata bagi kumpulan setiap baris, iaitu
+        songsangan 'jelmakan'.
+        '''
+        return self._jelma(kumpulan, nilai, songsang=True)
+
+    def padan_jelmakan(self, kumpulan: pd.Series, nilai: pd.Series):
+        '''
+        Memadankan penskala dan mengembalikan nilai yang telah dijelmakan.
+        '''
+        return self.padan(kumpulan, nilai).jelmakan(kumpulan, nilai)
+
+    def ke_kamus(self) -> dict:
+        '''
+        Mengembalikan parameter penskala sebagai kamus yang boleh ditukar kepada JSON.
+        '''
+        return {
+            "kumpulan": [str(k) for k in self.kumpulan],
+            "purata": self.purata.tolist(),
+            "sisihan": self.sisihan.tolist(),
+        }
+
+    @classmethod
+    def dari_kamus(cls, kamus: dict) -> "PenskalaKumpulan":
+        '''
+        Membina penskala daripada kamus 'ke_kamus'.
+        '''
+        return cls(kamus["kumpulan"], kamus["purata"], kamus["sisihan"])
+
+    def simpan(self, alamat: str) -> None:
+        '''
+        Menyimpan parameter penskala ke file JSON.
+        '''
+        with open(alamat, mode="w", encoding="utf-8") as f:
+            json.dump(self.ke_kamus(), f, ensure_ascii=False)
+
+    @classmethod
+    def muat(cls, alamat: str) -> "PenskalaKumpulan":
+        '''
+        Memuat penskala daripada file JSON 'simpan'.
+        '''
+        with open(alamat, mode="r", encoding="utf-8") as f:
+            return cls.dari_kamus(json.load(f))
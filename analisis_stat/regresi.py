@@ -1,8 +1,10 @@
 import numpy as np
 import pandas as pd
 import warnings
+import zlib
 
 
+from functools import lru_cache
 from scipy.stats import linregress, t
 from sklearn.linear_model import RANSACRegressor as ransac
 from sklearn.exceptions import UndefinedMetricWarning
@@ -11,7 +13,7 @@ from sklearn.exceptions import UndefinedMetricWarning
 warnings.filterwarnings("ignore", category=UndefinedMetricWarning)
 
 
-def dapatkan_inlier(df: pd.DataFrame, x: str, y: str) -> np.array:
+def dapatkan_inlier(df: pd.DataFrame, x: str, y: str, benih: int = None) -> np.array:
     '''
     Mengembalikan DataFrame yang mengandungi hanya inlier dari model RANSAC.
 
@@ -23,6 +25,8 @@ def dapatkan_inlier(df: pd.DataFrame, x: str, y: str) -> np.array:
         df (pd.DataFrame): DataFrame Pandas yang mengandungi data.
         x (str): Nama lajur dalam df yang akan digunakan sebagai input untuk model RANSAC.
         y (str): Nama lajur dalam df yang akan digunakan sebagai output untuk model RANSAC.
+        benih (int): Benih penjana nombor rawak RANSAC. Jika None, hasil boleh berbeza
+        antara larian.
 
     Returns:
         pd.DataFrame: DataFrame yang mengandungi hanya inlier.
@@ -41,12 +45,203 @@ def dapatkan_inlier(df: pd.DataFrame, x: str, y: str) -> np.array:
         di mana nilai 'fy' dan 'eps' sesuai dengan model linear yang ditentukan
         oleh RANSAC.
     '''
-    model: ransac = ransac().fit(df[[x]], df[y])
+    model: ransac = ransac(random_state=benih).fit(df[[x]], df[y])
     df_baru: pd.DataFrame = df[model.inlier_mask_]
 
     return df_baru
 
 
+def dapatkan_inlier_berkelompok(
+        df: pd.DataFrame,
+        kumpulan: str,
+        x: str,
+        y: str,
+        bil_cubaan: int = 100,
+        benih: int = 0,
+        saiz_ketul: int = 2048,
+    ) -> pd.DataFrame:
+    '''
+    Mengembalikan DataFrame yang mengandungi hanya inlier RANSAC, dikira bagi setiap
+    kumpulan (saham) secara serentak.
+
+    Fungsi ini adalah RANSAC khusus untuk siri 1-D yang pendek (sekitar 12 titik). Semua
+    cubaan bagi semua saham dijalankan serentak sebagai operasi tatasusunan NumPy,
+    tanpa membina RANSACRegressor bagi setiap saham. Peraturannya mengikut tetapan
+    lalai RANSACRegressor sklearn:
+    - 2 titik rawak (tanpa ulangan) bagi setiap cubaan, dan garis lurus melaluinya.
+    - Ambang sisa adalah sisihan mutlak median (MAD) y bagi saham tersebut.
+    - Cubaan terbaik mempunyai inlier terbanyak; jika seri, skor R^2 model cubaan ke
+    atas inliernya yang tertinggi, dan jika masih seri, cubaan yang terkemudian.
+    - Cubaan dihentikan awal mengikut bilangan cubaan dinamik dengan kebarangkalian
+    0.99, seperti 'stop_probability' sklearn.
+
+    Args:
+        df (pd.DataFrame): Panel format panjang, satu baris bagi setiap (saham, x).
+        kumpulan (str): Nama lajur pengenal saham.
+        x (str): Nama lajur input.
+        y (str): Nama lajur output.
+        bil_cubaan (int): Bilangan maksimum cubaan bagi setiap saham.
+        benih (int): Benih penjana nombor rawak, supaya hasil boleh diulang. Setiap saham
+        mempunyai aliran nombor rawak sendiri daripada benih dan labelnya, jadi inlier
+        sesuatu saham tidak berubah apabila saham lain ditambah atau dibuang.
+        saiz_ketul (int): Bilangan saham yang diproses serentak, untuk mengehadkan
+        penggunaan memori.
+
+    Returns:
+        pd.DataFrame: DataFrame yang mengandungi hanya baris inlier daripada df.
+
+    Contoh:
+        dapatkan_inlier_berkelompok(panel, "kod", "fy", "eps", benih=0)
+
+    Catatan:
+        - Saham dengan kurang daripada 2 titik data tidak mempunyai inlier.
+        - Urutan nombor rawak berbeza daripada sklearn, jadi inlier bagi data yang
+        kabur (tiada konsensus jelas) boleh berbeza sedikit daripada RANSACRegressor.
+    '''
+    topeng: np.ndarray = topeng_inlier_berkelompok(
+        df[kumpulan].to_numpy(),
+        df[x].to_numpy(dtype=np.float64),
+        df[y].to_numpy(dtype=np.float64),
+        bil_cubaan,
+        benih,
+        saiz_ketul,
+    )
+
+    return df[topeng]
+
+
+def topeng_inlier_berkelompok(
+        kumpulan: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        bil_cubaan: int = 100,
+        benih: int = 0,
+        saiz_ketul: int = 2048,
+    ) -> np.ndarray:
+    '''
+    Seperti 'dapatkan_inlier_berkelompok', tetapi menerima tatasusunan dan mengembalikan
+    topeng boolean inlier yang sejajar dengan input.
+    '''
+    kod, semua_kumpulan = pd.factorize(kumpulan, sort=True)
+    topeng: np.ndarray = np.zeros(len(kod), dtype=bool)
+
+    if len(kod) == 0:
+        return topeng
+
+# susun baris mengikut kumpulan dan pad ke dalam tatasusunan [kumpulan, titik].
+    susunan: np.ndarray = np.argsort(kod, kind="stable")
+    n: np.ndarray = np.bincount(kod, minlength=len(semua_kumpulan))
+    mula: np.ndarray = np.concatenate(([0], np.cumsum(n)[:-1]))
+    kedudukan: np.ndarray = np.arange(len(kod)) - mula[kod[susunan]]
+    n_maks: int = int(n.max())
+
+    X: np.ndarray = np.full((len(n), n_maks), np.nan)
+    Y: np.ndarray = np.full((len(n), n_maks), np.nan)
+    X[kod[susunan], kedudukan] = x[susunan]
+    Y[kod[susunan], kedudukan] = y[susunan]
+
+# setiap kumpulan mempunyai aliran nombor rawaknya sendiri (benih dan CRC32 labelnya),
+# supaya inliernya tidak bergantung kepada kumpulan lain dalam panel.
+    u: np.ndarray = np.stack([
+        np.random.default_rng([benih, zlib.crc32(str(k).encode())]).random((2, bil_cubaan))
+        for k in semua_kumpulan
+    ], axis=1)
+
+    semua_terbaik: list = []
+
+    for a in range(0, len(n), saiz_ketul):
+        b: int = min(a + saiz_ketul, len(n))
+        semua_terbaik.append(
+            _ransac_ketul(X[a:b], Y[a:b], n[a:b], u[:, a:b], bil_cubaan)
+        )
+
+    terbaik: np.ndarray = np.concatenate(semua_terbaik)
+    topeng[susunan] = terbaik[kod[susunan], kedudukan]
+
+    return topeng
+
+
+def _ransac_ketul(
+        X: np.ndarray,
+        Y: np.ndarray,
+        n: np.ndarray,
+        u: np.ndarray,
+        bil_cubaan: int,
+    ) -> np.ndarray:
+    '''
+    Menjalankan semua cubaan RANSAC bagi satu ketul kumpulan dan mengembalikan topeng
+    inlier terbaik [kumpulan, titik].
+    '''
+    sah: np.ndarray = ~np.isnan(X)
+    baris: np.ndarray = np.arange(len(n))[:, None]
+
+# dua indeks berbeza bagi setiap cubaan: i dalam [0, n), j dalam [0, n) tanpa i.
+    i: np.ndarray = np.floor(u[0] * n[:, None]).astype(np.int64)
+    j: np.ndarray = np.floor(u[1] * np.maximum(n[:, None] - 1, 1)).astype(np.int64)
+    j += j >= i
+    i = np.minimum(i, np.maximum(n[:, None] - 1, 0))
+    j = np.minimum(j, np.maximum(n[:, None] - 1, 0))
+
+    xi, yi, xj, yj = X[baris, i], Y[baris, i], X[baris, j], Y[baris, j]
+    dx: np.ndarray = xj - xi
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cerun: np.ndarray = np.where(dx != 0, (yj - yi) / dx, 0.)
+        pintasan: np.ndarray = np.where(dx != 0, yi - cerun * xi, (yi + yj) / 2)
+
+        ambang: np.ndarray = np.nanmedian(
+            np.abs(Y - np.nanmedian(Y, axis=1, keepdims=True)), axis=1
+        )
+
+# sisa semua titik bagi setiap cubaan: [kumpulan, cubaan, titik].
+        ramalan: np.ndarray = pintasan[..., None] + cerun[..., None] * X[:, None, :]
+        sisa: np.ndarray = np.abs(Y[:, None, :] - ramalan)
+        inlier: np.ndarray = (sisa <= ambang[:, None, None]) & sah[:, None, :]
+        n_inlier: np.ndarray = inlier.sum(axis=2)
+
+# skor R^2 model cubaan ke atas inliernya, seperti estimator.score dalam sklearn.
+        Y0: np.ndarray = np.where(inlier, Y[:, None, :], 0.)
+        purata: np.ndarray = Y0.sum(axis=2) / n_inlier
+        ss_jumlah: np.ndarray = (np.where(inlier, Y[:, None, :] - purata[..., None], 0.) ** 2).sum(axis=2)
+        ss_sisa: np.ndarray = np.where(inlier, sisa, 0.) ** 2
+        ss_sisa = ss_sisa.sum(axis=2)
+        skor: np.ndarray = np.where(
+            ss_jumlah > 0,
+            1 - ss_sisa / ss_jumlah,
+            np.where(ss_sisa == 0, 1., 0.),
+        )
+        skor = np.where(n_inlier < 2, -np.inf, skor)
+
+# bilangan cubaan dinamik selepas setiap cubaan (stop_probability = 0.99).
+        n_terbaik: np.ndarray = np.maximum.accumulate(n_inlier, axis=1)
+        nisbah: np.ndarray = n_terbaik / n[:, None]
+        penyebut: np.ndarray = np.maximum(np.finfo(float).eps, 1 - nisbah ** 2)
+        cubaan_dinamik: np.ndarray = np.where(
+            penyebut == 1,
+            np.inf,
+            np.abs(np.ceil(np.log(0.01) / np.log(penyebut))),
+        )
+
+    cubaan_maks: np.ndarray = np.minimum(bil_cubaan, cubaan_dinamik)
+    berhenti: np.ndarray = np.arange(1, bil_cubaan + 1)[None, :] >= cubaan_maks
+    bil_dinilai: np.ndarray = np.where(
+        berhenti.any(axis=1), berhenti.argmax(axis=1) + 1, bil_cubaan
+    )
+    dinilai: np.ndarray = np.arange(bil_cubaan)[None, :] < bil_dinilai[:, None]
+
+# cubaan terbaik: inlier terbanyak, kemudian skor tertinggi, kemudian yang terkemudian.
+    n_maks: np.ndarray = np.where(dinilai, n_inlier, -1).max(axis=1)
+    calon: np.ndarray = dinilai & (n_inlier == n_maks[:, None])
+    skor_maks: np.ndarray = np.where(calon, skor, -np.inf).max(axis=1)
+    calon &= skor == skor_maks[:, None]
+    indeks: np.ndarray = bil_cubaan - 1 - calon[:, ::-1].argmax(axis=1)
+
+    terbaik: np.ndarray = inlier[np.arange(len(n)), indeks]
+    terbaik[(n < 2) | (n_maks < 1)] = False
+
+    return terbaik
+
+
 def dapatkan_min_cerun(df: pd.DataFrame, x: str, y: str, alpha: float) -> float:
     '''
     Menghitung nilai cerun minimum dari regresi linear dengan CI.
@@ -81,4 +276,102 @@ def dapatkan_min_cerun(df: pd.DataFrame, x: str, y: str, alpha: float) -> float:
     st_error: float = model.stderr * ts
     min: float = cerun - st_error
 
-    return min
\ No newline at end of file
+    return min
+
+
+@lru_cache(maxsize=None)
+def nilai_t_kritikal(alpha: float, dk: int) -> float:
+    '''
+    Mengembalikan nilai t-kritikal dua hujung bagi alpha dan darjah kebebasan dk.
+
+    Nilai disimpan dalam cache kerana bilangan darjah kebebasan yang berbeza adalah
+    kecil (siri data hanya sekitar 12 titik), walaupun bilangan saham adalah besar.
+    '''
+    return float(abs(t.ppf(alpha/2, dk)))
+
+
+def dapatkan_min_cerun_berkelompok(
+        df: pd.DataFrame,
+        kumpulan: str,
+        x: str,
+        y: str,
+        alpha: float,
+        inlier: str = None,
+    ) -> pd.DataFrame:
+    '''
+    Menghitung cerun, standard error dan nilai cerun minimum (batas bawah CI) bagi setiap
+    kumpulan (saham) sekali gus.
+
+    Fungsi ini setara dengan memanggil 'dapatkan_min_cerun' bagi setiap saham, tetapi
+    semua saham dikira serentak dengan penurunan kumpulan NumPy (np.bincount) ke atas
+    panel format panjang, tanpa panggilan 'linregress' dan 't.ppf' bagi setiap saham.
+
+    Args:
+        df (pd.DataFrame): Panel format panjang, satu baris bagi setiap (saham, x).
+        kumpulan (str): Nama lajur pengenal saham.
+        x (str): Nama lajur variabel tak bersandar.
+        y (str): Nama lajur variabel bersandar.
+        alpha (float): Misalnya, 0.05 untuk CI 95%.
+        inlier (str): Nama lajur boolean topeng inlier. Jika None, semua baris digunakan.
+
+    Returns:
+        pd.DataFrame: DataFrame berindeks pengenal saham dengan lajur:
+            - n (int): Bilangan titik data yang digunakan.
+            - cerun (float): Cerun regresi linear OLS.
+            - st_error (float): Standard error cerun.
+            - min_cerun (float): cerun - t-kritikal * st_error.
+        Nilai cerun dan min_cerun adalah NaN jika n < 3 atau semua x adalah sama.
+
+    Contoh:
+        dapatkan_min_cerun_berkelompok(panel, "kod", "fy", "eps", 0.05, "inlier_eps")
+
+    Catatan:
+        - Nilai t-kritikal dihitung dengan darjah kebebasan (n-2) dan disimpan dalam
+        cache bagi setiap darjah kebebasan.
+    '''
+    kod, semua_kumpulan = pd.factorize(df[kumpulan], sort=True)
+    bil_kumpulan: int = len(semua_kumpulan)
+
+    _x: np.ndarray = df[x].to_numpy(dtype=np.float64)
+    _y: np.ndarray = df[y].to_numpy(dtype=np.float64)
+    w: np.ndarray = (
+        np.ones(len(df)) if inlier is None else df[inlier].to_numpy(dtype=np.float64)
+    )
+
+    def jumlah(nilai: np.ndarray) -> np.ndarray:
+        return np.bincount(kod, weights=nilai, minlength=bil_kumpulan)
+
+    n: np.ndarray = jumlah(w)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        purata_x: np.ndarray = jumlah(w * _x) / n
+        purata_y: np.ndarray = jumlah(w * _y) / n
+        dx: np.ndarray = _x - purata_x[kod]
+        dy: np.ndarray = _y - purata_y[kod]
+
+        sxx: np.ndarray = jumlah(w * dx * dx)
+        sxy: np.ndarray = jumlah(w * dx * dy)
+        syy: np.ndarray = jumlah(w * dy * dy)
+
+        cerun: np.ndarray = sxy / sxx
+        jrk: np.ndarray = np.maximum(syy - cerun * sxy, 0.)
+        st_error: np.ndarray = np.sqrt(jrk / (n - 2) / sxx)
+
+    dk: np.ndarray = n.astype(np.int64) - 2
+    ts: np.ndarray = np.array([
+        nilai_t_kritikal(alpha, int(d)) if d > 0 else np.nan for d in dk
+    ])
+
+    sah: np.ndarray = (dk > 0) & (sxx > 0)
+    cerun = np.where(sah, cerun, np.nan)
+    st_error = np.where(sah, st_error, np.nan)
+
+    return pd.DataFrame(
+        {
+            "n": n.astype(np.int64),
+            "cerun": cerun,
+            "st_error": st_error,
+            "min_cerun": cerun - ts * st_error,
+        },
+        index=pd.Index(semua_kumpulan, name=kumpulan),
+    )
@@ -0,0 +1,236 @@
+import numpy as np
+import pandas as pd
+
+
+from analisis_stat import regresi
+
+
+def sediakan_panel(panel: pd.DataFrame, tahun_ini: int) -> pd.DataFrame:
+    '''
+    Menyediakan panel asas untuk penyaringan saham.
+
+    Fungsi ini membuang laman tanpa data EPS/DPS dan laman yang tajuknya tidak sah
+    (nama sama dengan kod), hanya mengekalkan saham yang mempunyai lebih daripada 10
+    tahun data, dan menyaring data kepada 12 tahun sebelum 'tahun_ini'.
+
+    Args:
+        panel (pd.DataFrame): Panel asas dengan lajur 'kod', 'nama', 'fy', 'eps' dan
+        'dps' (seperti yang dikembalikan oleh 'simpanan_asas.muat_panel').
+        tahun_ini (int): Tahun semasa. Data tahun ini dan selepasnya tidak digunakan.
+
+    Returns:
+        pd.DataFrame: Panel dengan lajur 'kod', 'nama', 'fy', 'eps' dan 'dps'.
+    '''
+    df: pd.DataFrame = panel.dropna(subset=["fy"])
+    df = df[df["nama"] != df["kod"]]
+    df = df[["kod", "nama", "fy", "eps", "dps"]].astype({"fy": "int64"})
+
+    bil_tahun: pd.Series = df.groupby("kod")["fy"].transform("size")
+    df = df[bil_tahun > 10]
+    df = df[(df["fy"] < tahun_ini) & (df["fy"] >= (tahun_ini-12))]
+
+    return df.reset_index(drop=True)
+
+
+def tanda_inlier(df: pd.DataFrame, y: str, benih: int = 0) -> np.ndarray:
+    '''
+    Mengembalikan topeng boolean inlier RANSAC bagi lajur y, dikira bagi setiap saham
+    secara serentak dengan 'regresi.topeng_inlier_berkelompok'.
+
+    Args:
+        df (pd.DataFrame): Panel daripada 'sediakan_panel'.
+        y (str): Nama lajur, contohnya 'eps' atau 'dps'.
+        benih (int): Benih penjana nombor rawak RANSAC.
+
+    Returns:
+        np.ndarray: Topeng boolean sejajar dengan baris df.
+    '''
+    return regresi.topeng_inlier_berkelompok(
+        df["kod"].to_numpy(),
+        df["fy"].to_numpy(dtype=np.float64),
+        df[y].to_numpy(dtype=np.float64),
+        benih=benih,
+    )
+
+
+def kira_perantaraan(panel: pd.DataFrame, tahun_ini: int, benih: int = 0) -> dict:
+    '''
+    Mengira hasil perantaraan penyaringan yang tidak bergantung kepada 'min_inlier' dan
+    'alpha': inlier RANSAC, bilangan inlier, cerun dan standard error cerun EPS dan DPS
+    bagi setiap saham.
+
+    Inlier DPS dikira bagi semua saham (bukan hanya saham dengan cerun EPS positif)
+    supaya hasil perantaraan yang sama boleh digunakan semula bagi sebarang nilai
+    'min_inlier' dan 'alpha'. Setiap saham mempunyai aliran nombor rawak RANSAC sendiri
+    (lihat 'regresi.topeng_inlier_berkelompok'), jadi ini tidak mengubah inlier DPS
+    saham yang lulus saringan EPS.
+
+    Args:
+        panel (pd.DataFrame): Panel asas dengan lajur 'kod', 'nama', 'fy', 'eps' dan 'dps'.
+        tahun_ini (int): Tahun semasa.
+        benih (int): Benih RANSAC, supaya hasil saringan boleh diulang.
+
+    Returns:
+        dict: Kamus dengan kunci:
+            - nama (pd.Series): Nama saham, berindeks kod.
+            - eps (pd.DataFrame), dps (pd.DataFrame): Lajur 'n', 'cerun' dan 'st_error'
+            daripada 'regresi.dapatkan_min_cerun_berkelompok', berindeks kod.
+    '''
+    df: pd.DataFrame = sediakan_panel(panel, tahun_ini)
+    perantaraan: dict = {"nama": df.drop_duplicates("kod").set_index("kod")["nama"]}
+
+    for y in ["eps", "dps"]:
+        df[f'inlier_{y}'] = tanda_inlier(df, y, benih)
+        perantaraan[y] = regresi.dapatkan_min_cerun_berkelompok(
+            df, "kod", "fy", y, 0.05, f'inlier_{y}'
+        )[["n", "cerun", "st_error"]].reindex(perantaraan["nama"].index)
+
+    return perantaraan
+
+
+def _cerun_minimum(jadual: pd.DataFrame, min_inlier: int, alpha: float) -> pd.Series:
+    '''
+    Mengembalikan batas bawah CI cerun bagi setiap saham, atau 0.0 jika bilangan inlier
+    tidak melebihi 'min_inlier' atau cerun tidak dapat dikira.
+    '''
+    ts: np.ndarray = np.array([
+        regresi.nilai_t_kritikal(alpha, int(n) - 2) if n > 2 else np.nan
+        for n in jadual["n"].fillna(0)
+    ])
+    min_cerun: pd.Series = jadual["cerun"] - ts * jadual["st_error"]
+
+    return min_cerun.where(jadual["n"] > min_inlier, 0.).fillna(0.)
+
+
+def nilai_cerun(perantaraan: dict, min_inlier: int, alpha: float = 0.05) -> pd.DataFrame:
+    '''
+    Menilai cerun EPS, DPS dan cerun akhir bagi setiap saham daripada hasil
+    'kira_perantaraan', bagi satu nilai 'min_inlier' dan 'alpha'.
+
+    Cerun DPS hanya diambil kira bagi saham dengan cerun EPS positif.
+
+    Returns:
+        pd.DataFrame: DataFrame dengan lajur 'kod' (dengan akhiran '.KL'), 'nama',
+        'cerun_eps', 'cerun_dps' dan 'cerun'.
+    '''
+    hasil: pd.DataFrame = perantaraan["nama"].to_frame()
+    hasil["cerun_eps"] = _cerun_minimum(perantaraan["eps"], min_inlier, alpha)
+    hasil["cerun_dps"] = _cerun_minimum(perantaraan["dps"], min_inlier, alpha).where(
+        hasil["cerun_eps"] > 0., 0.
+    )
+    hasil["cerun"] = hasil["cerun_eps"] * hasil["cerun_dps"]
+    hasil.index = hasil.index + ".KL"
+
+    return hasil.rename_axis("kod").reset_index()
+
+
+def saring(
+        panel: pd.DataFrame,
+        tahun_ini: int,
+        min_inlier: int,
+        alpha: float = 0.05,
+        benih: int = 0,
+    ) -> pd.DataFrame:
+    '''
+    Menyaring semua saham dalam panel asas berdasarkan cerun EPS dan DPS.
+
+    Langkah-langkahnya sama seperti 'nilai_saham' dalam 'melombong_data.py', tetapi
+    cerun minimum bagi semua saham dikira serentak dengan
+    'regresi.dapatkan_min_cerun_berkelompok':
+    1. Inlier EPS ditentukan dengan RANSAC berkelompok bagi semua saham.
+    2. Cerun minimum EPS dikira bagi saham dengan lebih daripada 'min_inlier' inlier.
+    3. Bagi saham dengan cerun EPS positif, langkah yang sama diulang bagi DPS.
+    4. Cerun akhir adalah hasil darab cerun EPS dan DPS.
+
+    Args:
+        panel (pd.DataFrame): Panel asas dengan lajur 'kod', 'nama', 'fy', 'eps' dan 'dps'.
+        tahun_ini (int): Tahun semasa.
+        min_inlier (int): Bilangan inlier mesti melebihi nilai ini untuk cerun dikira.
+        alpha (float): Misalnya, 0.05 untuk CI 95%.
+        benih (int): Benih RANSAC, supaya hasil saringan boleh diulang.
+
+    Returns:
+        pd.DataFrame: DataFrame dengan lajur 'kod' (dengan akhiran '.KL'), 'nama',
+        'cerun_eps', 'cerun_dps' dan 'cerun'. Cerun diatur ke 0.0 jika data tidak
+        mencukupi.
+    '''
+    return nilai_cerun(kira_perantaraan(panel, tahun_ini, benih), min_inlier, alpha)
+
+
+def sapuan(
+        panel: pd.DataFrame,
+        tahun_ini: int,
+        semua_min_inlier: list = (5, 6, 7, 8, 9, 10),
+        semua_alpha: list = (0.01, 0.05, 0.1),
+        sasaran: tuple = (20, 50),
+        benih: int = 0,
+    ) -> tuple:
+    '''
+    Menyaring saham bagi grid nilai 'min_inlier' dan 'alpha' dalam satu laluan.
+
+    Inlier RANSAC, cerun dan standard error dikira sekali sahaja dengan
+    'kira_perantaraan'; setiap gabungan (min_inlier, alpha) hanya menilai semula batas
+    bawah CI dan syarat bilangan inlier. Tetapan yang bilangan saham bagusnya berada
+    dalam julat sasaran dipilih secara automatik dengan 'pilih_tetapan'.
+
+    Args:
+        panel (pd.DataFrame): Panel asas dengan lajur 'kod', 'nama', 'fy', 'eps' dan 'dps'.
+        tahun_ini (int): Tahun semasa.
+        semua_min_inlier (list): Nilai-nilai 'min_inlier' yang dicuba.
+        semua_alpha (list): Nilai-nilai 'alpha' yang dicuba.
+        sasaran (tuple): Julat (minimum, maksimum) bilangan saham bagus yang disasarkan.
+        benih (int): Benih RANSAC.
+
+    Returns:
+        tuple: Tuple yang berisi:
+            - ringkasan (pd.DataFrame): Satu baris bagi setiap gabungan dengan lajur
+            'min_inlier', 'alpha', 'bil_saham' dan 'saham' (kamus kod: nama saham bagus).
+            - pilihan (pd.Series): Baris ringkasan bagi tetapan yang dipilih.
+
+    Contoh:
+        ringkasan, pilihan = sapuan(panel, 2025)
+        saham_bagus = pilihan["saham"]
+    '''
+    perantaraan: dict = kira_perantaraan(panel, tahun_ini, benih)
+    semua_baris: list = []
+
+    for min_inlier in semua_min_inlier:
+        for alpha in semua_alpha:
+            hasil: pd.DataFrame = nilai_cerun(perantaraan, min_inlier, alpha)
+            bagus: pd.DataFrame = hasil[hasil["cerun"] > 0]
+
+            semua_baris.append({
+                "min_inlier": min_inlier,
+                "alpha": alpha,
+                "bil_saham": len(bagus),
+                "saham": dict(zip(bagus["kod"], bagus["nama"])),
+            })
+
+    ringkasan: pd.DataFrame = pd.DataFrame(semua_baris)
+
+    return ringkasan, pilih_tetapan(ringkasan, sasaran)
+
+
+def pilih_tetapan(ringkasan: pd.DataFrame, sasaran: tuple = (20, 50)) -> pd.Series:
+    '''
+    Memilih satu tetapan daripada ringkasan 'sapuan'.
+
+    Tetapan yang dipilih adalah yang bilangan saham bagusnya paling hampir dengan julat
+    sasaran (jarak 0 jika dalam julat), kemudian paling hampir dengan titik tengah
+    julat. Jika masih seri, tetapan yang lebih ketat (min_inlier lebih besar, kemudian
+    alpha lebih kecil) dipilih.
+
+    Returns:
+        pd.Series: Baris ringkasan bagi tetapan yang dipilih.
+    '''
+    bawah, atas = sasaran
+    bil: pd.Series = ringkasan["bil_saham"]
+
+    kedudukan: pd.DataFrame = pd.DataFrame({
+        "jarak": np.maximum(bawah - bil, 0) + np.maximum(bil - atas, 0),
+        "tengah": (bil - (bawah + atas) / 2).abs(),
+        "min_inlier": -ringkasan["min_inlier"],
+        "alpha": ringkasan["alpha"],
+    })
+
+    return ringkasan.loc[kedudukan.sort_values(list(kedudukan.columns), kind="stable").index[0]]
@@ -0,0 +1,54 @@
+import arviz as az
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+# kumpulan kesan FORMULA yang berubah mengikut tahun dan ticker.
+KUMPULAN_TREN: str = "tahun:Ticker"
+
+# pemboleh ubah posterior bagi setiap tren: pintasan (1|tahun:Ticker) ialah tren
+# tahunan dan cerun (bulan|tahun:Ticker) ialah tren bulanan.
+SEMUA_TREN: dict = {
+    "tahun": f'1|{KUMPULAN_TREN}',
+    "bulan": f'bulan|{KUMPULAN_TREN}',
+}
+
+
+def tanya_tren(idata: az.InferenceData, tahun: int, hdi_prob: float = .94) -> pd.DataFrame:
+    '''
+    Menentukan tren tahunan dan bulanan setiap ticker bagi tahun yang diberikan terus
+    daripada posterior xarray.
+
+    Hanya pemboleh ubah dalam SEMUA_TREN dan koordinat tahun tersebut dipilih, dan HDI
+    bagi kedua-duanya dikira dalam satu panggilan 'az.hdi', jadi ESS, r_hat dan MCSE
+    bagi pemboleh ubah lain tidak dikira seperti dalam 'az.summary'.
+
+    Returns:
+        pd.DataFrame: Satu baris bagi setiap ticker dengan lajur Ticker, tahun_naik,
+        tahun_jatuh, bulan_naik dan bulan_jatuh (bool). Naik bermakna had bawah HDI
+        melebihi sifar dan jatuh bermakna had atas HDI kurang daripada sifar.
+    '''
+    dimensi: str = f'{KUMPULAN_TREN}__factor_dim'
+    label: np.ndarray = idata.posterior[dimensi].to_numpy().astype(str)
+
+# label aras ialah 'tahun:Ticker', contohnya '2025:1155.KL'.
+    tahun_label, ticker_label = np.char.partition(label, ":")[:, [0, 2]].T
+    pilihan: np.ndarray = tahun_label == str(tahun)
+
+    draw: xr.DataArray = xr.concat(
+        [idata.posterior[nama].sel({dimensi: label[pilihan]}) for nama in SEMUA_TREN.values()],
+        dim=pd.Index(list(SEMUA_TREN), name="tren"),
+    )
+# nama pemboleh ubah bukan "draw", kerana nama itu ialah dimensi posterior.
+    hdi: np.ndarray = az.hdi(xr.Dataset({"kesan": draw}), hdi_prob=hdi_prob)["kesan"].transpose(
+        "tren", dimensi, "hdi"
+    ).to_numpy()
+
+    tren: pd.DataFrame = pd.DataFrame({"Ticker": ticker_label[pilihan]})
+
+    for i, nama_tren in enumerate(SEMUA_TREN):
+        tren[f'{nama_tren}_naik'] = hdi[i, :, 0] > 0
+        tren[f'{nama_tren}_jatuh'] = hdi[i, :, 1] < 0
+
+    return tren
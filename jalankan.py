@@ -0,0 +1,419 @@
+'''
+Saluran Paip Penuh Tanpa Interaksi dengan Simpanan bagi Setiap Peringkat.
+
+File ini menjalankan ketiga-tiga langkah analisis ('menyimpan_laman_htm.py',
+'melombong_data.py' dan 'menilai_saham.py') sebagai lima peringkat, dengan parameter
+daripada baris perintah atau file konfigurasi JSON, tanpa input():
+1. rayap: Memuat turun laman saham yang belum segar ke dalam 'laman_saham/'.
+2. ekstrak: Memuatkan panel asas EPS dan DPS ke dalam 'simpanan/asas.parquet'.
+3. saring: Menyaring saham yang bagus dan menulis 'bursa.env'.
+4. model: Memuat data harga dan melatih model Bayesian Hierarchical.
+5. laporan: Meramal harga bagi tahun dan bulan yang dikehendaki dan mencetak jadual
+   "Analisis Keseluruhan" dan "Peluang".
+
+Output setiap peringkat disimpan dalam 'simpanan/peringkat/' bersama kunci (hash)
+input dan parameternya. Peringkat hanya dijalankan semula jika kuncinya berubah,
+contohnya jika laman saham berubah, parameter berubah atau output peringkat sebelumnya
+berubah. Jadi larian semula dengan hanya 'bulan' yang berbeza hanya menjalankan
+peringkat laporan.
+
+Kunci setiap peringkat:
+- rayap: hash laman screener dan parameter muat turun. Output sah selama 'umur_maks'
+  hari.
+- ekstrak: alamat, saiz dan masa ubah suai semua laman saham.
+- saring: hash panel asas dan parameter saringan.
+- model: kamus saham bagus, formula, kaedah inferens dan parameter pensampelan, mod
+  likelihood (harian atau '--agregat'), file harga dan tarikh data harga (data harga
+  dikemas kini sekali sehari). Harga disimpan bagi setiap ticker dalam
+  'simpanan/harga/', jadi hanya hari baharu dimuat turun. Posterior disimpan dalam
+  'simpanan/posterior/' mengikut hash data model dan tetapan pensampel, jadi jika
+  data harga tidak berubah (contohnya pada hujung minggu) model tidak dilatih semula.
+  Dengan '--panas', model dilatih dengan mula panas daripada posterior terdahulu.
+  Dengan '--bil-serpihan N', ticker dibahagikan kepada N serpihan dan setiap serpihan
+  dilatih sebagai model berasingan secara selari; laporan menggabungkan ramalan semua
+  serpihan.
+- laporan: kunci model, tahun dan bulan.
+
+Penggunaan:
+    python jalankan.py --tahun-ini 2025 --min-inlier 7 --tahun 2025 --bulan 12
+    python jalankan.py --konfig konfig.json --peringkat model laporan --paksa model
+
+Contoh file konfigurasi (kunci sama dengan nama pilihan, dengan '_' bagi '-'):
+    {"tahun_ini": 2025, "min_inlier": "sapu", "draw_tune": 4000, "target_accept": 0.95}
+'''
+import argparse
+import datetime
+import json
+import os
+import pandas as pd
+import time
+
+
+from glob import glob
+
+
+import melombong_data
+import menilai_saham
+import menyimpan_laman_htm
+from modulam.simpanan_peringkat import SimpananPeringkat, hash_fail, kunci_input
+from modulam.simpanan_posterior import (
+    FAIL_DATA, FAIL_IDATA, FAIL_PENSKALA, FAIL_SPESIFIKASI, SimpananPosterior
+)
+from pelombongan import simpanan_asas
+from pelombongan.pembekal_harga import PembekalFail, PembekalYahoo, SimpananHarga
+
+
+SEMUA_PERINGKAT: list = ["rayap", "ekstrak", "saring", "model", "laporan"]
+
+# output peringkat lain yang diperlukan oleh setiap peringkat.
+KEPERLUAN: dict = {
+    "rayap": [],
+    "ekstrak": [],
+    "saring": ["ekstrak"],
+    "model": ["saring"],
+    "laporan": ["saring", "model"],
+}
+
+
+def peringkat_rayap(tetapan: argparse.Namespace, simpanan: SimpananPeringkat) -> tuple:
+    kunci: str = kunci_input(
+        hash_fail(tetapan.laman_screener),
+        tetapan.mod_rayapan,
+        tetapan.mod_muat,
+        tetapan.umur_maks,
+    )
+    output: dict = simpanan.dapatkan("rayap", kunci, tetapan.umur_maks * 86400)
+    dijalankan: bool = output is None
+
+    if dijalankan:
+        jumlah_laman_baharu, jumlah_url, gagal = menyimpan_laman_htm.simpan_semua_laman(
+            tetapan.mod_rayapan,
+            tetapan.serentak,
+            tetapan.umur_maks,
+            tetapan.mod_muat,
+            laman_screener=tetapan.laman_screener,
+        )
+        output = {"laman_baharu": jumlah_laman_baharu, "url": jumlah_url, "gagal": len(gagal)}
+
+# larian dengan URL yang gagal tidak disimpan, supaya ia dicuba semula.
+        if not gagal:
+            simpanan.simpan("rayap", kunci, output)
+
+    return output, dijalankan
+
+
+def peringkat_ekstrak(tetapan: argparse.Namespace, simpanan: SimpananPeringkat) -> tuple:
+    semua_laman: list = sorted(glob("laman_saham/*.htm"))
+    kunci: str = kunci_input([
+        (laman, stat.st_size, stat.st_mtime_ns)
+        for laman, stat in ((laman, os.stat(laman)) for laman in semua_laman)
+    ])
+    output: dict = simpanan.dapatkan("ekstrak", kunci)
+    dijalankan: bool = output is None
+
+    if dijalankan:
+        simpanan_asas.muat_panel(semua_laman, tetapan.fail_panel)
+        output = {"fail": [tetapan.fail_panel], "hash": hash_fail(tetapan.fail_panel)}
+        simpanan.simpan("ekstrak", kunci, output)
+
+    return output, dijalankan
+
+
+def peringkat_saring(
+        tetapan: argparse.Namespace,
+        simpanan: SimpananPeringkat,
+        ekstrak: dict,
+    ) -> tuple:
+    kunci: str = kunci_input(
+        ekstrak["hash"], tetapan.tahun_ini, tetapan.min_inlier, tetapan.mod_saringan
+    )
+    output: dict = simpanan.dapatkan("saring", kunci)
+    dijalankan: bool = output is None
+
+    if dijalankan:
+        output = {"saham_bagus": melombong_data.pilih_saham_bagus(
+            sorted(glob("laman_saham/*.htm")),
+            tetapan.tahun_ini,
+            tetapan.min_inlier,
+            tetapan.mod_saringan,
+            tetapan.fail_panel,
+        )}
+        simpanan.simpan("saring", kunci, output)
+
+    melombong_data.tulis_env(output["saham_bagus"])
+
+    return output, dijalankan
+
+
+def peringkat_model(
+        tetapan: argparse.Namespace,
+        simpanan: SimpananPeringkat,
+        saring: dict,
+    ) -> tuple:
+    kunci: str = kunci_input(
+        saring["saham_bagus"],
+        menilai_saham.FORMULA,
+        tetapan.draw_tune,
+        tetapan.target_accept,
+        tetapan.cores,
+        hash_fail(tetapan.fail_harga) if tetapan.fail_harga else None,
+        tetapan.jenis_harga,
+        tetapan.agregat,
+        tetapan.kaedah_inferens,
+        tetapan.panas,
+        tetapan.tune_panas,
+        tetapan.bil_serpihan,
+        tetapan.pengumpulan,
+        datetime.date.today().isoformat(),
+    )
+    output: dict = simpanan.dapatkan("model", kunci)
+    dijalankan: bool = output is None
+
+    if dijalankan:
+        data, harga_semasa, penskala = menilai_saham.sediakan_data(
+            saring["saham_bagus"], pembekal_harga(tetapan), tetapan.jenis_harga
+        )
+
+        if tetapan.agregat:
+            data = menilai_saham.agregat_data(data)
+
+# pensampelan dilangkau jika data model dan tetapan sama dengan posterior yang tersimpan.
+        if tetapan.bil_serpihan > 1:
+            semua_folder: list = menilai_saham.latih_berserpihan(
+                data,
+                penskala,
+                tetapan.bil_serpihan,
+                tetapan.draw_tune,
+                tetapan.target_accept,
+                tetapan.agregat,
+                tetapan.kaedah_inferens,
+                SimpananPosterior(tetapan.folder_posterior),
+                tetapan.panas,
+                tetapan.tune_panas,
+                tetapan.pengumpulan,
+                tetapan.proses,
+            )
+        else:
+            _, _, folder = menilai_saham.dapatkan_posterior(
+                data,
+                penskala,
+                tetapan.draw_tune,
+                tetapan.target_accept,
+                tetapan.cores,
+                tetapan.agregat,
+                tetapan.kaedah_inferens,
+                SimpananPosterior(tetapan.folder_posterior),
+                tetapan.panas,
+                tetapan.tune_panas,
+            )
+            semua_folder = [folder]
+
+        output = {
+            "kunci": kunci,
+            "harga_semasa": {k: float(v) for k, v in harga_semasa.items()},
+            "folder_posterior": semua_folder,
+            "fail": [
+                os.path.join(folder, nama_fail)
+                for folder in semua_folder
+                for nama_fail in [FAIL_DATA, FAIL_IDATA, FAIL_PENSKALA, FAIL_SPESIFIKASI]
+            ],
+        }
+
+        simpanan.simpan("model", kunci, output)
+
+    return output, dijalankan
+
+
+def pembekal_harga(tetapan: argparse.Namespace) -> SimpananHarga:
+    '''
+    Mengembalikan simpanan harga di hadapan Yahoo Finance, atau di hadapan file harga
+    tempatan jika '--fail-harga' diberi. Simpanan bagi file harga berada dalam subfolder
+    mengikut hash kandungan file, supaya harga lama tidak digunakan selepas file berubah.
+    '''
+    if tetapan.fail_harga:
+        return SimpananHarga(
+            PembekalFail(tetapan.fail_harga),
+            os.path.join(tetapan.folder_harga, hash_fail(tetapan.fail_harga)[:16]),
+        )
+
+    return SimpananHarga(PembekalYahoo(), tetapan.folder_harga)
+
+
+def peringkat_laporan(
+        tetapan: argparse.Namespace,
+        simpanan: SimpananPeringkat,
+        saring: dict,
+        model: dict,
+    ) -> tuple:
+    kunci: str = kunci_input(model["kunci"], tetapan.tahun, tetapan.bulan)
+    output: dict = simpanan.dapatkan("laporan", kunci)
+    dijalankan: bool = output is None
+
+    if dijalankan:
+# model dibina semula tanpa dilatih; posterior diambil daripada idata yang disimpan.
+        ramalan: pd.DataFrame = menilai_saham.ramal_berserpihan(
+            model["folder_posterior"],
+            tetapan.tahun,
+            tetapan.bulan,
+            saring["saham_bagus"],
+            model["harga_semasa"],
+        )
+
+        output = {"fail": [os.path.join(simpanan.folder_output("laporan"), "ramalan.parquet")]}
+        ramalan.to_parquet(output["fail"][0], index=False)
+        simpanan.simpan("laporan", kunci, output)
+
+    menilai_saham.cetak_laporan(pd.read_parquet(output["fail"][0]))
+
+    return output, dijalankan
+
+
+def jalankan(tetapan: argparse.Namespace) -> dict:
+    '''
+    Menjalankan peringkat-peringkat yang dipilih mengikut urutan dan mengembalikan
+    output setiap peringkat.
+
+    Peringkat yang tidak dipilih tetapi diperlukan oleh peringkat seterusnya diambil
+    daripada simpanan (larian terakhirnya), tanpa menyemak kuncinya. Peringkat dalam
+    'tetapan.paksa' dijalankan semula walaupun kuncinya tidak berubah.
+
+    Args:
+        tetapan (argparse.Namespace): Parameter daripada 'hurai_hujah'.
+
+    Returns:
+        dict: Output setiap peringkat, mengikut nama peringkat.
+    '''
+    simpanan: SimpananPeringkat = SimpananPeringkat(tetapan.folder_simpanan)
+    semua_output: dict = dict()
+
+    semua_fungsi: dict = {
+        "rayap": peringkat_rayap,
+        "ekstrak": peringkat_ekstrak,
+        "saring": peringkat_saring,
+        "model": peringkat_model,
+        "laporan": peringkat_laporan,
+    }
+
+    for peringkat in SEMUA_PERINGKAT:
+        if peringkat not in tetapan.peringkat:
+            rekod: dict = simpanan.rekod(peringkat)
+            if rekod is not None:
+                semua_output[peringkat] = rekod["output"]
+            continue
+
+        for keperluan in KEPERLUAN[peringkat]:
+            if keperluan not in semua_output:
+                raise RuntimeError(
+                    f'Peringkat "{peringkat}" memerlukan output peringkat "{keperluan}". '
+                    f'Jalankan peringkat tersebut dahulu.'
+                )
+
+        if peringkat in tetapan.paksa:
+            simpanan.batal(peringkat)
+
+        masa_mula: float = time.perf_counter()
+        semua_output[peringkat], dijalankan = semua_fungsi[peringkat](
+            tetapan, simpanan, *(semua_output[k] for k in KEPERLUAN[peringkat])
+        )
+
+        print(
+            f'   [{peringkat}] {"dijalankan" if dijalankan else "daripada simpanan"}'
+            f' ({time.perf_counter() - masa_mula:.1f} saat)'
+        )
+
+    return semua_output
+
+
+def hurai_hujah(hujah: list = None) -> argparse.Namespace:
+    '''
+    Menghurai parameter daripada baris perintah. Jika '--konfig' diberi, nilai dalam
+    file JSON tersebut menjadi nilai lalai yang boleh ditimpa oleh pilihan baris
+    perintah.
+    '''
+    hari_ini: datetime.date = datetime.date.today()
+
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--konfig", help="File konfigurasi JSON.")
+    penghurai.add_argument(
+        "--peringkat", nargs="+", choices=SEMUA_PERINGKAT, default=SEMUA_PERINGKAT
+    )
+    penghurai.add_argument("--paksa", nargs="*", choices=SEMUA_PERINGKAT, default=[])
+    penghurai.add_argument("--folder-simpanan", default="simpanan/peringkat")
+
+# rayap
+    penghurai.add_argument("--laman-screener", default="screener_htm/Screener.html")
+    penghurai.add_argument("--mod-rayapan", choices=["async", "benang"], default="async")
+    penghurai.add_argument("--serentak", type=int, default=16)
+    penghurai.add_argument("--umur-maks", type=float, default=7)
+    penghurai.add_argument("--mod-muat", choices=["penuh", "sekat", "fragmen"], default="fragmen")
+
+# ekstrak dan saring
+    penghurai.add_argument("--fail-panel", default="simpanan/asas.parquet")
+    penghurai.add_argument("--tahun-ini", type=int, default=hari_ini.year)
+    penghurai.add_argument(
+        "--min-inlier",
+        type=lambda n: "sapu" if n == "sapu" else int(n),
+        default=7,
+        help="Integer, atau 'sapu' untuk sapuan min_inlier dan alpha.",
+    )
+    penghurai.add_argument("--mod-saringan", choices=["panel", "strim"], default="panel")
+
+# model dan laporan
+    penghurai.add_argument(
+        "--fail-harga", help="File harga CSV/Parquet (Date, Ticker, Close) untuk larian tanpa internet."
+    )
+    penghurai.add_argument("--folder-harga", default="simpanan/harga")
+    penghurai.add_argument("--jenis-harga", choices=["float64", "float32"], default="float64")
+    penghurai.add_argument(
+        "--agregat",
+        action="store_true",
+        help="Latih model dengan statistik bulanan (Ticker, tahun, bulan) dan bukan harga harian.",
+    )
+    penghurai.add_argument(
+        "--kaedah-inferens",
+        choices=menilai_saham.SEMUA_KAEDAH,
+        default="nuts",
+        help="'advi' dan 'pathfinder' untuk pratonton pantas.",
+    )
+    penghurai.add_argument("--folder-posterior", default="simpanan/posterior")
+    penghurai.add_argument(
+        "--panas",
+        action="store_true",
+        help="Mula panas daripada posterior NUTS terdahulu dengan hanya --tune-panas tune.",
+    )
+    penghurai.add_argument("--tune-panas", type=int, default=500)
+    penghurai.add_argument(
+        "--bil-serpihan",
+        type=int,
+        default=1,
+        help="Lebih daripada 1: latih satu model bagi setiap serpihan ticker secara selari.",
+    )
+    penghurai.add_argument(
+        "--pengumpulan",
+        choices=["bebas", "hiper"],
+        default="bebas",
+        help="'hiper': anggar hiperparameter global dahulu dan kongsi dengan semua serpihan.",
+    )
+    penghurai.add_argument("--proses", type=int, help="Bilangan proses bagi serpihan.")
+    penghurai.add_argument("--draw-tune", type=int, default=4000)
+    penghurai.add_argument("--target-accept", type=float, default=0.95)
+    penghurai.add_argument("--cores", type=int, default=4)
+    penghurai.add_argument("--tahun", type=int, default=hari_ini.year)
+    penghurai.add_argument("--bulan", type=int, default=hari_ini.month)
+
+    awal, _ = penghurai.parse_known_args(hujah)
+
+    if awal.konfig:
+        with open(awal.konfig, mode="r", encoding="utf-8") as k:
+            penghurai.set_defaults(**json.load(k))
+
+    tetapan: argparse.Namespace = penghurai.parse_args(hujah)
+
+    if tetapan.mod_saringan == "strim" and tetapan.min_inlier == "sapu":
+        penghurai.error("--mod-saringan strim tidak menyokong --min-inlier sapu.")
+
+    return tetapan
+
+
+if __name__ == "__main__":
+    jalankan(hurai_hujah())
@@ -9,9 +9,12 @@ yang dihitung daripada data EPS dan DPS.
 
 Langkah-langkah utama yang dilakukan:
 1. Membaca laman-laman HTML dari folder 'laman_saham/'.
-2. Mengekstrak data nama, kod, EPS, dan DPS daripada setiap laman HTML.
+2. Memuatkan panel asas (nama, kod, harga, EPS dan DPS) daripada simpanan
+   'simpanan/asas.parquet'. Hanya laman yang baharu atau berubah (mengikut hash
+   kandungan) dihurai semula menggunakan 'pelombong.ekstrak_laman' (lxml dan XPath).
 3. Melakukan pra-pemprosesan data, termasuk penapisan data berdasarkan tahun.
 4. Menghitung nilai cerun untuk EPS dan DPS menggunakan regresi linear (RANSAC).
+   Cerun minimum bagi semua saham dikira serentak dengan 'saringan.saring'.
 5. Menentukan nilai cerun akhir saham sebagai hasil darab cerun EPS dan DPS.
 6. Cerun akhir (hasil darab) hanya akan positif jika kedua-dua cerun EPS dan DPS
    adalah positif.
@@ -23,115 +26,328 @@ Kamus saham yang bagus yang disimpan dalam 'bursa.env' akan digunakan dalam file
 'menilai_saham.py' untuk langkah analisis selanjutnya.
 
 Fungsi utama dalam file ini:
+    nilai_saham(kod: str, nama: str, df: pd.DataFrame) -> tuple:
+        Menganalisis data EPS dan DPS saham dan mengembalikan kod, nama dan cerun saham.
     utama(laman: str) -> tuple:
         Menganalisis data saham dari laman HTML dan mengembalikan kod, nama dan cerun saham.
+    strim_saham(semua_laman: list, tahun_ini: int, min_inlier: int, ...):
+        Menilai laman secara selari dan menulis keputusan setiap laman sebaik sahaja siap.
+    pilih_saham_bagus(semua_laman: list, tahun_ini: int, min_inlier, mod: str) -> dict:
+        Menyaring semua laman saham dan mengembalikan kamus saham yang bagus.
 
 Catatan:
-    - File ini menggunakan modul 'pelombong' untuk ekstrak data HTML dan 'regresi'
-      untuk analisis statistik.
-    - Variabel global 'tahun_ini' digunakan untuk penapisan data berdasarkan tahun.
+    - File ini menggunakan modul 'pelombong' untuk ekstrak data HTML dan 'saringan'
+      (dengan 'regresi') untuk analisis statistik.
+    - Parameter 'tahun_ini' dan 'min_inlier' hanya diminta dalam blok __main__, jadi
+      modul ini boleh diimport (contohnya oleh 'jalankan.py' dan proses Pool) tanpa
+      input.
     - Pengiraan inlier hanya dilakukan jika data mencukupi (> 10 data).
     - Pengiraan cerun hanya dilakukan jika data mencukupi (> min_inlier data).
     - Nilai alpha digunakan dalam fungsi 'dapatkan_min_cerun' dari modul 'regresi'.
+    - Jika 'sapu' dimasukkan sebagai min_inlier, 'saringan.sapuan' mencuba grid
+      min_inlier dan alpha dengan hasil perantaraan yang sama, dan memilih tetapan
+      dengan 20 hingga 50 saham bagus.
+    - Dalam mod 'strim', setiap laman dinilai dengan 'utama' dan keputusannya (atau
+      ralatnya) ditulis serta-merta ke dalam 'keputusan_saringan.jsonl'. Laman yang
+      rosak tidak menghentikan larian, dan keputusan separa digunakan semula.
 '''
+import json
+import os
 import pandas as pd
 
 
-from bs4 import BeautifulSoup
+from functools import partial
 from glob import glob
 from multiprocessing import Pool
+from tabulate import tabulate
 
 
-from analisis_stat import regresi
+from analisis_stat import saringan
 from pelombongan import pelombong
+from pelombongan import simpanan_asas
 
 
-tahun_ini: int = eval(input("   Tahun ini = "))
-
-semua_laman: list = glob("laman_saham/*.htm")
-
-min_inlier: int = eval(input("   min_inlier (biasanya 7) = "))
-
-
-def utama(laman):
+def nilai_saham(
+        kod: str,
+        nama: str,
+        df: pd.DataFrame,
+        tahun_ini: int,
+        min_inlier: int,
+        benih: int = 0,
+    ) -> tuple:
     '''
-    Menganalisis data saham dari file HTML dan mengembalikan nama, kod, dan nilai
+    Menganalisis data EPS dan DPS sesuatu saham dan mengembalikan kod, nama, dan nilai
     cerun saham.
 
-    Fungsi ini membaca file HTML yang berisi data saham, mengekstrak nama dan kod
-    saham, dan menghitung nilai cerun berdasarkan data EPS dan DPS. Fungsi ini
-    menggunakan regresi linear untuk menentukan cerun, dan menyaring data berdasarkan
-    tahun.
+    Fungsi ini menyaring data berdasarkan tahun dan menggunakan regresi linear untuk
+    menentukan cerun EPS dan DPS. Saham dinilai sebagai panel satu saham dengan
+    'saringan.saring', jadi inlier RANSAC (aliran nombor rawak setiap saham) dan
+    cerunnya sama dengan mod panel bagi benih yang sama.
 
     Args:
-        laman (str): Alamat ke file HTML yang berisi data saham.
+        kod (str): Kod saham tanpa akhiran '.KL'.
+        nama (str): Nama saham.
+        df (pd.DataFrame): DataFrame dengan lajur 'fy', 'eps' dan 'dps'.
+        tahun_ini (int): Tahun semasa, digunakan untuk menyaring data tahun.
+        min_inlier (int): Bilangan inlier mesti melebihi nilai ini untuk cerun dikira.
+        benih (int): Benih RANSAC, supaya hasil boleh diulang.
 
     Returns:
         tuple: Tuple yang berisi kod (str), nama (str) dan cerun saham (float).
 
     Catatan:
-        - Fungsi ini menggunakan modul 'pelombong' dan 'regresi' untuk ekstrak dan
-        analisis data.
-        - Variabel global 'tahun_ini' digunakan untuk menyaring data tahun.
-        - Variabel global 'min_inlier' digunakan untuk menetapkan jumlah minimum data.
         - Nilai cerun dihitung hanya jika jumlah data yang sah adalah mencukupi.
         - Nilai cerun EPS dan DPS diatur ke 0.0 jika data tidak mencukupi atau tidak sah.
-        - Nilai alpha digunakan dalam fungsi 'dapatkan_min_cerun' dari modul 'regresi'.
+        - Nilai alpha digunakan oleh 'saringan.saring' (batas bawah CI cerun).
 
     Contoh:
-        Jika file 'saham.html' berisi data saham yang sah dan mencukupi, fungsi ini
-        akan mengembalikan: ('Nama Saham', 'Kod Saham', 0.15)
+        Jika data sah dan mencukupi, fungsi ini akan mengembalikan:
+        ('Kod Saham.KL', 'Nama Saham', 0.15)
 
         Jika data tidak valid atau tidak mencukupi, fungsi ini akan mengembalikan:
-        ('Nama Saham', 'Kod Saham', 0.0)
+        ('Kod Saham.KL', 'Nama Saham', 0.0)
     '''
-    cerun_eps: float = 0.
-    cerun_dps: float = 0.
     alpha: float = 0.05
 
+    if nama == kod:
+        return ("error", "error", 0.)
+
+    hasil: pd.DataFrame = saringan.saring(
+        df.assign(kod=kod, nama=nama), tahun_ini, min_inlier, alpha, benih
+    )
+    cerun: float = float(hasil["cerun"].iloc[0]) if len(hasil) else 0.
+
+    saham: tuple = (f'{kod}.KL', nama, cerun)
+
+    return saham
+
+
+def utama(laman: str, tahun_ini: int, min_inlier: int, benih: int = 0) -> tuple:
+    '''
+    Menganalisis data saham dari file HTML dan mengembalikan nama, kod, dan nilai
+    cerun saham.
+
+    Fungsi ini membaca file HTML yang berisi data saham, mengekstrak nama dan kod
+    saham, dan menghitung nilai cerun dengan 'nilai_saham'.
+
+    Args:
+        laman (str): Alamat ke file HTML yang berisi data saham.
+        tahun_ini (int): Tahun semasa.
+        min_inlier (int): Bilangan inlier mesti melebihi nilai ini untuk cerun dikira.
+        benih (int): Benih RANSAC.
+
+    Returns:
+        tuple: Tuple yang berisi kod (str), nama (str) dan cerun saham (float).
+    '''
     with open(laman, mode="r", encoding="utf-8") as l:
         kandungan = l.read()
-    
-    sup: BeautifulSoup = BeautifulSoup(kandungan, "html.parser")
 
-    nama, kod = pelombong.dapatkan_nama_saham(sup)
+    nama, kod, _, df = pelombong.ekstrak_laman(kandungan)
 
-    if nama == kod:
-        return ("error", "error", 0.)
-    
-    kod = f'{kod}.KL'
-    df: pd.DataFrame = pelombong.dapatkan_data_eps_dps(sup)
+    return nilai_saham(kod, nama, df, tahun_ini, min_inlier, benih)
 
-    if len(df) > 10:
-        df = df.drop(axis="index", index=df[df["fy"] >= tahun_ini].index)
-        df = df.drop(axis="index", index=df[df["fy"] < (tahun_ini-12)].index)
-        dfe_inlier: pd.DataFrame = regresi.dapatkan_inlier(df, "fy", "eps")
 
-        if len(dfe_inlier) > min_inlier:
-            cerun_eps = regresi.dapatkan_min_cerun(dfe_inlier, "fy", "eps", alpha)
+def _cuba_utama(laman: str, tahun_ini: int, min_inlier: int, benih: int = 0) -> dict:
+    '''
+    Seperti 'utama', tetapi mengembalikan rekod keputusan (dict) dan tidak menimbulkan
+    ralat, supaya satu laman yang rosak tidak menghentikan keseluruhan larian.
+    '''
+    rekod: dict = {
+        "laman": laman,
+        "mtime_ns": os.stat(laman).st_mtime_ns,
+        "tahun_ini": tahun_ini,
+        "min_inlier": min_inlier,
+        "benih": benih,
+    }
+
+    try:
+        kod, nama, cerun = utama(laman, tahun_ini, min_inlier, benih)
+        rekod.update({"kod": kod, "nama": nama, "cerun": float(cerun)})
+    except Exception as ralat:
+        rekod["ralat"] = repr(ralat)
+
+    return rekod
+
+
+def strim_saham(
+        semua_laman: list,
+        tahun_ini: int,
+        min_inlier: int,
+        fail_keputusan: str = "keputusan_saringan.jsonl",
+        saiz_ketul: int = None,
+        benih: int = 0,
+    ):
+    '''
+    Menilai semua laman secara selari dan menghasilkan (yield) rekod keputusan bagi
+    setiap laman sebaik sahaja ia siap.
 
-    if cerun_eps > 0.:
-        dfd_inlier: pd.DataFrame = regresi.dapatkan_inlier(df, "fy", "dps")
-    
-        if len(dfd_inlier) > min_inlier:
-            cerun_dps = regresi.dapatkan_min_cerun(dfd_inlier, "fy", "dps", alpha)
-        
-    cerun: float = cerun_eps * cerun_dps
+    Laman dibaca, dihurai dan dinilai dengan 'utama' dalam Pool.imap_unordered. Setiap
+    rekod (keputusan atau ralat) ditulis serta-merta sebagai satu baris JSON ke dalam
+    'fail_keputusan', jadi penggunaan memori kekal rata dan keputusan separa tidak
+    hilang jika larian terhenti. Pada larian seterusnya, laman yang telah berjaya
+    dinilai dengan 'tahun_ini', 'min_inlier' dan 'benih' yang sama, dan belum berubah
+    sejak itu, tidak dinilai semula.
 
-    saham: tuple = (kod, nama, cerun)
+    Args:
+        semua_laman (list): Senarai alamat file HTML laman saham.
+        tahun_ini (int): Tahun semasa.
+        min_inlier (int): Bilangan inlier mesti melebihi nilai ini untuk cerun dikira.
+        fail_keputusan (str): Alamat file JSON Lines keputusan.
+        saiz_ketul (int): chunksize bagi imap_unordered. Jika None, kira-kira empat
+        ketul bagi setiap proses, dihadkan kepada 64 laman supaya keputusan ditulis
+        dengan kerap.
+        benih (int): Benih RANSAC, sama seperti 'saringan.saring' dalam mod panel.
+
+    Yields:
+        dict: Rekod dengan kunci 'laman', 'mtime_ns', 'tahun_ini', 'min_inlier', 'benih'
+        dan sama ada 'kod', 'nama' dan 'cerun', atau 'ralat'.
 
-    return saham
+    Contoh:
+        for rekod in strim_saham(glob("laman_saham/*.htm"), 2025, 7):
+            if rekod.get("cerun", 0.) > 0:
+                ...
+    '''
+    siap: dict = dict()
+
+    if os.path.exists(fail_keputusan):
+        with open(fail_keputusan, mode="r", encoding="utf-8") as k:
+            for baris in k:
+                try:
+                    rekod: dict = json.loads(baris)
+                except json.JSONDecodeError:
+                    continue
+
+                sah: bool = "ralat" not in rekod and (
+                    rekod["tahun_ini"], rekod["min_inlier"], rekod.get("benih")
+                ) == (tahun_ini, min_inlier, benih)
+
+                if sah:
+                    siap[rekod["laman"]] = rekod
+                else:
+                    siap.pop(rekod["laman"], None)
+
+    baki: list = []
+
+    for laman in semua_laman:
+        rekod = siap.get(laman)
+
+        if rekod is not None and rekod["mtime_ns"] == os.stat(laman).st_mtime_ns:
+            yield rekod
+        else:
+            baki.append(laman)
+
+# tulis semula hanya rekod yang masih sah, supaya file tidak membesar setiap larian.
+    with open(fail_keputusan, mode="w", encoding="utf-8") as k:
+        for laman in semua_laman:
+            if laman in siap and laman not in baki:
+                k.write(json.dumps(siap[laman], ensure_ascii=False) + "\n")
+
+    if not baki:
+        return
+
+    if saiz_ketul is None:
+        saiz_ketul = max(1, min(64, len(baki) // ((os.cpu_count() or 1) * 4)))
+
+    with open(fail_keputusan, mode="a", encoding="utf-8") as k, Pool() as p:
+        nilai = partial(
+            _cuba_utama, tahun_ini=tahun_ini, min_inlier=min_inlier, benih=benih
+        )
+
+        for rekod in p.imap_unordered(nilai, baki, chunksize=saiz_ketul):
+            k.write(json.dumps(rekod, ensure_ascii=False) + "\n")
+            k.flush()
+
+            yield rekod
+
+
+def pilih_saham_bagus(
+        semua_laman: list,
+        tahun_ini: int,
+        min_inlier,
+        mod: str = "panel",
+        fail_simpanan: str = "simpanan/asas.parquet",
+    ) -> dict:
+    '''
+    Menyaring semua laman saham dan mengembalikan kamus saham yang bagus.
+
+    Args:
+        semua_laman (list): Senarai alamat file HTML laman saham.
+        tahun_ini (int): Tahun semasa.
+        min_inlier (int | str): Bilangan inlier mesti melebihi nilai ini untuk cerun
+        dikira, atau 'sapu' untuk mencuba grid min_inlier dan alpha dengan
+        'saringan.sapuan' dan memilih tetapan dalam julat sasaran.
+        mod (str): 'panel' (panel asas dan 'saringan.saring') atau 'strim'
+        ('strim_saham'). Mod 'strim' tidak menyokong 'sapu' dan menimbulkan ValueError.
+        fail_simpanan (str): Alamat file Parquet simpanan panel asas.
+
+    Returns:
+        dict: Kamus kod saham (dengan akhiran '.KL') kepada nama saham, bagi saham
+        dengan cerun akhir positif.
+    '''
+    if mod == "strim":
+        if min_inlier == "sapu":
+            raise ValueError("Mod 'strim' tidak menyokong min_inlier 'sapu'; berikan integer.")
+
+# setiap laman dinilai dan ditulis ke 'keputusan_saringan.jsonl' sebaik sahaja siap.
+        saham_bagus: dict = dict()
+        min_inlier = int(min_inlier)
+
+        for rekod in strim_saham(semua_laman, tahun_ini, min_inlier):
+            if "ralat" in rekod:
+                print(f'   {rekod["laman"]}: {rekod["ralat"]}')
+            elif rekod["cerun"] > 0:
+                saham_bagus[rekod["kod"]] = rekod["nama"]
+
+        return saham_bagus
+
+# panel asas dimuatkan dari simpanan, hanya laman yang berubah dihurai semula.
+    panel: pd.DataFrame = simpanan_asas.muat_panel(semua_laman, fail_simpanan)
+
+    if min_inlier == "sapu":
+# inlier dan cerun dikira sekali, kemudian dinilai bagi setiap (min_inlier, alpha).
+        ringkasan, pilihan = saringan.sapuan(panel, tahun_ini)
+
+        print(tabulate(
+            ringkasan[["min_inlier", "alpha", "bil_saham"]].pivot(
+                index="min_inlier", columns="alpha", values="bil_saham"
+            ),
+            headers="keys",
+            tablefmt="fancy_grid",
+        ))
+        print(f'   Tetapan dipilih: min_inlier = {pilihan["min_inlier"]}, alpha = {pilihan["alpha"]}')
+
+        return pilihan["saham"]
+
+    semua_saham: pd.DataFrame = saringan.saring(panel, tahun_ini, int(min_inlier))
+
+    return {
+        kod: nama for kod, nama, cerun
+        in semua_saham[["kod", "nama", "cerun"]].itertuples(index=False) if cerun > 0
+    }
+
+
+def tulis_env(saham_bagus: dict, fail_env: str = "bursa.env") -> None:
+    '''
+    Menyimpan kamus saham yang bagus ke dalam file .env untuk 'menilai_saham.py'.
+    '''
+    with open(fail_env, mode="w") as b:
+        b.write(f'ticker = {saham_bagus}')
 
 
 if __name__ == "__main__":
-    with Pool() as p:
-        semua_saham: list = p.map(utama, semua_laman)
-    
-    saham_bagus: dict = {kod: nama for kod, nama, cerun in semua_saham if cerun > 0}
+    tahun_ini: int = int(input("   Tahun ini = "))
+    mod: str = input("   Mod (panel atau strim, lalai panel) = ").strip().lower() or "panel"
+    min_inlier: str = input("   min_inlier (biasanya 7, atau 'sapu' untuk sapuan) = ").strip()
+
+    saham_bagus: dict = pilih_saham_bagus(
+        glob("laman_saham/*.htm"),
+        tahun_ini,
+        "sapu" if min_inlier.lower() == "sapu" else int(min_inlier),
+        mod,
+    )
     bil_saham_bagus: int = len(saham_bagus)
 
-    with open("bursa.env", mode="w") as b:
-        b.write(f'ticker = {saham_bagus}')
+    tulis_env(saham_bagus)
 
     print(f'''
  Terdapat {bil_saham_bagus} saham yang bagus.
@@ -141,4 +357,6 @@ Nota:
   Sasarkan bilangan saham bagus antara 20 hingga 50.
   Jika bilangan saham bagus > 50, naikkan nilai min_inlier.
   Jika bilangan saham bagus < 20, kurangkan nilai min_inlier.
+  Masukkan 'sapu' sebagai min_inlier untuk mencuba grid min_inlier dan alpha sekali
+  gus dan memilih tetapan dalam julat sasaran secara automatik.
     ''')
\ No newline at end of file
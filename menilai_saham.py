@@ -6,13 +6,19 @@ model Bayesian Hierarchical yang dibangunkan dengan Bambi untuk meramal harga sa
 dan memberikan cadangan pembelian berdasarkan ramalan tersebut.
 
 Langkah-langkah utama yang dilakukan:
-1. Meminta input tahun, bulan, draw_tune, dan target_accept untuk ramalan.
+1. Meminta input tahun, bulan, draw_tune, target_accept, mod likelihood dan kaedah
+   inferens untuk ramalan.
 2. Memuat data saham dari file HTML yang telah diproses sebelumnya menggunakan
    modul 'pelombong'.
-3. Melakukan penskalaan data harga saham menggunakan StandardScaler.
-4. Membangun dan melatih model Bayesian Hierarchical menggunakan Bambi.
-5. Meringkas hasil penemuan model menggunakan ArviZ.
-6. Menentukan saham dengan tren naik dan turun berdasarkan ringkasan model.
+3. Melakukan penskalaan data harga saham bagi setiap ticker menggunakan
+   'PenskalaKumpulan'.
+4. Membangun dan melatih model Bayesian Hierarchical menggunakan Bambi, sama ada
+   dengan harga harian atau dengan statistik bulanan ('agregat_data'). Jika data
+   model dan tetapan pensampel sama dengan larian sebelumnya, posterior dimuat dari
+   'simpanan/posterior/' tanpa pensampelan semula. Dengan mula panas, pensampelan
+   bermula daripada posterior terdahulu dengan tune yang lebih pendek.
+5. Memilih kesan tahun:Ticker bagi tahun ramalan terus daripada posterior.
+6. Menentukan saham dengan tren naik dan turun berdasarkan HDI kesan tersebut.
 7. Meramal harga saham untuk tahun dan bulan yang ditentukan.
 8. Mengembalikan skala harga ramalan ke skala asal.
 9. Menghitung harga beli yang disarankan.
@@ -23,16 +29,21 @@ Langkah-langkah utama yang dilakukan:
 
 Fungsi dan modul yang digunakan:
 - bambi: Membangun dan melatih model Bayesian Hierarchical.
-- arviz: Meringkas hasil pembinaan model.
+- arviz: Mengira HDI posterior.
 - ast: Mengubah string literal dari file .env menjadi dictionary.
 - dotenv: Memuatkan variabel lingkungan dari file Bursa.env.
-- sklearn.preprocessing.StandardScaler: Melakukan penskalaan data.
+- analisis_stat.penskalaan.PenskalaKumpulan: Melakukan penskalaan data bagi semua
+  ticker serentak.
+- modulam.simpanan_posterior.SimpananPosterior: Menyimpan dan memuat posterior.
 - tabulate: Mencetak data dalam format jadual.
 - pelombongan.pelombong.dapatkan_data_saham: Memuat data saham dari file HTML.
 
 Catatan:
 - Kamus 'ticker' di awal file perlu dikemaskini dengan kamus yang dihasilkan dari
 file 'melombong_data.py'.
+- Setiap langkah adalah fungsi ('sediakan_data', 'latih_model', 'tentukan_tren',
+'ramal' dan 'cetak_laporan') supaya ia boleh digunakan oleh 'jalankan.py'. Input
+hanya diminta dalam blok __main__.
 
 Output:
 - Jadual "Analisis Keseluruhan" yang berisi nama saham, ticker, tahun, bulan, harga ramalan,
@@ -46,107 +57,708 @@ import bambi as bmb
 import numpy as np
 import os
 import pandas as pd
+import pymc as pm
+import zlib
 
 from dotenv import load_dotenv
-from sklearn.preprocessing import StandardScaler
+from functools import partial
+from multiprocessing import Pool
 from tabulate import tabulate
 
 
+from analisis_stat import mula_panas
+from analisis_stat.penilai_draw import SAIZ_CEBISAN_DRAW, ringkas_draw
+from analisis_stat.penskalaan import PenskalaKumpulan
+from analisis_stat.tren import tanya_tren
+from modulam.simpanan_posterior import SimpananPosterior
 from pelombongan import pelombong
 
 
-if __name__ == "__main__":
-    tahun: int = input("   Tahun untuk diramal = ")
-    bulan: int = input("   Bulan untuk diramal = ")
-    draw_tune: int = eval(input("   Bilangan draw dan tune (biasanya 4000) = "))
-    target_accept: float = eval(input("   Nilai target_accept (biasanya 0.95) = "))
+FORMULA: str = "harga_piawai ~ 1 + (1|Ticker) + (bulan | tahun : Ticker)"
 
-    load_dotenv("bursa.env")
-    ticker: dict = ast.literal_eval(os.environ['ticker'])
+# kaedah inferens bagi 'latih_model'. 'nuts' ialah NUTS PyMC; 'nutpie' dan 'numpyro'
+# ialah pensampel NUTS luaran melalui PyMC; 'advi' dan 'pathfinder' ialah anggaran
+# pantas untuk pratonton.
+SEMUA_KAEDAH: list = ["nuts", "nutpie", "numpyro", "advi", "pathfinder"]
+
+# kaedah dalam SEMUA_KAEDAH yang merupakan pensampel MCMC.
+KAEDAH_MCMC: list = ["nuts", "nutpie", "numpyro"]
+
+# bilangan lelaran pengoptimuman ADVI.
+LELARAN_ADVI: int = 30000
+
+# sisihan piawai log bagi hiperprior LogNormal di sekitar hiperparameter global
+# (kira-kira 10%).
+SEBARAN_HIPER: float = .1
 
-    data: pd.DataFrame = pelombong.dapatkan_data_saham(ticker)
+# sigma bagi purata bulanan ialah sigma harian / sqrt(bil_hari), iaitu offset log_skala.
+FORMULA_SIGMA_AGREGAT: str = "sigma ~ 1 + offset(log_skala)"
+
+
+def sediakan_data(ticker: dict, pembekal=None, jenis_harga: str = "float64") -> tuple:
+    '''
+    Memuat data harga saham dan melaraskan harga tutup setiap saham kepada skala piawai.
+
+    Args:
+        ticker (dict): Kamus ticker saham (dengan akhiran '.KL') kepada nama saham.
+        pembekal: Pembekal harga bagi 'pelombong.dapatkan_data_saham'. Jika None,
+        Yahoo Finance melalui simpanan harga tempatan.
+        jenis_harga (str): Jenis data harga, 'float64' atau 'float32'.
+
+    Returns:
+        tuple: Tuple yang berisi:
+            - data (pd.DataFrame): Data daripada 'pelombong.dapatkan_data_saham' dengan
+            lajur tambahan 'harga_piawai'.
+            - harga_semasa (dict): Harga tutup terkini bagi setiap ticker.
+            - penskala (PenskalaKumpulan): Purata dan sisihan piawai harga bagi setiap
+            ticker.
+    '''
+    data: pd.DataFrame = pelombong.dapatkan_data_saham(
+        ticker, pembekal, jenis_harga=jenis_harga
+    )
 
+    return piawaikan_data(data)
+
+
+def piawaikan_data(data: pd.DataFrame) -> tuple:
+    '''
+    Merekodkan harga tutup terkini dan melaraskan harga tutup setiap saham dalam data
+    harga (contohnya sejarah hingga tarikh potong dalam 'ujian_balik.py') kepada skala
+    piawai.
+
+    Returns:
+        tuple: Seperti 'sediakan_data'.
+    '''
 # Menyimpan harga saham terkini untuk kegunaan seterusnya
     df_semasa: pd.DataFrame = data[data["Date"]==data["Date"].max()][["Ticker", "Close"]]
     harga_semasa: dict = dict(zip(df_semasa["Ticker"], df_semasa["Close"]))
 
-# Melaraskan data Close kepada skala piawai
-    kamus_penskala: dict = dict()
-
-    for saham, kumpulan in data.groupby("Ticker", observed=False):
-        penskala = StandardScaler()
-        kamus_penskala[saham] = penskala
-        data.loc[kumpulan.index, "harga_piawai"] = penskala.fit_transform(kumpulan[["Close"]])
+# Melaraskan data Close kepada skala piawai, dengan jenis data yang sama seperti Close
+    penskala: PenskalaKumpulan = PenskalaKumpulan()
+    data["harga_piawai"] = penskala.padan_jelmakan(data["Ticker"], data["Close"])
+
+    return data, harga_semasa, penskala
+
+
+def agregat_data(data: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Meringkaskan harga harian yang telah dilaraskan kepada statistik cukup bagi setiap
+    (Ticker, tahun, bulan).
+
+    Semua peramal dalam FORMULA hanya berubah mengikut bulan, jadi likelihood Normal
+    bagi semua hari dalam sebulan boleh ditulis semula dengan tepat menggunakan purata,
+    bilangan hari dan jumlah kuasa dua sisihan daripada purata sahaja. Ini
+    mengurangkan saiz likelihood kira-kira 20 kali ganda.
+
+    Args:
+        data (pd.DataFrame): Data daripada 'sediakan_data'.
+
+    Returns:
+        pd.DataFrame: Satu baris bagi setiap (Ticker, tahun, bulan) dengan lajur
+        Ticker, nama, tahun, bulan, harga_piawai (purata bulanan), bil_hari,
+        jumlah_kuasa_dua dan log_skala (-0.5 * log bil_hari).
+    '''
+    agregat: pd.DataFrame = (
+        data.assign(harga=data["harga_piawai"].astype("float64"))
+        .groupby(["Ticker", "tahun", "bulan"], observed=True, sort=True)
+        .agg(
+            nama=("nama", "first"),
+            harga_piawai=("harga", "mean"),
+            bil_hari=("harga", "size"),
+            varians=("harga", "var"),
+        )
+        .reset_index()
+    )
 
+# varians bulan dengan satu hari sahaja adalah NaN, tetapi jumlah kuasa duanya sifar.
+    agregat["jumlah_kuasa_dua"] = (agregat["varians"] * (agregat["bil_hari"] - 1)).fillna(0)
+    agregat["log_skala"] = -.5 * np.log(agregat["bil_hari"])
+    agregat["harga_piawai"] = agregat["harga_piawai"].astype(data["harga_piawai"].dtype)
+
+    return agregat.drop(columns="varians")
+
+
+def bina_model(
+        data: pd.DataFrame,
+        agregat: bool = False,
+        hiperparameter: dict = None,
+    ) -> bmb.Model:
+    '''
+    Membina model Bayesian Hierarchical FORMULA bagi data yang telah dilaraskan.
+
+    Args:
+        data (pd.DataFrame): Data daripada 'sediakan_data', atau daripada 'agregat_data'
+        jika agregat ialah True.
+        agregat (bool): Jika True, likelihood dikira daripada statistik bulanan.
+        Purata bulanan dimodelkan dengan sisihan sigma / sqrt(bil_hari), dan baki
+        likelihood harian (jumlah kuasa dua dalam setiap bulan) ditambah sebagai
+        Potential. Jumlah kedua-duanya sama dengan likelihood harian (kecuali pemalar),
+        jadi posterior kesan bulanan kekal sama.
+        hiperparameter (dict): Sisihan piawai kesan kumpulan global daripada
+        'anggar_hiperparameter', contohnya {"1|Ticker": 0.8}. Jika diberi, hiperprior
+        setiap istilah ialah LogNormal yang sempit (SEBARAN_HIPER) di sekitar nilai
+        tersebut dan bukan hiperprior lalai Bambi.
+
+    Returns:
+        bmb.Model: Model yang telah dibina (belum dilatih).
+    '''
+    priors: dict = None
+
+    if hiperparameter is not None:
+        priors = {
+            istilah: bmb.Prior(
+                "Normal",
+                mu=0,
+                sigma=bmb.Prior("LogNormal", mu=np.log(sisihan), sigma=SEBARAN_HIPER),
+            )
+            for istilah, sisihan in hiperparameter.items()
+        }
+
+    if not agregat:
+        model: bmb.Model = bmb.Model(
+            formula=FORMULA, data=data, priors=priors, noncentered=False
+        )
+        model.build()
+
+        return model
 
-# Membina dan melatih model
     model = bmb.Model(
-        formula="harga_piawai ~ 1 + (1|Ticker) + (bulan | tahun : Ticker)",
+        formula=bmb.Formula(FORMULA, FORMULA_SIGMA_AGREGAT),
         data=data,
+        priors=priors,
         noncentered=False,
     )
+    model.build()
+
+# log sigma harian ialah sigma_Intercept; sumbangan setiap bulan ialah
+# -(bil_hari - 1) * log sigma - jumlah_kuasa_dua / (2 * sigma^2).
+    with model.backend.model as model_pymc:
+        log_sigma = model_pymc["sigma_Intercept"]
+        pm.Potential(
+            "likelihood_dalam_bulan",
+            -float((data["bil_hari"] - 1).sum()) * log_sigma
+            - .5 * float(data["jumlah_kuasa_dua"].sum()) * pm.math.exp(-2 * log_sigma),
+        )
+
+    return model
+
+
+def latih_model(
+        data: pd.DataFrame,
+        draw_tune: int,
+        target_accept: float,
+        cores: int = 4,
+        agregat: bool = False,
+        kaedah: str = "nuts",
+        tune: int = None,
+        idata_lama: az.InferenceData = None,
+        hiperparameter: dict = None,
+        benih: int = None,
+    ) -> tuple:
+    '''
+    Membina dan melatih model Bayesian Hierarchical.
+
+    Args:
+        data (pd.DataFrame): Data daripada 'sediakan_data', atau daripada 'agregat_data'
+        jika agregat ialah True.
+        draw_tune (int): Bilangan draw dan tune.
+        target_accept (float): Nilai target_accept bagi NUTS.
+        cores (int): Bilangan teras (dan rantai) yang digunakan.
+        agregat (bool): Melatih dengan likelihood statistik bulanan (lihat 'bina_model').
+        kaedah (str): Kaedah inferens daripada SEMUA_KAEDAH. Bagi 'advi' dan
+        'pathfinder', draw_tune ialah bilangan draw daripada anggaran posterior dan
+        target_accept tidak digunakan.
+        tune (int): Bilangan tune. Jika None, sama dengan draw_tune.
+        idata_lama (az.InferenceData): Posterior NUTS daripada latihan sebelumnya bagi
+        model yang sama. Jika diberi, setiap rantai bermula pada satu draw posterior
+        lama, dan penyesuaian matriks jisim dan saiz langkah diteruskan daripada larian
+        lama (lihat 'analisis_stat.mula_panas'). Hanya bagi kaedah 'nuts'.
+        hiperparameter (dict): Hiperparameter global (lihat 'bina_model').
+        benih (int): Benih rawak bagi pensampel, pengoptimuman ADVI dan draw daripada
+        anggaran posterior. Jika None, hasil berbeza pada setiap larian.
+
+    Returns:
+        tuple: Tuple yang berisi model (bmb.Model) dan idata (az.InferenceData).
+
+    Catatan:
+        - 'nutpie' memerlukan pakej nutpie, 'numpyro' memerlukan numpyro (JAX) dan
+        'pathfinder' memerlukan pymc-extras.
+    '''
+    if kaedah not in SEMUA_KAEDAH:
+        raise ValueError(f'Kaedah inferens tidak dikenali: {kaedah}')
+
+    if idata_lama is not None and kaedah != "nuts":
+        raise ValueError("Mula panas hanya disokong bagi kaedah 'nuts'.")
+
+    model: bmb.Model = bina_model(data, agregat, hiperparameter)
+    tune = draw_tune if tune is None else tune
+
+    if idata_lama is not None:
+        bil_rantai: int = max(2, cores)
+        idata: az.InferenceData = model.fit(
+            draws=draw_tune,
+            tune=tune,
+            chains=bil_rantai,
+            cores=cores,
+            step=mula_panas.langkah_nuts(model.backend.model, idata_lama, target_accept),
+            initvals=mula_panas.titik_mula(model.backend.model, idata_lama, bil_rantai),
+            random_seed=benih,
+        )
+    elif kaedah == "advi":
+# 'model.fit' Bambi tidak menghantar random_seed kepada 'pm.fit', jadi ADVI dijalankan
+# terus pada model PyMC.
+        with model.backend.model:
+            idata: az.InferenceData = pm.fit(n=LELARAN_ADVI, random_seed=benih).sample(
+                draw_tune, random_seed=benih
+            )
+    elif kaedah == "pathfinder":
+        import pymc_extras as pmx
+
+        idata = pmx.fit(
+            method="pathfinder",
+            model=model.backend.model,
+            num_draws=draw_tune,
+            cores=cores,
+            random_seed=benih,
+        )
+    else:
+        idata = model.fit(
+            draws=draw_tune,
+            tune=tune,
+            cores=cores,
+            target_accept=target_accept,
+            nuts_sampler="pymc" if kaedah == "nuts" else kaedah,
+            random_seed=benih,
+        )
+
+    return model, _kemas_idata(idata)
+
+
+def _kemas_idata(idata: az.InferenceData) -> az.InferenceData:
+    '''
+    Membuang kumpulan warmup, pemboleh ubah terjelma (contohnya '..._log__') dan
+    pemboleh ubah bagi setiap cerapan (dimensi '__obs__') daripada idata, supaya output
+    semua kaedah inferens mempunyai pemboleh ubah posterior yang sama.
+    '''
+    posterior = idata.posterior
+    buang: list = [
+        nama for nama, nilai in posterior.data_vars.items()
+        if nama.endswith("__") or "__obs__" in nilai.dims
+    ]
+
+    return az.InferenceData(**{
+        kumpulan: posterior.drop_vars(buang) if kumpulan == "posterior" else idata[kumpulan]
+        for kumpulan in idata.groups()
+        if not kumpulan.startswith("warmup")
+    })
+
+
+def dapatkan_posterior(
+        data: pd.DataFrame,
+        penskala: PenskalaKumpulan,
+        draw_tune: int,
+        target_accept: float,
+        cores: int = 4,
+        agregat: bool = False,
+        kaedah: str = "nuts",
+        simpanan: SimpananPosterior = None,
+        panas: bool = False,
+        tune_panas: int = 500,
+        hiperparameter: dict = None,
+        serpihan: str = None,
+        kunci_hiperparameter: str = None,
+    ) -> tuple:
+    '''
+    Memuat posterior daripada simpanan jika data model, formula dan tetapan pensampel
+    sama dengan larian sebelumnya, atau melatih model dan menyimpan posteriornya.
+
+    Args:
+        data, draw_tune, target_accept, cores, agregat, kaedah: Seperti 'latih_model'.
+        penskala (PenskalaKumpulan): Penskala daripada 'sediakan_data', disimpan
+        bersama posterior.
+        simpanan (SimpananPosterior): Simpanan posterior. Jika None,
+        'simpanan/posterior'.
+        panas (bool): Jika True, tiada posterior tersimpan bagi data dan tetapan ini,
+        dan terdapat posterior NUTS terdahulu bagi formula yang sama (contohnya larian
+        suku tahun lepas) yang lulus diagnostik, model dilatih dengan mula panas
+        daripada posterior tersebut dengan hanya 'tune_panas' tune. Sumber mula panas
+        direkodkan dalam spesifikasi posterior tetapi bukan dalam kuncinya. Diagnostik
+        penumpuan (None bagi kaedah bukan MCMC atau satu rantai) dicetak dan disimpan
+        dalam spesifikasi posterior; posterior mula
+        panas dengan 'perlu_latih_penuh' True dilatih semula sepenuhnya pada larian
+        seterusnya.
+        tune_panas (int): Bilangan tune bagi mula panas.
+        hiperparameter (dict): Hiperparameter global (lihat 'bina_model').
+        serpihan (str): Label serpihan ticker (lihat 'latih_berserpihan'). Mula panas
+        hanya menggunakan posterior terdahulu bagi serpihan yang sama.
+        kunci_hiperparameter (str): Kunci hiperparameter daripada
+        'anggar_hiperparameter'. Jika diberi, kunci ini (dan bukan nilai hiperparameter)
+        menjadi sebahagian daripada kunci posterior; nilainya hanya direkodkan dalam
+        spesifikasi yang disimpan.
+
+    Returns:
+        tuple: Tuple yang berisi model (bmb.Model), idata (az.InferenceData) dan
+        folder posterior (str).
+    '''
+    simpanan = SimpananPosterior() if simpanan is None else simpanan
+    spesifikasi: dict = {
+        "formula": FORMULA,
+        "formula_sigma": FORMULA_SIGMA_AGREGAT if agregat else None,
+        "agregat": agregat,
+        "kaedah": kaedah,
+        "draw_tune": draw_tune,
+        "target_accept": target_accept,
+        "cores": cores,
+        "hiperparameter": (
+            hiperparameter if kunci_hiperparameter is None else kunci_hiperparameter
+        ),
+        "serpihan": serpihan,
+    }
+
+# kunci hanya bergantung kepada data dan tetapan asas, bukan sumber mula panas, supaya
+# larian semula dengan data yang sama memuat posterior tanpa melatih semula.
+    kunci: str = simpanan.kunci(data, spesifikasi)
+    tersimpan: dict = simpanan.muat(kunci)
+    spesifikasi_tersimpan: dict = {} if tersimpan is None else tersimpan["spesifikasi"]
+
+# posterior mula panas yang gagal diagnostik tidak digunakan semula; ia dilatih semula
+# sepenuhnya seperti yang disarankan oleh 'perlu_latih_penuh'.
+    latih_penuh: bool = "posterior_lama" in spesifikasi_tersimpan and bool(
+        (spesifikasi_tersimpan.get("diagnostik") or {}).get("perlu_latih_penuh")
+    )
 
-    idata= model.fit(draws=draw_tune, tune=draw_tune, cores=4, target_accept=target_accept)
+    if tersimpan is not None and not latih_penuh:
+# model dibina semula tanpa dilatih; posterior diambil daripada idata yang disimpan.
+        return (
+            bina_model(tersimpan["data"], agregat, hiperparameter),
+            tersimpan["idata"],
+            simpanan.folder_kunci(kunci),
+        )
+
+    kunci_lama: str = None
+
+    if panas and kaedah == "nuts" and not latih_penuh:
+        kunci_lama = simpanan.cari_terkini(
+            {
+                k: spesifikasi[k]
+                for k in ["formula", "formula_sigma", "agregat", "kaedah", "serpihan"]
+            },
+            kecuali=kunci,
+            sah_sahaja=True,
+        )
+
+# tanpa posterior terdahulu, mula panas menjadi latihan penuh biasa. Sumber mula panas
+# hanya direkodkan dalam spesifikasi yang disimpan.
+    if kunci_lama is not None:
+        spesifikasi.update(posterior_lama=kunci_lama, tune=tune_panas)
+        model, idata = latih_model(
+            data,
+            draw_tune,
+            target_accept,
+            cores,
+            agregat,
+            kaedah,
+            tune=tune_panas,
+            idata_lama=simpanan.muat(kunci_lama)["idata"],
+            hiperparameter=hiperparameter,
+        )
+    else:
+        model, idata = latih_model(
+            data,
+            draw_tune,
+            target_accept,
+            cores,
+            agregat,
+            kaedah,
+            hiperparameter=hiperparameter,
+        )
+
+    diagnostik: dict = mula_panas.diagnostik(idata, kaedah in KAEDAH_MCMC)
+    print(f'   Diagnostik: {diagnostik}')
+
+    folder: str = simpanan.simpan(
+        kunci,
+        data,
+        idata,
+        penskala,
+        {**spesifikasi, "nilai_hiperparameter": hiperparameter, "diagnostik": diagnostik},
+    )
 
-# Meringkaskan penemuan daripada model
-    ringkasan = az.summary(idata)
+    return model, idata, folder
+
+
+def anggar_hiperparameter(
+        data: pd.DataFrame,
+        agregat: bool = False,
+        simpanan: SimpananPosterior = None,
+        benih: int = 0,
+    ) -> tuple:
+    '''
+    Menganggar sisihan piawai kesan kumpulan FORMULA bagi semua ticker sekali gus,
+    untuk dikongsi oleh semua serpihan dalam 'latih_berserpihan'.
+
+    Model penuh dilatih dengan ADVI pada statistik bulanan ('agregat_data'), jadi
+    langkah ini jauh lebih pantas daripada melatih model penuh dengan NUTS. ADVI dan
+    draw daripadanya menggunakan benih tetap, dan hasilnya disimpan dalam simpanan
+    posterior di bawah hash data penuh, jadi larian semula dengan data yang sama
+    mengembalikan hiperparameter yang sama tanpa melatih semula.
+
+    Args:
+        data, agregat: Seperti 'latih_model'.
+        simpanan (SimpananPosterior): Simpanan posterior. Jika None,
+        'simpanan/posterior'.
+        benih (int): Benih rawak ADVI.
+
+    Returns:
+        tuple: Kamus istilah kesan kumpulan (contohnya '1|Ticker') kepada purata
+        posterior sisihan piawainya (dict), dan kunci hiperparameter (str) bagi
+        spesifikasi posterior serpihan.
+    '''
+    simpanan = SimpananPosterior() if simpanan is None else simpanan
+    data = data if agregat else agregat_data(data)
+    kunci: str = simpanan.kunci(data, {
+        "formula": FORMULA,
+        "formula_sigma": FORMULA_SIGMA_AGREGAT,
+        "kaedah": "advi",
+        "lelaran": LELARAN_ADVI,
+        "draw": 1000,
+        "benih": benih,
+    })
+    hiperparameter: dict = simpanan.muat_hiperparameter(kunci)
+
+    if hiperparameter is None:
+        _, idata = latih_model(data, 1000, .95, agregat=True, kaedah="advi", benih=benih)
+        hiperparameter = {
+            nama.removesuffix("_sigma"): float(idata.posterior[nama].mean())
+            for nama in idata.posterior.data_vars
+            if "|" in nama and nama.endswith("_sigma")
+        }
+        simpanan.simpan_hiperparameter(kunci, hiperparameter)
+
+    return hiperparameter, kunci
+
+
+def bahagikan_ticker(ticker: dict, bil_serpihan: int) -> list:
+    '''
+    Membahagikan ticker kepada serpihan mengikut hash CRC32 kod ticker, jadi setiap
+    ticker kekal dalam serpihan yang sama walaupun ticker lain ditambah atau dibuang.
+
+    Returns:
+        list: Senarai kamus ticker (tanpa serpihan kosong).
+    '''
+    semua_serpihan: list = [dict() for _ in range(bil_serpihan)]
+
+    for kod, nama in ticker.items():
+        semua_serpihan[zlib.crc32(kod.encode("utf-8")) % bil_serpihan][kod] = nama
+
+    return [serpihan for serpihan in semua_serpihan if serpihan]
+
+
+def _latih_serpihan(tugasan: tuple, **tetapan) -> str:
+    '''
+    Melatih (atau memuat) posterior satu serpihan dan mengembalikan foldernya.
+    '''
+    label, data = tugasan
+    _, _, folder = dapatkan_posterior(data, serpihan=label, **tetapan)
+
+    return folder
+
+
+def latih_berserpihan(
+        data: pd.DataFrame,
+        penskala: PenskalaKumpulan,
+        bil_serpihan: int,
+        draw_tune: int,
+        target_accept: float,
+        agregat: bool = False,
+        kaedah: str = "nuts",
+        simpanan: SimpananPosterior = None,
+        panas: bool = False,
+        tune_panas: int = 500,
+        pengumpulan: str = "bebas",
+        proses: int = None,
+    ) -> list:
+    '''
+    Membahagikan ticker kepada serpihan dan melatih satu model FORMULA bagi setiap
+    serpihan secara selari dalam kumpulan proses, supaya masa latihan dibatasi oleh
+    saiz serpihan dan bukan bilangan ticker.
+
+    Setiap serpihan dilatih dengan 'dapatkan_posterior' (satu teras setiap serpihan,
+    jadi semua teras digunakan oleh serpihan yang berlainan) dan disimpan dalam
+    simpanan posterior, jadi serpihan yang datanya tidak berubah tidak dilatih semula.
+
+    Args:
+        data, penskala, draw_tune, target_accept, agregat, kaedah, simpanan, panas,
+        tune_panas: Seperti 'dapatkan_posterior'.
+        bil_serpihan (int): Bilangan serpihan (lihat 'bahagikan_ticker').
+        pengumpulan (str): Cara kesan kumpulan dikongsi antara serpihan:
+            - 'bebas': Setiap serpihan menganggar hiperparameternya sendiri, jadi
+            pengumpulan (1|Ticker) hanya berlaku dalam serpihan.
+            - 'hiper': Hiperparameter global dianggar dahulu bagi semua ticker dengan
+            'anggar_hiperparameter', dan semua serpihan menggunakan hiperprior sempit
+            di sekitar nilai tersebut.
+        proses (int): Bilangan proses. Jika None, bilangan teras komputer.
+
+    Returns:
+        list: Senarai folder posterior, satu bagi setiap serpihan.
+    '''
+    hiperparameter: dict = None
+    kunci_hiperparameter: str = None
+
+    if pengumpulan == "hiper":
+        hiperparameter, kunci_hiperparameter = anggar_hiperparameter(data, agregat, simpanan)
+    elif pengumpulan != "bebas":
+        raise ValueError(f'Pengumpulan tidak dikenali: {pengumpulan}')
+
+    semua_serpihan: list = bahagikan_ticker(
+        {kod: None for kod in data["Ticker"].unique()}, bil_serpihan
+    )
+    semua_tugasan: list = []
+
+    for i, serpihan in enumerate(semua_serpihan):
+        data_serpihan: pd.DataFrame = data[data["Ticker"].isin(serpihan)].reset_index(drop=True)
+
+# kategori ticker lain akan menjadi aras model yang tiada data.
+        for lajur in ["Ticker", "nama"]:
+            if isinstance(data_serpihan[lajur].dtype, pd.CategoricalDtype):
+                data_serpihan[lajur] = data_serpihan[lajur].cat.remove_unused_categories()
+
+        semua_tugasan.append((f'{i}/{bil_serpihan}', data_serpihan))
+
+    with Pool(proses) as p:
+        return p.map(
+            partial(
+                _latih_serpihan,
+                penskala=penskala,
+                draw_tune=draw_tune,
+                target_accept=target_accept,
+                cores=1,
+                agregat=agregat,
+                kaedah=kaedah,
+                simpanan=simpanan,
+                panas=panas,
+                tune_panas=tune_panas,
+                hiperparameter=hiperparameter,
+                kunci_hiperparameter=kunci_hiperparameter,
+            ),
+            semua_tugasan,
+            chunksize=1,
+        )
+
+
+def tentukan_tren(idata: az.InferenceData, tahun: int) -> dict:
+    '''
+    Menentukan saham dengan tren tahunan dan bulanan yang naik atau jatuh bagi tahun
+    yang diberikan, berdasarkan HDI 94% daripada 'tanya_tren'.
+
+    Returns:
+        dict: Kamus dengan kunci 'tahun_naik', 'tahun_jatuh', 'bulan_naik' dan
+        'bulan_jatuh', setiap satu senarai ticker.
+    '''
+    jadual_tren: pd.DataFrame = tanya_tren(idata, tahun)
+
+    return {
+        lajur: jadual_tren.loc[jadual_tren[lajur], "Ticker"].tolist()
+        for lajur in ["tahun_naik", "tahun_jatuh", "bulan_naik", "bulan_jatuh"]
+    }
+
+
+def ramal_baris(
+        model: bmb.Model,
+        idata: az.InferenceData,
+        tahun: int,
+        semua_bulan: list,
+        penskala: PenskalaKumpulan,
+        prob: float = .94,
+        saiz_cebisan: int = SAIZ_CEBISAN_DRAW,
+        jenis: str = "float64",
+    ) -> pd.DataFrame:
+    '''
+    Meramal purata harga bagi setiap ticker dalam model pada tahun dan bulan yang
+    diberikan sahaja, tanpa grid penuh tahun x bulan x Ticker 'bmb.interpret.predictions'.
+
+    Peramal linear baris ramalan dinilai terus daripada draw posterior dengan
+    'penilai_draw.ringkas_draw', dalam cebisan 'saiz_cebisan' draw, dan purata serta
+    HDI dikumpul tanpa matriks penuh draw x baris.
+
+    Args:
+        tahun (int): Tahun ramalan. Hanya ticker yang mempunyai data pada tahun ini
+        diramal, kerana kesan tahun:Ticker bagi aras lain tidak wujud.
+        semua_bulan (list): Bulan ramalan, contohnya [bulan] atau ufuk beberapa bulan.
+        penskala (PenskalaKumpulan): Penskala bagi mengembalikan skala harga asal.
+        prob (float): Kebarangkalian HDI antara bawah dan atas.
+        saiz_cebisan (int): Bilangan draw bagi setiap cebisan.
+        jenis (str): Jenis data draw semasa penilaian, 'float64' atau 'float32'.
+
+    Returns:
+        pd.DataFrame: Satu baris bagi setiap (Ticker, bulan) dengan lajur Ticker,
+        tahun, bulan, harga_ramalan (purata posterior), bawah dan atas (had HDI prob,
+        seperti 'bmb.interpret.predictions' dengan use_hdi=True), dalam skala harga
+        asal.
+    '''
+    data_model: pd.DataFrame = model.data
+
+# satu baris templat bagi setiap ticker, jadi jenis data (categorical, int16) sama
+# dengan data model.
+    templat: pd.DataFrame = data_model[data_model["tahun"] == tahun].drop_duplicates(
+        "Ticker"
+    ).drop(columns="bulan")
+    baris: pd.DataFrame = templat.merge(
+        pd.DataFrame({"bulan": np.asarray(semua_bulan, dtype=data_model["bulan"].dtype)}),
+        how="cross",
+    ).reset_index(drop=True)
+
+    nilai: np.ndarray = ringkas_draw(
+        idata.posterior,
+        baris,
+        list(model.components[model.family.likelihood.parent].terms),
+        [],
+        saiz_cebisan,
+        jenis,
+        hdi_prob=prob,
+    )
 
-# Menentukan tren tahunan dan bulanan saham
-    tahun_positif = (ringkasan[(ringkasan["hdi_3%"] > 0)
-        & (ringkasan.index.str.startswith("1"))
-        & (ringkasan.index.str.contains(tahun))
-    ])
-    tahun_ini_naik = [x.split(":")[-1].strip("]") for x in tahun_positif.index]
-
-    tahun_negatif = (ringkasan[(ringkasan["hdi_97%"] < 0)
-        & (ringkasan.index.str.startswith("1"))
-        & (ringkasan.index.str.contains(tahun))
-    ])
-    tahun_ini_jatuh = [x.split(":")[-1].strip("]") for x in tahun_negatif.index]
-
-    bulan_positif = (ringkasan[(ringkasan["hdi_3%"] > 0)
-        & (ringkasan.index.str.startswith("bulan"))
-        & (ringkasan.index.str.contains(tahun))
-    ])
-    bulan_naik = [x.split(":")[-1].strip("]") for x in bulan_positif.index]
-
-    bulan_negatif = (ringkasan[(ringkasan["hdi_97%"] < 0)
-        & (ringkasan.index.str.startswith("bulan"))
-        & (ringkasan.index.str.contains(tahun))
-    ])
-    bulan_jatuh = [x.split(":")[-1].strip("]") for x in bulan_negatif.index]
-
-# Menghasilkan ramalan saham mengikut model
-    ramalan: pd.DataFrame = bmb.interpret.predictions(
-        model,
-        idata,
-        ["tahun", "bulan", "Ticker"]
+    ramalan: pd.DataFrame = baris[["Ticker", "tahun", "bulan"]].copy()
+    ramalan[["harga_ramalan", "bawah", "atas"]] = penskala.jelmakan_songsang(
+        ramalan["Ticker"], nilai
     )
 
-# Mengehadkan paparan ramalan kepada bulan dan tahun yang dikehendaki
-    ramalan = ramalan[(ramalan["tahun"]==eval(tahun)) & (ramalan["bulan"]==eval(bulan))]
+    return ramalan
+
+
+def ramal(
+        model: bmb.Model,
+        idata: az.InferenceData,
+        tahun: int,
+        bulan: int,
+        ticker: dict,
+        penskala: PenskalaKumpulan,
+        harga_semasa: dict,
+        tren: dict,
+    ) -> pd.DataFrame:
+    '''
+    Menghasilkan jadual ramalan harga bagi tahun dan bulan yang dikehendaki.
+
+    Returns:
+        pd.DataFrame: Jadual dengan lajur nama, Ticker, tahun, bulan, harga_ramalan,
+        bawah, atas, harga_beli, harga_semasa, tren_tahun dan tren_bulan.
+    '''
+# Meramal hanya baris tahun dan bulan yang dikehendaki, dalam skala harga asal
+    ramalan: pd.DataFrame = ramal_baris(model, idata, tahun, [bulan], penskala)
 
 # Menambah rekod nama saham sebagai rujukan
     ramalan["nama"] = ramalan["Ticker"].map(ticker)
 
-# Melaraskan harga saham kembali kepada skala asal
-    for saham, kumpulan in ramalan.groupby("Ticker", observed=False):
-        penskala = kamus_penskala[saham]
-        ramalan.loc[kumpulan.index, ["harga_ramalan", "bawah", "atas"]] = (
-            penskala.inverse_transform(
-                kumpulan[["estimate", "lower_3.0%", "upper_97.0%"]]
-            ))
-
 # Menentukan harga beli di mana harga ramalan adalah 1.05 x harga beli    
     ramalan["harga_beli"] = ramalan["harga_ramalan"] / 1.05
 
 # Memaparkan tren tahunan dan bulanan saham
     ramalan["year_up"] = np.where(
-        ramalan["Ticker"].isin(tahun_ini_naik), "naik", "-"
+        ramalan["Ticker"].isin(tren["tahun_naik"]), "naik", "-"
     )
 
     ramalan["year_down"] = np.where(
-        ramalan["Ticker"].isin(tahun_ini_jatuh), "jatuh", "-"
+        ramalan["Ticker"].isin(tren["tahun_jatuh"]), "jatuh", "-"
     )
 
     ramalan["tren_tahun"] = (ramalan["year_up"]
@@ -154,11 +766,11 @@ if __name__ == "__main__":
                         + ramalan["year_down"]).str.strip("-")
     
     ramalan["month_up"] = np.where(
-        ramalan["Ticker"].isin(bulan_naik), "naik", "-"
+        ramalan["Ticker"].isin(tren["bulan_naik"]), "naik", "-"
     )
 
     ramalan["month_down"] = np.where(
-        ramalan["Ticker"].isin(bulan_jatuh), "jatuh", "-"
+        ramalan["Ticker"].isin(tren["bulan_jatuh"]), "jatuh", "-"
     )
 
     ramalan["tren_bulan"] = (ramalan["month_up"]
@@ -170,7 +782,7 @@ if __name__ == "__main__":
     ramalan["harga_semasa"] = ramalan["Ticker"].map(harga_semasa).astype("float64")
 
 # Mengatur semula jadual ramalan
-    ramalan = ramalan[[
+    return ramalan[[
         "nama",
         "Ticker",
         "tahun",
@@ -184,6 +796,58 @@ if __name__ == "__main__":
         "tren_bulan",
     ]]
 
+
+def ramal_berserpihan(
+        semua_folder: list,
+        tahun: int,
+        bulan: int,
+        ticker: dict,
+        harga_semasa: dict,
+    ) -> pd.DataFrame:
+    '''
+    Memuat posterior setiap serpihan (atau satu posterior penuh), menentukan tren dan
+    meramal bagi setiap satu, dan menggabungkan hasilnya menjadi satu jadual seperti
+    'ramal'.
+
+    Args:
+        semua_folder (list): Folder posterior daripada 'latih_berserpihan' atau
+        'dapatkan_posterior'.
+
+    Returns:
+        pd.DataFrame: Jadual 'ramal' bagi semua ticker.
+    '''
+    semua_ramalan: list = []
+
+    for folder in semua_folder:
+        tersimpan: dict = SimpananPosterior(os.path.dirname(folder)).muat(
+            os.path.basename(folder)
+        )
+        spesifikasi: dict = tersimpan["spesifikasi"]
+        model: bmb.Model = bina_model(
+            tersimpan["data"],
+            spesifikasi["agregat"],
+            spesifikasi.get("nilai_hiperparameter", spesifikasi.get("hiperparameter")),
+        )
+
+        semua_ramalan.append(ramal(
+            model,
+            tersimpan["idata"],
+            tahun,
+            bulan,
+            ticker,
+            tersimpan["penskala"],
+            harga_semasa,
+            tentukan_tren(tersimpan["idata"], tahun),
+        ))
+
+    return pd.concat(semua_ramalan, ignore_index=True)
+
+
+def cetak_laporan(ramalan: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Mencetak jadual "Analisis Keseluruhan" dan "Peluang", dan mengembalikan jadual
+    peluang (saham dengan harga semasa di bawah batas bawah ramalan).
+    '''
 # Memaparkan jadual ramalan dalam format yang senang dibaca
     print("")
     print("-"*100)
@@ -211,4 +875,38 @@ if __name__ == "__main__":
         tablefmt="fancy_grid",
         floatfmt=".3f",
         stralign="center",
-    ))
\ No newline at end of file
+    ))
+
+    return peluang
+
+
+if __name__ == "__main__":
+    tahun: int = int(input("   Tahun untuk diramal = "))
+    bulan: int = int(input("   Bulan untuk diramal = "))
+    draw_tune: int = int(input("   Bilangan draw dan tune (biasanya 4000) = "))
+    target_accept: float = float(input("   Nilai target_accept (biasanya 0.95) = "))
+    agregat: bool = input("   Guna likelihood agregat bulanan? (y/n) = ").strip().lower() == "y"
+    kaedah: str = input(f'   Kaedah inferens {SEMUA_KAEDAH} (biasanya nuts) = ').strip() or "nuts"
+    panas: bool = input("   Mula panas daripada posterior terdahulu? (y/n) = ").strip().lower() == "y"
+
+    load_dotenv("bursa.env")
+    ticker: dict = ast.literal_eval(os.environ['ticker'])
+
+    data, harga_semasa, penskala = sediakan_data(ticker)
+
+    if agregat:
+        data = agregat_data(data)
+
+# Membina dan melatih model, atau memuat posterior yang tersimpan
+    model, idata, _ = dapatkan_posterior(
+        data, penskala, draw_tune, target_accept, agregat=agregat, kaedah=kaedah, panas=panas
+    )
+
+# Menentukan tren tahunan dan bulanan saham
+    tren: dict = tentukan_tren(idata, tahun)
+
+    ramalan: pd.DataFrame = ramal(
+        model, idata, tahun, bulan, ticker, penskala, harga_semasa, tren
+    )
+
+    cetak_laporan(ramalan)
@@ -10,47 +10,133 @@ Laman saham yang dimuat turun akan digunakan dalam fail 'melombong_data.py' untu
 analisis selanjutnya.
 
 Langkah-langkah yang dilakukan:
-1. Menghapuskan fail HTML lama dalam folder 'laman_saham'.
-2. Membaca URL daripada fail 'screener_htm/Screener.html'.
-3. Memuat turun dan menyimpan setiap laman saham sebagai fail HTML.
-4. Mencetak ringkasan jumlah laman saham yang berjaya dan bermasalah.
+1. Meminta input mod rayapan, bilangan laman serentak, umur maksimum laman dan mod
+   muat. Mod 'sekat' menyekat gambar, fon, CSS, media, iklan dan analitik. Mod
+   'fragmen' juga menyekat sumber tersebut dan hanya menyimpan <title>, #price dan
+   jadual financial_reports yang diekstrak dalam pelayar.
+2. Jika lejar 'laman_gagal.json' wujud, pengguna boleh memilih untuk memuat turun
+   semula hanya URL yang gagal dalam larian sebelumnya.
+3. Jika tidak, membaca URL daripada fail 'screener_htm/Screener.html' dan menghapuskan
+   hanya fail HTML bagi saham yang tiada lagi dalam laman screener.
+4. Melangkau laman yang masih segar mengikut manifest 'laman_saham/manifest.jsonl'.
+   Larian yang terhenti akan bersambung dari laman terakhir yang direkodkan.
+5. Memuat turun dan menyimpan setiap laman saham sebagai fail HTML, sama ada secara
+   tak segerak (kelas 'PerayapAsync') atau dengan kumpulan benang dan pelayar yang
+   tahan lama (kelas 'Perayap'). Setiap laman direkodkan dalam manifest dengan URL,
+   masa ambil, status HTTP dan hash kandungan.
+6. Menyimpan URL yang masih gagal selepas semua cubaan ke dalam 'laman_gagal.json'.
+7. Mencetak ringkasan jumlah laman saham yang berjaya dan bermasalah.
 '''
 
 
 import os
 
 
-from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 
 
 from modulam import pencatit_masa
 from pelombongan import pelombong
+from pelombongan import perayap
+from pelombongan.manifest import Manifest, kod_daripada_url
+
+
+fail_lejar: str = "laman_gagal.json"
+
+
+def simpan_semua_laman(
+        mod: str = "async",
+        serentak: int = 16,
+        umur_maks: float = 7,
+        mod_muat: str = "fragmen",
+        ulang_gagal: bool = False,
+        laman_screener: str = "screener_htm/Screener.html",
+    ) -> tuple:
+    '''
+    Memuat turun semua laman saham yang belum segar dan menyimpannya sebagai file HTML.
+
+    Args:
+        mod (str): 'async' (PerayapAsync) atau 'benang' (Perayap).
+        serentak (int): Bilangan laman serentak (atau pelayar bagi mod 'benang').
+        umur_maks (float): Umur maksimum laman dalam hari sebelum dimuat turun semula.
+        mod_muat (str): 'penuh', 'sekat' atau 'fragmen'.
+        ulang_gagal (bool): Jika True, hanya URL dalam lejar 'laman_gagal.json' dimuat
+        turun semula.
+        laman_screener (str): Alamat laman screener yang disimpan.
+
+    Returns:
+        tuple: Tuple yang berisi jumlah laman baharu yang berjaya disimpan (int),
+        jumlah URL yang perlu diambil (int) dan kamus URL yang gagal (dict).
+    '''
+    tetapan_muat: dict = {
+        "sekat_sumber": mod_muat in ("sekat", "fragmen"),
+        "fragmen_sahaja": mod_muat == "fragmen",
+    }
+
+    manifest: Manifest = Manifest("laman_saham/manifest.jsonl")
+
+    if ulang_gagal:
+        semua_url: set = perayap.baca_lejar(fail_lejar)
+    else:
+# dapatkan set semua url.
+        semua_url = pelombong.dapatkan_semua_url(laman_screener)
+
+# hapuskan hanya laman.htm bagi saham yang tiada lagi dalam laman screener
+        semua_kod: set = {kod_daripada_url(u) for u in semua_url}
+        for h in glob("laman_saham/*.htm"):
+            if os.path.basename(h)[:-4] not in semua_kod: os.remove(h)
+
+# langkau laman yang masih segar.
+    url_perlu: list = [u for u in semua_url if manifest.perlu_diambil(u, umur_maks)]
+    jumlah_url: int = len(url_perlu)
+    print(f'   {len(semua_url) - jumlah_url} laman masih segar dan dilangkau.')
+
+# simpan semua laman.
+    if mod == "async":
+        p = perayap.PerayapAsync(
+            jumlah_url=jumlah_url, serentak=serentak, manifest=manifest, **tetapan_muat
+        )
+        jumlah_laman_baharu: int = p.rayap(url_perlu)
+    else:
+        with perayap.Perayap(
+            jumlah_url=jumlah_url, bil_pelayar=serentak, manifest=manifest, **tetapan_muat
+        ) as p:
+            jumlah_laman_baharu = p.rayap(url_perlu)
+
+# rekod url yang gagal untuk larian seterusnya.
+    perayap.simpan_lejar(p.gagal, fail_lejar)
+    manifest.padatkan()
+
+    for url, butiran in p.gagal.items():
+        print(f'   {url}: {butiran["ralat"]}')
+
+    return jumlah_laman_baharu, jumlah_url, p.gagal
 
 
 if __name__ == "__main__":
-    with pencatit_masa.mencatit_masa():
-# hapuskan semula laman.html yang lama dalam folder laman_saham
-        semua_laman_htm_lama: list = glob("laman_saham/*.htm")    
-        for h in semua_laman_htm_lama: os.remove(h)
+    mod: str = input("   Mod rayapan, async atau benang (biasanya async) = ") or "async"
+    serentak: int = int(input("   Bilangan laman serentak (biasanya 16) = ") or 16)
+    umur_maks: float = float(input("   Umur maksimum laman dalam hari (biasanya 7) = ") or 7)
+    mod_muat: str = input("   Mod muat, penuh, sekat atau fragmen (biasanya fragmen) = ") or "fragmen"
 
-# laman screener disimpan sebagai Screener.html
-        laman_screener: str = "screener_htm/Screener.html"
+    url_gagal: set = perayap.baca_lejar(fail_lejar)
+    ulang_gagal: bool = False
 
-# dapatkan set semua url.
-        semua_url: set = pelombong.dapatkan_semua_url(laman_screener)
-        jumlah_url: int = len(semua_url)
+    if url_gagal:
+        ulang_gagal = input(
+            f'   Muat turun semula {len(url_gagal)} laman dalam {fail_lejar} sahaja? (y/n) = '
+        ).lower() == "y"
 
-# simpan semua laman.
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            executor.map(pelombong.simpan_laman, semua_url)
+    with pencatit_masa.mencatit_masa():
+# laman screener disimpan sebagai Screener.html
+        jumlah_laman_baharu, jumlah_url, _ = simpan_semua_laman(
+            mod, serentak, umur_maks, mod_muat, ulang_gagal, "screener_htm/Screener.html"
+        )
 
-        semua_laman_baharu: list = glob("laman_saham/*.htm")
-        jumlah_laman_baharu: int = len(semua_laman_baharu)
-        bil_laman_stok_bermasalah: int = jumlah_url - jumlah_laman_baharu
+    bil_laman_stok_bermasalah: int = jumlah_url - jumlah_laman_baharu
 
     print(f'''
-Terdapat {bil_laman_stok_bermasalah} laman stok bermasalah.
+Terdapat {bil_laman_stok_bermasalah} laman stok bermasalah (direkodkan dalam {fail_lejar}).
 Semua {jumlah_laman_baharu} / {jumlah_url} laman stok selesai disimpan.
 Sila teruskan ke file melombong_data.py .
-    ''')
\ No newline at end of file
+    ''')
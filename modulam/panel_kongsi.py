@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import sys
+
+
+from multiprocessing import resource_tracker, shared_memory
+
+
+def _sambung(nama: str) -> shared_memory.SharedMemory:
+    '''
+    Menyambung kepada blok memori kongsi yang sedia ada tanpa mendaftarkannya dengan
+    resource_tracker, supaya hanya pemiliknya (PanelKongsi) yang membuang blok itu.
+    '''
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nama, track=False)
+
+    blok: shared_memory.SharedMemory = shared_memory.SharedMemory(name=nama)
+    resource_tracker.unregister(blok._name, "shared_memory")
+
+    return blok
+
+
+class PanelKongsi:
+    '''
+    Panel harga (atau sebarang DataFrame dengan lajur berangka, tarikh dan categorical)
+    dalam memori kongsi, supaya proses Pool boleh membacanya tanpa salinan atau pickle.
+
+    Setiap lajur disimpan dalam satu blok memori kongsi; lajur categorical disimpan
+    sebagai kod, dengan kategorinya dalam 'keterangan'. 'keterangan' ialah kamus kecil
+    yang boleh di-pickle, dan 'buka' membina semula DataFrame di atas blok yang sama
+    dalam proses lain.
+
+    Args:
+        data (pd.DataFrame): Panel, contohnya daripada 'pelombong.dapatkan_data_saham'.
+
+    Contoh:
+        with PanelKongsi(data) as panel, Pool(
+            initializer=mula_pekerja, initargs=(panel.keterangan,)
+        ) as p:
+            ...
+
+        # dalam mula_pekerja:
+        data = PanelKongsi.buka(keterangan)
+    '''
+# blok yang disambung oleh 'buka' dalam proses ini. Rujukan disimpan supaya blok tidak
+# ditutup selagi DataFrame di atasnya masih digunakan.
+    _blok_terbuka: list = []
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        self._semua_blok: list = []
+        self.keterangan: dict = {"bil_baris": len(data), "lajur": dict()}
+
+        for lajur in data.columns:
+            siri: pd.Series = data[lajur]
+            kategori: list = None
+
+            if isinstance(siri.dtype, pd.CategoricalDtype):
+                kategori = siri.cat.categories.tolist()
+                nilai: np.ndarray = siri.cat.codes.to_numpy()
+            else:
+                nilai = siri.to_numpy()
+
+            blok: shared_memory.SharedMemory = shared_memory.SharedMemory(
+                create=True, size=max(nilai.nbytes, 1)
+            )
+            np.ndarray(nilai.shape, dtype=nilai.dtype, buffer=blok.buf)[:] = nilai
+            self._semua_blok.append(blok)
+
+            self.keterangan["lajur"][lajur] = {
+                "blok": blok.name, "dtype": nilai.dtype.str, "kategori": kategori
+            }
+
+    @staticmethod
+    def buka(keterangan: dict) -> pd.DataFrame:
+        '''
+        Membina DataFrame (baca sahaja) di atas blok memori kongsi 'keterangan' tanpa
+        menyalin nilai. Blok kekal disambung sehingga proses tamat.
+        '''
+        semua_lajur: dict = dict()
+
+        for lajur, butiran in keterangan["lajur"].items():
+            blok: shared_memory.SharedMemory = _sambung(butiran["blok"])
+            nilai: np.ndarray = np.ndarray(
+                (keterangan["bil_baris"],), dtype=np.dtype(butiran["dtype"]), buffer=blok.buf
+            )
+            nilai.flags.writeable = False
+            PanelKongsi._blok_terbuka.append(blok)
+
+            if butiran["kategori"] is not None:
+                semua_lajur[lajur] = pd.Categorical.from_codes(
+                    nilai, categories=butiran["kategori"]
+                )
+            else:
+                semua_lajur[lajur] = nilai
+
+        return pd.DataFrame(semua_lajur, copy=False)
+
+    def tutup(self) -> None:
+        '''
+        Menutup dan membuang semua blok memori kongsi.
+        '''
+        for blok in self._semua_blok:
+            blok.close()
+            blok.unlink()
+
+        self._semua_blok = []
+
+    def __enter__(self) -> "PanelKongsi":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.tutup()
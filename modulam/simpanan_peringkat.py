@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import time
+
+
+def kunci_input(*bahagian) -> str:
+    '''
+    Mengembalikan kunci (hash SHA-256) bagi input dan parameter sesuatu peringkat.
+
+    Setiap bahagian mesti boleh ditukar kepada JSON (nilai yang tidak boleh ditukar
+    diwakili oleh str). Kamus disusun mengikut kunci, jadi urutan kunci tidak
+    mengubah hasil.
+
+    Contoh:
+        kunci_input(hash_fail("simpanan/asas.parquet"), {"tahun_ini": 2025, "min_inlier": 7})
+    '''
+    teks: str = json.dumps(bahagian, sort_keys=True, default=str, ensure_ascii=False)
+
+    return hashlib.sha256(teks.encode("utf-8")).hexdigest()
+
+
+def hash_fail(alamat: str, saiz_ketul: int = 1 << 20) -> str:
+    '''
+    Mengembalikan hash SHA-256 kandungan file, dibaca secara berketul.
+    '''
+    h = hashlib.sha256()
+
+    with open(alamat, mode="rb") as f:
+        while ketul := f.read(saiz_ketul):
+            h.update(ketul)
+
+    return h.hexdigest()
+
+
+class SimpananPeringkat:
+    '''
+    Simpanan output peringkat-peringkat saluran paip, dikenal pasti oleh kunci input.
+
+    Setiap peringkat mempunyai satu rekod JSON '<folder>/<peringkat>.json' yang
+    mengandungi kunci input larian terakhir, masa larian dan output peringkat (kamus
+    yang boleh ditukar kepada JSON). Jika output mengandungi senarai 'fail', rekod
+    hanya sah jika semua file tersebut masih wujud.
+
+    Args:
+        folder (str): Folder rekod dan output peringkat.
+
+    Contoh:
+        simpanan = SimpananPeringkat()
+        kunci = kunci_input(tahun_ini, min_inlier)
+        output = simpanan.dapatkan("saring", kunci)
+
+        if output is None:
+            output = {"saham_bagus": ...}
+            simpanan.simpan("saring", kunci, output)
+    '''
+    def __init__(self, folder: str = "simpanan/peringkat") -> None:
+        self.folder: str = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def _alamat(self, peringkat: str) -> str:
+        return os.path.join(self.folder, f'{peringkat}.json')
+
+    def folder_output(self, peringkat: str) -> str:
+        '''
+        Mengembalikan (dan mencipta) folder untuk file output sesuatu peringkat.
+        '''
+        folder: str = os.path.join(self.folder, peringkat)
+        os.makedirs(folder, exist_ok=True)
+
+        return folder
+
+    def rekod(self, peringkat: str) -> dict:
+        '''
+        Mengembalikan rekod terakhir peringkat, atau None jika tiada atau rosak.
+        '''
+        try:
+            with open(self._alamat(peringkat), mode="r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def dapatkan(self, peringkat: str, kunci: str, umur_maks: float = None) -> dict:
+        '''
+        Mengembalikan output peringkat jika kunci input sama dengan larian terakhir
+        (dan semua file outputnya masih wujud), atau None jika peringkat perlu dijalankan
+        semula.
+
+        Args:
+            peringkat (str): Nama peringkat.
+            kunci (str): Kunci input daripada 'kunci_input'.
+            umur_maks (float): Jika diberi, output yang lebih tua daripada umur_maks
+            (dalam saat) tidak digunakan.
+        '''
+        rekod: dict = self.rekod(peringkat)
+
+        if rekod is None or rekod.get("kunci") != kunci:
+            return None
+
+        if umur_maks is not None and time.time() - rekod.get("masa", 0) > umur_maks:
+            return None
+
+        output: dict = rekod.get("output", dict())
+
+        if not all(os.path.exists(f) for f in output.get("fail", [])):
+            return None
+
+        return output
+
+    def batal(self, peringkat: str) -> None:
+        '''
+        Membuang rekod peringkat supaya ia dijalankan semula pada larian seterusnya.
+        '''
+        if os.path.exists(self._alamat(peringkat)):
+            os.remove(self._alamat(peringkat))
+
+    def simpan(self, peringkat: str, kunci: str, output: dict) -> None:
+        '''
+        Menyimpan output peringkat dengan kunci inputnya. Rekod ditulis ke file
+        sementara dan kemudian diganti secara atomik.
+        '''
+        alamat: str = self._alamat(peringkat)
+        alamat_sementara: str = f'{alamat}.tmp'
+
+        with open(alamat_sementara, mode="w", encoding="utf-8") as f:
+            json.dump(
+                {"kunci": kunci, "masa": time.time(), "output": output},
+                f,
+                ensure_ascii=False,
+                default=str,
+            )
+
+        os.replace(alamat_sementara, alamat)
@@ -0,0 +1,193 @@
+import arviz as az
+import hashlib
+import json
+import os
+import pandas as pd
+import shutil
+
+
+from analisis_stat.penskalaan import PenskalaKumpulan
+from modulam.simpanan_peringkat import kunci_input
+
+
+# file dalam folder setiap posterior.
+FAIL_DATA: str = "data.parquet"
+FAIL_IDATA: str = "idata.nc"
+FAIL_PENSKALA: str = "penskala.json"
+FAIL_SPESIFIKASI: str = "spesifikasi.json"
+
+# subfolder bagi hiperparameter global ('menilai_saham.anggar_hiperparameter').
+FOLDER_HIPERPARAMETER: str = "hiperparameter"
+
+
+def hash_data(data: pd.DataFrame) -> str:
+    '''
+    Mengembalikan hash SHA-256 kandungan DataFrame (nama lajur dan nilai setiap baris,
+    tanpa indeks).
+    '''
+    h = hashlib.sha256(json.dumps([*map(str, data.columns)]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+
+    return h.hexdigest()
+
+
+class SimpananPosterior:
+    '''
+    Simpanan posterior model yang telah dilatih, dikenal pasti oleh hash data model,
+    formula dan tetapan pensampel.
+
+    Setiap posterior disimpan dalam '<folder>/<kunci>/' dengan file data model
+    (Parquet), idata (NetCDF), parameter penskala (JSON) dan spesifikasi model (JSON).
+    Dengan posterior yang tersimpan, ramalan bagi tahun atau bulan lain hanya perlu
+    membina semula model (tanpa melatih) dan terus meringkas serta meramal.
+
+    Args:
+        folder (str): Folder simpanan posterior.
+
+    Contoh:
+        simpanan = SimpananPosterior()
+        kunci = simpanan.kunci(data, {"formula": FORMULA, "draw_tune": 4000})
+        tersimpan = simpanan.muat(kunci)
+
+        if tersimpan is None:
+            model, idata = latih_model(data, 4000, .95)
+            simpanan.simpan(kunci, data, idata, penskala, spesifikasi)
+    '''
+    def __init__(self, folder: str = "simpanan/posterior") -> None:
+        self.folder: str = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def kunci(self, data: pd.DataFrame, spesifikasi: dict) -> str:
+        '''
+        Mengembalikan kunci posterior bagi data model dan spesifikasi (formula dan
+        tetapan pensampel) yang diberi.
+        '''
+        return kunci_input(hash_data(data), spesifikasi)
+
+    def folder_kunci(self, kunci: str) -> str:
+        '''
+        Mengembalikan folder posterior bagi kunci.
+        '''
+        return os.path.join(self.folder, kunci)
+
+    def cari_terkini(self, syarat: dict, kecuali: str = None, sah_sahaja: bool = False) -> str:
+        '''
+        Mengembalikan kunci posterior terkini (mengikut masa simpan) yang spesifikasinya
+        sepadan dengan semua nilai dalam syarat, atau None jika tiada.
+
+        Args:
+            syarat (dict): Nilai spesifikasi yang mesti sama, contohnya formula.
+            kecuali (str): Kunci yang tidak diambil kira.
+            sah_sahaja (bool): Jika True, posterior tanpa diagnostik (contohnya
+            anggaran posterior) atau yang diagnostiknya menandakan 'perlu_latih_penuh'
+            tidak diambil kira.
+        '''
+        semua_kunci: list = sorted(
+            (
+                k for k in os.listdir(self.folder)
+                if not k.endswith(".tmp") and k not in [kecuali, FOLDER_HIPERPARAMETER]
+            ),
+            key=lambda k: os.path.getmtime(self.folder_kunci(k)),
+            reverse=True,
+        )
+
+        for kunci in semua_kunci:
+            try:
+                with open(
+                    os.path.join(self.folder_kunci(kunci), FAIL_SPESIFIKASI),
+                    mode="r",
+                    encoding="utf-8",
+                ) as f:
+                    spesifikasi: dict = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+
+            diagnostik: dict = spesifikasi.get("diagnostik")
+
+            if sah_sahaja and (not diagnostik or diagnostik.get("perlu_latih_penuh")):
+                continue
+
+            if all(spesifikasi.get(k) == v for k, v in syarat.items()):
+                return kunci
+
+        return None
+
+    def muat(self, kunci: str) -> dict:
+        '''
+        Memuat posterior yang tersimpan.
+
+        Returns:
+            dict: Kamus dengan kunci 'data', 'idata', 'penskala' dan 'spesifikasi', atau
+            None jika tiada posterior bagi kunci atau filenya tidak lengkap.
+        '''
+        folder: str = self.folder_kunci(kunci)
+        semua_fail: list = [FAIL_DATA, FAIL_IDATA, FAIL_PENSKALA, FAIL_SPESIFIKASI]
+
+        if not all(os.path.exists(os.path.join(folder, f)) for f in semua_fail):
+            return None
+
+        with open(os.path.join(folder, FAIL_SPESIFIKASI), mode="r", encoding="utf-8") as f:
+            spesifikasi: dict = json.load(f)
+
+        return {
+            "data": pd.read_parquet(os.path.join(folder, FAIL_DATA)),
+            "idata": az.from_netcdf(os.path.join(folder, FAIL_IDATA)),
+            "penskala": PenskalaKumpulan.muat(os.path.join(folder, FAIL_PENSKALA)),
+            "spesifikasi": spesifikasi,
+        }
+
+    def simpan(
+            self,
+            kunci: str,
+            data: pd.DataFrame,
+            idata: az.InferenceData,
+            penskala: PenskalaKumpulan,
+            spesifikasi: dict,
+        ) -> str:
+        '''
+        Menyimpan posterior dan mengembalikan foldernya. File ditulis ke folder
+        sementara yang kemudian menggantikan folder kunci, jadi posterior yang separuh
+        ditulis tidak akan dimuat.
+        '''
+        folder: str = self.folder_kunci(kunci)
+        folder_sementara: str = f'{folder}.tmp'
+        shutil.rmtree(folder_sementara, ignore_errors=True)
+        os.makedirs(folder_sementara)
+
+        data.to_parquet(os.path.join(folder_sementara, FAIL_DATA), index=False)
+        idata.to_netcdf(os.path.join(folder_sementara, FAIL_IDATA))
+        penskala.simpan(os.path.join(folder_sementara, FAIL_PENSKALA))
+
+        with open(os.path.join(folder_sementara, FAIL_SPESIFIKASI), mode="w", encoding="utf-8") as f:
+            json.dump(spesifikasi, f, ensure_ascii=False, default=str)
+
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(folder_sementara, folder)
+
+        return folder
+
+    def _fail_hiperparameter(self, kunci: str) -> str:
+        return os.path.join(self.folder, FOLDER_HIPERPARAMETER, f'{kunci}.json')
+
+    def muat_hiperparameter(self, kunci: str) -> dict:
+        '''
+        Memuat hiperparameter global yang tersimpan, atau None jika tiada bagi kunci.
+        '''
+        try:
+            with open(self._fail_hiperparameter(kunci), mode="r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def simpan_hiperparameter(self, kunci: str, hiperparameter: dict) -> None:
+        '''
+        Menyimpan hiperparameter global bagi kunci. File ditulis ke file sementara yang
+        kemudian menggantikan file kunci.
+        '''
+        fail: str = self._fail_hiperparameter(kunci)
+        os.makedirs(os.path.dirname(fail), exist_ok=True)
+
+        with open(f'{fail}.tmp', mode="w", encoding="utf-8") as f:
+            json.dump(hiperparameter, f)
+
+        os.replace(f'{fail}.tmp', fail)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def kod_daripada_url(url: str) -> str:
+    '''
+    Mengekstrak nombor stok daripada URL laman saham.
+
+    Contoh:
+        kod_daripada_url("https://www.klsescreener.com/v2/stocks/view/1234/ABC")
+        akan mengembalikan "1234".
+    '''
+    return url.split("view/")[1].split("/")[0]
+
+
+def hash_kandungan(kandungan: str) -> str:
+    '''
+    Mengembalikan hash SHA-256 (heksadesimal) bagi kandungan laman.
+    '''
+    return hashlib.sha256(kandungan.encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    '''
+    Manifest rayapan yang merekodkan URL, masa ambil, status HTTP dan hash kandungan
+    bagi setiap kod saham.
+
+    Setiap rekod ditambah sebagai satu baris JSON sebaik sahaja sesuatu laman selesai
+    disimpan. Oleh itu larian yang terhenti atau dibunuh boleh disambung semula: laman
+    yang sudah direkodkan dan masih segar akan dilangkau. Jika kod yang sama direkodkan
+    lebih daripada sekali, rekod yang terakhir digunakan.
+
+    Args:
+        fail_manifest (str): Alamat file manifest (JSON Lines).
+
+    Contoh:
+        manifest = Manifest("laman_saham/manifest.jsonl")
+        url_perlu = [u for u in semua_url if manifest.perlu_diambil(u, umur_maks=7)]
+
+    Catatan:
+        - Baris terakhir yang tidak lengkap (contohnya akibat larian dibunuh semasa
+        menulis) diabaikan semasa memuatkan manifest.
+        - Kaedah 'catat' selamat dipanggil daripada beberapa benang.
+    '''
+
+    def __init__(self, fail_manifest: str = "laman_saham/manifest.jsonl") -> None:
+        self.fail_manifest: str = fail_manifest
+        self.rekod: dict = dict()
+        self._kunci: threading.Lock = threading.Lock()
+
+        if os.path.exists(fail_manifest):
+            with open(fail_manifest, "r", encoding="utf-8") as m:
+                kandungan: str = m.read()
+
+            for baris in kandungan.splitlines():
+                try:
+                    r: dict = json.loads(baris)
+                except json.JSONDecodeError:
+                    continue
+
+                self.rekod[r["kod"]] = r
+
+# buang baris terakhir yang tidak lengkap supaya rekod baharu tidak tercantum padanya.
+            if kandungan and not kandungan.endswith("\n"):
+                self.padatkan()
+
+    def catat(self, url: str, status: int, hash: str = None) -> None:
+        '''
+        Merekodkan hasil muat turun satu laman dan menambahnya ke dalam file manifest.
+
+        Args:
+            url (str): URL laman saham.
+            status (int): Status HTTP respons (0 jika tiada respons).
+            hash (str): Hash kandungan laman yang disimpan, atau None jika gagal.
+        '''
+        r: dict = {
+            "kod": kod_daripada_url(url),
+            "url": url,
+            "masa_ambil": time.time(),
+            "status": status,
+            "hash": hash,
+        }
+
+        with self._kunci:
+            self.rekod[r["kod"]] = r
+
+            folder: str = os.path.dirname(self.fail_manifest)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+
+            with open(self.fail_manifest, "a", encoding="utf-8") as m:
+                m.write(json.dumps(r) + "\n")
+                m.flush()
+
+    def perlu_diambil(self, url: str, umur_maks: float, folder: str = "laman_saham") -> bool:
+        '''
+        Menentukan sama ada sesuatu URL perlu dimuat turun semula.
+
+        Args:
+            url (str): URL laman saham.
+            umur_maks (float): Umur maksimum laman dalam hari sebelum ia dimuat turun
+            semula.
+            folder (str): Folder tempat laman disimpan.
+
+        Returns:
+            bool: True jika laman tiada dalam manifest, gagal sebelum ini, file laman
+            sudah hilang, atau umurnya melebihi 'umur_maks'.
+        '''
+        kod: str = kod_daripada_url(url)
+        r: dict = self.rekod.get(kod)
+
+        if r is None or r["hash"] is None or not (200 <= r["status"] < 400):
+            return True
+
+        if not os.path.exists(os.path.join(folder, f'{kod}.htm')):
+            return True
+
+        umur: float = (time.time() - r["masa_ambil"]) / 86400
+
+        return umur > umur_maks
+
+    def padatkan(self) -> None:
+        '''
+        Menulis semula file manifest dengan hanya satu rekod (yang terakhir) bagi setiap
+        kod saham.
+        '''
+        with self._kunci:
+            fail_sementara: str = f'{self.fail_manifest}.tmp'
+
+            with open(fail_sementara, "w", encoding="utf-8") as m:
+                for r in self.rekod.values():
+                    m.write(json.dumps(r) + "\n")
+
+            os.replace(fail_sementara, self.fail_manifest)
@@ -1,12 +1,29 @@
+import lxml.html
+import numpy as np
 import pandas as pd
-import yfinance as yf
+import re
 
 
 from bs4 import BeautifulSoup
-from glob import glob
 from playwright.sync_api import sync_playwright
 
 
+from pelombongan.pembekal_harga import PembekalYahoo, SimpananHarga
+
+
+# XPath untuk elemen-elemen yang dibaca daripada laman saham. Seperti 'sup.find', hanya
+# jadual financial_reports yang pertama dibaca.
+XPATH_TAJUK: str = "//title"
+XPATH_HARGA: str = "//*[@id='price']"
+XPATH_BARIS_LAPORAN: str = (
+    "(//table[contains(concat(' ', normalize-space(@class), ' '), ' financial_reports ')])[1]"
+    "/tbody/tr"
+)
+
+# nombor yang sah selepas koma dan kurungan dibuang: 12, -0.5, .25, +3.
+NOMBOR_SAH: re.Pattern = re.compile(r"[+-]?(\d+(\.\d*)?|\.\d+)")
+
+
 def dapatkan_semua_url(laman_screener: str) -> set:
     '''
     Mendapatkan semua URL yang sepadan daripada file laman_screener.html .
@@ -48,38 +65,34 @@ def dapatkan_semua_url(laman_screener: str) -> set:
     return semua_url_yang_unik
 
 
-def simpan_laman(url) -> None:
+def simpan_laman(url: str, folder: str = "laman_saham") -> str:
     '''
     Menyimpan sumber halaman web dari URL yang diberikan ke dalam file HTML menggunakan
     Playwright.
 
     Fungsi ini mengambil URL, memuatkannya menggunakan Playwright, dan menyimpan sumber
     halaman yang dimuatkan ke dalam file HTML dengan nama yang berdasarkan nombor stok
-    yang diekstrak dari URL. Fungsi ini juga mencetak kemajuan penyimpanan ke konsol.
+    yang diekstrak dari URL.
 
     Args:
         url (str): URL halaman web yang akan disimpan.
+        folder (str): Folder untuk menyimpan laman.
 
     Returns:
-        None: Fungsi ini tidak mengembalikan nilai.
+        str: Alamat file HTML yang disimpan.
 
     Contoh:
         Jika url = "https://www.klsescreener.com/v2/stocks/view/1234/ABC",
         maka file yang disimpan akan bernama "1234.htm" di dalam folder "laman_saham".
 
     Catatan:
-        - Fungsi ini menggunakan Playwright untuk memuat dan menyimpan halaman web.
-        - Fungsi ini memanggil fungsi 'dapatkan_semua_url' untuk mendapatkan daftar semua URL.
-        - Fungsi ini mencetak kemajuan penyimpanan ke konsol dalam bentuk peratusan.
+        - Fungsi ini melancarkan dan menutup satu pelayar Chromium untuk setiap panggilan.
+        Untuk memuat turun banyak laman, gunakan kelas 'Perayap' dalam modul 'perayap'
+        yang menggunakan semula pelayar yang sama.
     '''
-
-    semua_url: set = dapatkan_semua_url("screener_htm/Screener.html")
-    
-    jumlah_url: int = len(semua_url)
-
     nombor_stok: str = url.split("view/")[1].split("/")[0]
 
-    nama_file_laman: str = f'laman_saham/{nombor_stok}.htm'
+    nama_file_laman: str = f'{folder}/{nombor_stok}.htm'
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
@@ -91,11 +104,8 @@ def simpan_laman(url) -> None:
             halaman.write(page_source)
         
         browser.close()
-    
-    bil_laman: int = len(glob("laman_saham/*.htm"))
-    peratus_siap: float = bil_laman / jumlah_url
 
-    print(f'   {bil_laman} / {jumlah_url} = {peratus_siap:.2%}', end="\r")
+    return nama_file_laman
 
 
 def dapatkan_nama_saham(sup: BeautifulSoup) -> tuple:
@@ -117,7 +127,15 @@ def dapatkan_nama_saham(sup: BeautifulSoup) -> tuple:
         ("ABC Berhad", "1234").
     '''
     _tajuk: str = sup.find("title")
-    _tajuk = _tajuk.text.strip()
+
+    return _pisah_tajuk(_tajuk.text)
+
+
+def _pisah_tajuk(tajuk: str) -> tuple:
+    '''
+    Memisahkan tajuk laman "Nama Saham: (Kod Saham)" kepada nama dan kod saham.
+    '''
+    _tajuk: str = tajuk.strip()
     nama: str = _tajuk.split(":")[0]
     _kod: str = _tajuk.split("(")[-1]
     kod: str = _kod.split(")")[0]
@@ -148,7 +166,81 @@ def dapatkan_harga(sup: BeautifulSoup) -> float:
     return harga
 
 
-def dapatkan_data_eps_dps(sup: BeautifulSoup) -> list:
+def tukar_nombor(teks: str) -> float:
+    '''
+    Menukar teks nombor daripada jadual laporan kewangan kepada float secara ketat.
+
+    Fungsi ini menggantikan eval() yang perlahan dan tidak selamat untuk teks yang
+    dilombong. Ia mengendalikan format nombor laman saham: pemisah ribu (koma), sengkang
+    bagi nilai kosong, nombor negatif dengan tanda tolak atau dalam kurungan, dan tanda
+    tolak unikod.
+
+    Args:
+        teks (str): Teks sel jadual.
+
+    Returns:
+        float: Nilai nombor. Sel kosong atau sengkang ("-", "--") dianggap 0.0.
+
+    Raises:
+        ValueError: Jika teks bukan nombor yang sah.
+
+    Contoh:
+        tukar_nombor("1,234.50") mengembalikan 1234.5
+        tukar_nombor("-0.25") mengembalikan -0.25
+        tukar_nombor("(0.25)") mengembalikan -0.25
+        tukar_nombor("-") mengembalikan 0.0
+    '''
+    _teks: str = teks.strip().replace(",", "").replace("\u2212", "-")
+
+    if _teks in ("", "-", "--", "\u2013", "\u2014"):
+        return 0.
+
+    if _teks.startswith("(") and _teks.endswith(")"):
+        _teks = f'-{_teks[1:-1]}'
+
+    if not NOMBOR_SAH.fullmatch(_teks):
+        raise ValueError(f'Bukan nombor yang sah: {teks!r}')
+
+    return float(_teks)
+
+
+def jumlah_mengikut_fy(fy: np.ndarray, eps: np.ndarray, dps: np.ndarray) -> pd.DataFrame:
+    '''
+    Menjumlahkan EPS dan DPS suku tahunan bagi setiap FY dengan satu penurunan kumpulan.
+
+    Args:
+        fy (np.ndarray): Tahun kewangan bagi setiap baris (int).
+        eps (np.ndarray): EPS bagi setiap baris (float).
+        dps (np.ndarray): DPS bagi setiap baris (float).
+
+    Returns:
+        pd.DataFrame: DataFrame dengan lajur 'fy', 'eps' dan 'dps', disusun mengikut fy.
+
+    Catatan:
+        - Penjumlahan kumpulan pandas (Cython, dengan penjumlahan Kahan) digunakan
+        supaya hasilnya sama hingga ke bit terakhir dengan pelaksanaan asal.
+    '''
+    df_data: pd.DataFrame = pd.DataFrame({"fy": fy, "eps": eps, "dps": dps})
+
+    return df_data.groupby("fy", as_index=False, sort=True).sum()
+
+
+def _jadual_ke_df(semua_lajur: list) -> pd.DataFrame:
+    '''
+    Menukar teks baris-baris jadual laporan kewangan kepada DataFrame fy/eps/dps.
+
+    Args:
+        semua_lajur (list): Senarai baris, setiap baris adalah senarai teks sel.
+    '''
+    n: int = len(semua_lajur)
+    fy: np.ndarray = np.fromiter((int(l[7].strip()[-4:]) for l in semua_lajur), np.int64, n)
+    eps: np.ndarray = np.fromiter((tukar_nombor(l[0]) for l in semua_lajur), np.float64, n)
+    dps: np.ndarray = np.fromiter((tukar_nombor(l[1]) for l in semua_lajur), np.float64, n)
+
+    return jumlah_mengikut_fy(fy, eps, dps)
+
+
+def dapatkan_data_eps_dps(sup: BeautifulSoup) -> pd.DataFrame:
     '''
     Mengekstrak data EPS dan DPS dari objek BeautifulSoup dan mengembalikan DataFrame Pandas.
 
@@ -172,62 +264,161 @@ def dapatkan_data_eps_dps(sup: BeautifulSoup) -> list:
         - EPS diekstrak dari lajur pertama (indeks 0), dan ditukar kepada float.
         - DPS diekstrak dari lajur ke-2 (indeks 1), dan ditukar kepada float.
         - Data dikumpulkan berdasarkan fy, dan EPS dan DPS dijumlahkan untuk setiap tahun.
-        - Fungsi ini mengubah data dalam jadual dengan float menggunakan fungsi eval().
+        - Teks ditukar kepada nombor dengan 'tukar_nombor' ke dalam tatasusunan NumPy,
+        dan jumlah setiap FY dikira dengan 'jumlah_mengikut_fy'.
     '''
-
-    df_data: pd.DataFrame = pd.DataFrame(columns=["fy", "eps", "dps"])
-
     _jadual = sup.find("table", attrs={
         "class": "financial_reports table table-hover table-sm table-theme"
     })
 
+    semua_lajur: list = []
+
     for baris in _jadual.tbody.find_all("tr"):
-        lajur= baris.find_all("td")
+        lajur = baris.find_all("td")
 
         if len(lajur) > 1:
-            f = eval(lajur[7].text.strip()[-4:])
-            e = eval(lajur[0].text.strip())
-            d = eval(lajur[1].text.strip())
+            semua_lajur.append([l.text for l in lajur])
 
-            df_data.loc[len(df_data)] = (f, e, d)
-    
-    data = df_data.groupby(["fy"], as_index=False).sum()
-    
-    return data
+    return _jadual_ke_df(semua_lajur)
 
 
-def dapatkan_data_saham(ticker: dict) -> pd.DataFrame:
+def ekstrak_laman(kandungan: str) -> tuple:
     '''
-    Mengambil data saham dari Yahoo Finance dan mengembalikan DataFrame Pandas.
+    Mengekstrak nama, kod, harga dan data EPS/DPS daripada kandungan laman saham dalam
+    satu laluan.
+
+    Fungsi ini menghurai kandungan HTML dengan lxml (parser C) dan hanya membaca
+    elemen yang diperlukan menggunakan XPath: <title>, elemen dengan ID "price", dan
+    baris-baris jadual financial_reports. Ia menggantikan gabungan BeautifulSoup
+    "html.parser" dengan 'dapatkan_nama_saham', 'dapatkan_harga' dan
+    'dapatkan_data_eps_dps', yang masing-masing mencari seluruh pokok dokumen.
+
+    Args:
+        kandungan (str): Kandungan HTML laman saham.
+
+    Returns:
+        tuple: Tuple yang mengandungi nama saham (str), kod saham (str), harga saham
+        (float, atau NaN jika tiada atau tidak sah) dan DataFrame EPS/DPS dengan lajur 'fy', 'eps' dan
+        'dps' seperti yang dikembalikan oleh 'dapatkan_data_eps_dps'.
+
+    Contoh:
+        Jika tajuk laman ialah "ABC Berhad: (1234)" dan harga ialah "12.34", maka
+        fungsi ini akan mengembalikan ("ABC Berhad", "1234", 12.34, df).
+    '''
+    dokumen = lxml.html.document_fromstring(kandungan)
+
+    _tajuk: list = dokumen.xpath(XPATH_TAJUK)
+    nama, kod = _pisah_tajuk(_tajuk[0].text_content() if _tajuk else "")
+
+    _harga: list = dokumen.xpath(XPATH_HARGA)
+
+    try:
+        harga: float = float(_harga[0].text_content().strip())
+    except (IndexError, ValueError):
+        harga = float("nan")
+
+    semua_lajur: list = []
+
+    for baris in dokumen.xpath(XPATH_BARIS_LAPORAN):
+        lajur: list = baris.xpath("./td")
+
+        if len(lajur) > 1:
+            semua_lajur.append([l.text_content() for l in lajur])
+
+    return nama, kod, harga, _jadual_ke_df(semua_lajur)
+
+
+def dapatkan_data_saham(
+        ticker: dict,
+        pembekal=None,
+        saiz_ketul: int = 100,
+        jenis_harga: str = "float64",
+        tempoh_tahun: int = 3,
+    ) -> pd.DataFrame:
+    '''
+    Mengambil data saham dan mengembalikan DataFrame Pandas dalam format padat.
 
     Fungsi ini mengambil kamus ticker (nama saham) sebagai input, mengambil data
-    saham dari Yahoo Finance selama 3 tahun terakhir, dan mengembalikan data
-    tersebut dalam bentuk DataFrame Pandas.
+    saham selama 'tempoh_tahun' tahun terakhir, dan mengembalikan data tersebut dalam bentuk
+    DataFrame Pandas. Secara lalai, data diambil dari Yahoo Finance melalui simpanan
+    harga tempatan, jadi hanya hari yang belum disimpan dimuat turun.
+
+    Ticker diambil dalam ketul 'saiz_ketul' ticker, dan setiap ketul dipadatkan
+    sebelum ketul seterusnya diambil, supaya memori puncak kekal terhad walaupun bagi
+    ratusan ticker.
 
     Args:
         ticker (dict): Kamus di mana kunci adalah ticker saham (str) dan
         nilai adalah nama saham (str).
+        pembekal: Objek dengan kaedah 'ambil(semua_ticker, tempoh_tahun)', contohnya
+        'SimpananHarga(PembekalFail("harga.parquet"))' untuk larian tanpa internet.
+        Jika None, 'SimpananHarga(PembekalYahoo())' digunakan.
+        saiz_ketul (int): Bilangan ticker bagi setiap ketul.
+        jenis_harga (str): Jenis data lajur Close, 'float64' atau 'float32'.
+        tempoh_tahun (int): Bilangan tahun terakhir yang diambil, contohnya lebih
+        daripada 3 bagi ujian balik ('ujian_balik.py').
 
     Returns:
         pd.DataFrame: DataFrame Pandas yang berisi data saham dengan lajur:
             - Date (datetime): Tarikh data saham.
-            - Ticker (str): Ticker saham.
-            - nama (str): Nama saham.
-            - tahun (int): Tahun data dari Date.
-            - bulan (int): Bulan data dari Date.
-            - Close (float): Harga tutup saham.
+            - Ticker (category): Ticker saham.
+            - nama (category): Nama saham.
+            - tahun (int16): Tahun data dari Date.
+            - bulan (int8): Bulan data dari Date.
+            - Close (float64 atau float32): Harga tutup saham.
 
     Catatan:
-        - Fungsi ini menggunakan modul `yfinance` untuk mengambil data saham.
-        - Data diambil untuk tempoh 3 tahun terakhir.
-        - Data di-stack dan di-reset index untuk merapikan format.
+        - Lihat 'pelombongan.pembekal_harga' bagi pembekal dan simpanan harga.
+        - Data diambil untuk tempoh 3 tahun terakhir secara lalai.
         - Lajur 'nama', 'tahun', dan 'bulan' ditambahkan untuk memudahkan analisis.
+        - Kategori Ticker dan nama hanya mengandungi saham yang mempunyai data.
+        - Jika kamus ticker kosong atau pembekal tiada data, panel kosong dengan lajur
+        dan jenis data yang sama dikembalikan.
     '''
-    data: pd.DataFrame = yf.Tickers([*ticker]).download(period="3y")
-    data = data.stack(future_stack=True).reset_index()
-    data["nama"] = data["Ticker"].map(ticker)
-    data["tahun"] = data["Date"].dt.year
-    data["bulan"] = data["Date"].dt.month
-    data = data[["Date", "Ticker", "nama", "tahun", "bulan", "Close"]]
+    pembekal = SimpananHarga(PembekalYahoo()) if pembekal is None else pembekal
+
+    semua_ticker: list = [*ticker]
+    jenis_ticker: pd.CategoricalDtype = pd.CategoricalDtype(semua_ticker)
+    jenis_nama: pd.CategoricalDtype = pd.CategoricalDtype(sorted(set(ticker.values())))
+    kod_nama: np.ndarray = jenis_nama.categories.get_indexer([ticker[t] for t in semua_ticker])
+
+# setiap lajur bermula dengan tatasusunan kosong berjenis betul, jadi tanpa ticker atau
+# tanpa baris daripada pembekal, hasilnya panel kosong dengan jenis data yang sama.
+    semua_ketul: dict = {
+        "Date": [np.empty(0, dtype="datetime64[ns]")],
+        "Ticker": [np.empty(0, dtype=np.int8)],
+        "tahun": [np.empty(0, dtype=np.int16)],
+        "bulan": [np.empty(0, dtype=np.int8)],
+        "Close": [np.empty(0, dtype=jenis_harga)],
+    }
+
+    for i in range(0, len(semua_ticker), saiz_ketul):
+        ketul: pd.DataFrame = pembekal.ambil(semua_ticker[i:i + saiz_ketul], tempoh_tahun=tempoh_tahun)
+        tarikh: pd.DatetimeIndex = pd.DatetimeIndex(ketul["Date"])
+
+        semua_ketul["Date"].append(tarikh.values)
+        semua_ketul["Ticker"].append(
+            pd.Categorical(ketul["Ticker"], dtype=jenis_ticker).codes
+        )
+        semua_ketul["tahun"].append(tarikh.year.values.astype(np.int16))
+        semua_ketul["bulan"].append(tarikh.month.values.astype(np.int8))
+        semua_ketul["Close"].append(ketul["Close"].to_numpy(dtype=jenis_harga))
+
+        del ketul, tarikh
+
+# gabungkan setiap lajur secara berasingan supaya hanya satu lajur disalin pada satu masa.
+    lajur: dict = {nama: np.concatenate(semua_ketul.pop(nama)) for nama in [*semua_ketul]}
+    kod_ticker: np.ndarray = lajur["Ticker"]
+
+    data: pd.DataFrame = pd.DataFrame({
+        "Date": lajur["Date"],
+        "Ticker": pd.Categorical.from_codes(kod_ticker, dtype=jenis_ticker),
+        "nama": pd.Categorical.from_codes(kod_nama[kod_ticker], dtype=jenis_nama),
+        "tahun": lajur["tahun"],
+        "bulan": lajur["bulan"],
+        "Close": lajur["Close"],
+    }, copy=False)
+    data["Ticker"] = data["Ticker"].cat.remove_unused_categories()
+    data["nama"] = data["nama"].cat.remove_unused_categories()
 
-    return data
\ No newline at end of file
+    return data
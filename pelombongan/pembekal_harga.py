@@ -0,0 +1,270 @@
+import json
+import os
+import pandas as pd
+import time
+import yfinance as yf
+
+
+LAJUR_HARGA: list = ["Date", "Ticker", "Close"]
+
+# bilangan hari sebelum tarikh terakhir simpanan yang diambil semula untuk perbandingan.
+HARI_BERTINDIH: int = 7
+
+# file dalam folder simpanan harga yang merekodkan tarikh mula yang diminta bagi setiap
+# ticker.
+FAIL_MULA: str = "mula.json"
+
+
+class PembekalYahoo:
+    '''
+    Pembekal harga tutup harian daripada Yahoo Finance.
+
+    Contoh:
+        PembekalYahoo().ambil(["1155.KL", "5347.KL"], pd.Timestamp("2025-01-01"))
+    '''
+    def ambil(
+            self,
+            semua_ticker: list,
+            mula: pd.Timestamp,
+            tamat: pd.Timestamp = None,
+        ) -> pd.DataFrame:
+        '''
+        Mengambil harga tutup harian bagi semua ticker dari tarikh mula hingga tamat.
+
+        Args:
+            semua_ticker (list): Senarai ticker saham.
+            mula (pd.Timestamp): Tarikh pertama (termasuk).
+            tamat (pd.Timestamp): Tarikh terakhir (termasuk). Jika None, hingga hari ini.
+
+        Returns:
+            pd.DataFrame: DataFrame format panjang dengan lajur 'Date', 'Ticker' dan
+            'Close', tanpa baris yang harganya kosong.
+        '''
+        tamat = pd.Timestamp.today().normalize() if tamat is None else tamat
+
+# 'end' dalam yfinance tidak termasuk, jadi tambah satu hari.
+        data: pd.DataFrame = yf.Tickers(semua_ticker).download(
+            start=mula.strftime("%Y-%m-%d"),
+            end=(tamat + pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+        )
+
+        if data is None or data.empty:
+            return pd.DataFrame(columns=LAJUR_HARGA)
+
+        data = data.stack(future_stack=True).reset_index()
+
+        return data[LAJUR_HARGA].dropna(subset=["Close"])
+
+
+class PembekalFail:
+    '''
+    Pembekal harga daripada file CSV atau Parquet tempatan, sebagai pengganti Yahoo
+    Finance untuk larian tanpa internet dan ujian.
+
+    File mesti dalam format panjang dengan lajur 'Date', 'Ticker' dan 'Close'.
+
+    Args:
+        fail (str): Alamat file .csv atau .parquet.
+
+    Contoh:
+        dapatkan_data_saham(ticker, PembekalFail("harga.parquet"))
+    '''
+    def __init__(self, fail: str) -> None:
+        self.fail: str = fail
+        self._data: pd.DataFrame = None
+
+    def _baca(self) -> pd.DataFrame:
+        if self._data is None:
+            if self.fail.endswith(".parquet"):
+                data: pd.DataFrame = pd.read_parquet(self.fail, columns=LAJUR_HARGA)
+            else:
+                data = pd.read_csv(self.fail, usecols=LAJUR_HARGA, parse_dates=["Date"])
+
+            self._data = data.dropna(subset=["Close"])
+
+        return self._data
+
+    def ambil(
+            self,
+            semua_ticker: list,
+            mula: pd.Timestamp,
+            tamat: pd.Timestamp = None,
+        ) -> pd.DataFrame:
+        '''
+        Seperti 'PembekalYahoo.ambil', tetapi membaca daripada file.
+        '''
+        data: pd.DataFrame = self._baca()
+        pilihan: pd.Series = data["Ticker"].isin(semua_ticker) & (data["Date"] >= mula)
+
+        if tamat is not None:
+            pilihan &= data["Date"] <= tamat
+
+        return data[pilihan].reset_index(drop=True)
+
+
+class SimpananHarga:
+    '''
+    Simpanan harga harian bagi setiap ticker dalam file Parquet, di hadapan sesuatu
+    pembekal harga.
+
+    Setiap ticker disimpan dalam '<folder>/<ticker>.parquet'. Hanya hari selepas
+    tarikh terakhir dalam simpanan, bersama HARI_BERTINDIH hari sebelumnya, diambil
+    daripada pembekal. Harga hari terakhir dalam simpanan digantikan kerana mungkin
+    belum muktamad. Jika harga hari bertindih yang lain berbeza daripada simpanan,
+    contohnya kerana harga terlaras berubah selepas dividen atau pecahan saham,
+    keseluruhan sejarah ticker tersebut diambil semula.
+    Tarikh mula yang diminta daripada pembekal direkodkan bagi setiap ticker dalam
+    FAIL_MULA, jadi ticker yang disenaraikan selepas tarikh tersebut tidak diambil
+    semula sepenuhnya pada setiap larian. Jika tempoh yang diminta bermula lebih awal
+    daripada rekod ini, keseluruhan sejarah diambil semula. Hanya selepas itu, simpanan
+    yang dikemas kini dalam tempoh 'umur_maks' tidak disemak dengan pembekal.
+
+    Args:
+        pembekal: Objek dengan kaedah 'ambil(semua_ticker, mula, tamat)', contohnya
+        PembekalYahoo atau PembekalFail.
+        folder (str): Folder simpanan.
+        umur_maks (float): Umur maksimum simpanan dalam saat sebelum disemak semula.
+
+    Contoh:
+        simpanan = SimpananHarga(PembekalYahoo())
+        data = simpanan.ambil(["1155.KL", "5347.KL"], tempoh_tahun=3)
+    '''
+    def __init__(
+            self,
+            pembekal,
+            folder: str = "simpanan/harga",
+            umur_maks: float = 6 * 3600,
+        ) -> None:
+        self.pembekal = pembekal
+        self.folder: str = folder
+        self.umur_maks: float = umur_maks
+        os.makedirs(folder, exist_ok=True)
+
+    def _alamat(self, ticker: str) -> str:
+        return os.path.join(self.folder, f'{ticker}.parquet')
+
+    def _baca(self, ticker: str) -> pd.DataFrame:
+        alamat: str = self._alamat(ticker)
+
+        if not os.path.exists(alamat):
+            return None
+
+        return pd.read_parquet(alamat)
+
+    def _baca_mula(self) -> dict:
+        try:
+            with open(os.path.join(self.folder, FAIL_MULA), mode="r", encoding="utf-8") as f:
+                return {ticker: pd.Timestamp(mula) for ticker, mula in json.load(f).items()}
+        except (OSError, json.JSONDecodeError):
+            return dict()
+
+    def _tulis_mula(self, semua_mula: dict) -> None:
+        alamat: str = os.path.join(self.folder, FAIL_MULA)
+
+        with open(f'{alamat}.tmp', mode="w", encoding="utf-8") as f:
+            json.dump({ticker: mula.isoformat() for ticker, mula in semua_mula.items()}, f)
+
+        os.replace(f'{alamat}.tmp', alamat)
+
+    def _tulis(self, ticker: str, data: pd.DataFrame) -> None:
+        alamat: str = self._alamat(ticker)
+        data.to_parquet(f'{alamat}.tmp', index=False)
+        os.replace(f'{alamat}.tmp', alamat)
+
+    def ambil(self, semua_ticker: list, tempoh_tahun: int = 3) -> pd.DataFrame:
+        '''
+        Mengembalikan harga tutup harian bagi semua ticker untuk 'tempoh_tahun' tahun
+        terakhir, dengan hanya mengambil hari yang tiada dalam simpanan.
+
+        Returns:
+            pd.DataFrame: DataFrame format panjang dengan lajur 'Date', 'Ticker' dan
+            'Close', disusun mengikut Ticker dan Date.
+        '''
+        hari_ini: pd.Timestamp = pd.Timestamp.today().normalize()
+        mula_tempoh: pd.Timestamp = hari_ini - pd.DateOffset(years=tempoh_tahun)
+
+        simpanan: dict = dict()
+        perlu_diambil: dict = dict()
+        semua_mula: dict = self._baca_mula()
+
+        for ticker in semua_ticker:
+            data: pd.DataFrame = self._baca(ticker)
+            simpanan[ticker] = data
+
+            if data is None or data.empty:
+                perlu_diambil.setdefault(mula_tempoh, []).append(ticker)
+                continue
+
+# simpanan tanpa rekod mula (versi lama) dianggap bermula pada bar pertamanya, dengan
+# toleransi seminggu bagi cuti umum.
+            mula_simpanan: pd.Timestamp = semua_mula.get(
+                ticker, data["Date"].min() - pd.Timedelta(days=7)
+            )
+
+# sejarah yang lebih pendek daripada tempoh yang diminta diambil semula walaupun
+# simpanan masih baharu.
+            if mula_simpanan > mula_tempoh:
+                perlu_diambil.setdefault(mula_tempoh, []).append(ticker)
+            elif time.time() - os.path.getmtime(self._alamat(ticker)) <= self.umur_maks:
+                continue
+            else:
+                mula: pd.Timestamp = data["Date"].max() - pd.Timedelta(days=HARI_BERTINDIH)
+                perlu_diambil.setdefault(mula, []).append(ticker)
+
+# ticker dengan tarikh mula yang sama diambil dalam satu panggilan.
+        for mula, kumpulan in perlu_diambil.items():
+            baharu: pd.DataFrame = self.pembekal.ambil(kumpulan, mula, hari_ini)
+            ambil_semula: list = []
+
+            for ticker, data_baharu in baharu.groupby("Ticker"):
+                lama: pd.DataFrame = simpanan[ticker]
+                data_baharu = data_baharu[LAJUR_HARGA]
+
+                if lama is not None and mula > mula_tempoh:
+# hari terakhir dalam simpanan mungkin belum muktamad, jadi tidak dibandingkan.
+                    bertindih: pd.DataFrame = lama[
+                        (lama["Date"] >= mula) & (lama["Date"] < lama["Date"].max())
+                    ].merge(data_baharu, on="Date")
+                    berubah: bool = (
+                        (bertindih["Close_x"] - bertindih["Close_y"]).abs()
+                        > 1e-6 * bertindih["Close_x"].abs()
+                    ).any()
+
+                    if berubah:
+                        ambil_semula.append(ticker)
+                        continue
+
+                    data_baharu = pd.concat([lama[lama["Date"] < mula], data_baharu])
+
+                data_baharu = data_baharu.drop_duplicates("Date", keep="last").sort_values("Date")
+                simpanan[ticker] = data_baharu.reset_index(drop=True)
+                self._tulis(ticker, simpanan[ticker])
+
+                if mula == mula_tempoh:
+                    semua_mula[ticker] = mula_tempoh
+
+# ticker tanpa hari baharu: tandakan simpanan sebagai telah disemak.
+            for ticker in set(kumpulan) - set(baharu["Ticker"]):
+                if simpanan[ticker] is not None:
+                    os.utime(self._alamat(ticker))
+
+            if ambil_semula:
+                semula: pd.DataFrame = self.pembekal.ambil(ambil_semula, mula_tempoh, hari_ini)
+
+                for ticker, data_baharu in semula.groupby("Ticker"):
+                    simpanan[ticker] = data_baharu[LAJUR_HARGA].sort_values("Date").reset_index(drop=True)
+                    self._tulis(ticker, simpanan[ticker])
+                    semua_mula[ticker] = mula_tempoh
+
+        if perlu_diambil:
+            self._tulis_mula(semua_mula)
+
+        semua_data: list = [
+            data[data["Date"] >= mula_tempoh] for data in simpanan.values()
+            if data is not None
+        ]
+
+        if not semua_data:
+            return pd.DataFrame(columns=LAJUR_HARGA)
+
+        return pd.concat(semua_data, ignore_index=True)
@@ -0,0 +1,489 @@
+import asyncio
+import json
+import os
+import threading
+
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+from urllib.parse import urlparse
+
+
+from pelombongan.manifest import Manifest, hash_kandungan, kod_daripada_url
+
+
+# jenis sumber yang tidak diperlukan untuk mengekstrak nama, harga dan jadual kewangan.
+JENIS_DISEKAT: set = {"image", "media", "font", "stylesheet", "imageset"}
+
+# domain iklan dan analitik yang disekat walaupun jenis sumbernya adalah skrip. Hos
+# disekat jika ia sama dengan domain ini atau subdomainnya.
+HOS_DISEKAT: tuple = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "facebook.com",
+    "facebook.net",
+)
+
+# hanya <title>, #price dan jadual financial_reports yang dibaca oleh 'pelombong'.
+JS_FRAGMEN: str = """() => {
+    const bahagian = [
+        document.querySelector("title"),
+        document.querySelector("#price"),
+        document.querySelector("table.financial_reports"),
+    ];
+    const [tajuk, harga, jadual] = bahagian.map(e => e ? e.outerHTML : "");
+    return "<!DOCTYPE html><html><head><meta charset='utf-8'>" + tajuk + "</head><body>"
+        + harga + jadual + "</body></html>";
+}"""
+
+
+def perlu_disekat(request) -> bool:
+    '''
+    Menentukan sama ada sesuatu permintaan rangkaian pelayar perlu disekat.
+
+    Args:
+        request: Objek permintaan Playwright.
+
+    Returns:
+        bool: True jika jenis sumber tidak diperlukan atau hos URL ialah domain iklan atau
+        analitik (atau subdomainnya). Laluan dan parameter URL tidak diambil kira.
+    '''
+    if request.resource_type in JENIS_DISEKAT:
+        return True
+
+    hos: str = (urlparse(request.url).hostname or "").rstrip(".")
+
+    return any(hos == d or hos.endswith(f'.{d}') for d in HOS_DISEKAT)
+
+
+def _sekat_sync(route) -> None:
+    if perlu_disekat(route.request):
+        route.abort()
+    else:
+        route.continue_()
+
+
+async def _sekat_async(route) -> None:
+    if perlu_disekat(route.request):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _nama_file_laman(url: str, folder: str) -> str:
+    '''
+    Mengembalikan alamat file HTML bagi URL berdasarkan nombor stok dalam URL.
+    '''
+    return os.path.join(folder, f'{kod_daripada_url(url)}.htm')
+
+
+def _tulis_laman(url: str, folder: str, status: int, page_source: str, manifest: Manifest) -> str:
+    '''
+    Menyimpan kandungan laman dan merekodkannya dalam manifest (jika diberikan).
+
+    Kandungan ditulis ke file sementara dahulu dan kemudian dinamakan semula, supaya
+    larian yang dibunuh tidak meninggalkan file laman yang separuh ditulis. Laman dengan
+    status HTTP 400 ke atas tidak disimpan dan menimbulkan RuntimeError supaya ia
+    dicuba semula atau direkodkan dalam lejar.
+
+    Returns:
+        str: Alamat file HTML yang disimpan.
+    '''
+    if not (200 <= status < 400):
+        if manifest is not None:
+            manifest.catat(url, status)
+
+        raise RuntimeError(f'Status HTTP {status} bagi {url}')
+
+    nama_file_laman: str = _nama_file_laman(url, folder)
+    fail_sementara: str = f'{nama_file_laman}.tmp'
+
+    with open(fail_sementara, "w", encoding="utf-8") as halaman:
+        halaman.write(page_source)
+
+    os.replace(fail_sementara, nama_file_laman)
+
+    if manifest is not None:
+        manifest.catat(url, status, hash_kandungan(page_source))
+
+    return nama_file_laman
+
+
+def simpan_lejar(gagal: dict, fail_lejar: str) -> None:
+    '''
+    Menyimpan lejar URL yang gagal ke dalam file JSON.
+
+    Args:
+        gagal (dict): Kamus di mana kunci adalah URL (str) dan nilai adalah kamus
+        dengan kunci 'ralat' (str) dan 'bil_cubaan' (int).
+        fail_lejar (str): Alamat file lejar.
+
+    Catatan:
+        - Jika tiada URL yang gagal, file lejar lama akan dihapuskan supaya larian
+        seterusnya tidak memuat turun semula URL yang sudah berjaya.
+    '''
+    if not gagal:
+        if os.path.exists(fail_lejar):
+            os.remove(fail_lejar)
+        return
+
+    with open(fail_lejar, "w", encoding="utf-8") as lejar:
+        json.dump(gagal, lejar, indent=2)
+
+
+def baca_lejar(fail_lejar: str) -> set:
+    '''
+    Membaca lejar URL yang gagal daripada larian sebelumnya.
+
+    Args:
+        fail_lejar (str): Alamat file lejar.
+
+    Returns:
+        set: Set URL yang gagal. Set kosong jika file lejar tidak wujud.
+    '''
+    if not os.path.exists(fail_lejar):
+        return set()
+
+    with open(fail_lejar, "r", encoding="utf-8") as lejar:
+        gagal: dict = json.load(lejar)
+
+    return set(gagal)
+
+
+class Perayap:
+    '''
+    Perayap laman saham yang memiliki kumpulan kecil pelayar Chromium yang tahan lama.
+
+    Setiap benang pekerja dalam ThreadPoolExecutor milik perayap ini melancarkan satu
+    pelayar Chromium sekali sahaja, kemudian menggunakannya semula untuk semua URL yang
+    diberikan kepadanya. Setiap URL mendapat konteks dan halaman baharu supaya kuki dan
+    storan tidak berkongsi antara laman. Jumlah URL diberikan sekali sahaja semasa
+    perayap dibina supaya kemajuan boleh dicetak tanpa membaca semula laman screener
+    atau menyenaraikan folder laman_saham.
+
+    Args:
+        jumlah_url (int): Jumlah URL yang akan dirayap, untuk paparan kemajuan.
+        bil_pelayar (int): Bilangan pelayar (dan benang pekerja) dalam kumpulan.
+        folder (str): Folder untuk menyimpan laman yang dimuat turun.
+        masa_tamat (int): Had masa memuatkan setiap laman dalam milisaat.
+        manifest (Manifest): Manifest rayapan untuk merekodkan setiap laman, atau None.
+        sekat_sumber (bool): Jika True, sumber yang tidak diperlukan (gambar, fon, CSS,
+        media, iklan dan analitik) disekat melalui penghalaan permintaan.
+        fragmen_sahaja (bool): Jika True, hanya <title>, #price dan jadual
+        financial_reports diekstrak dalam pelayar dan disimpan sebagai dokumen ringkas.
+        argumen_pelayar (list): Argumen baris perintah tambahan bagi Chromium, contohnya
+        '--host-resolver-rules=...' dalam penanda aras, atau None.
+
+    Contoh:
+        with Perayap(jumlah_url=len(semua_url)) as perayap:
+            perayap.rayap(semua_url)
+
+    Catatan:
+        - Objek Playwright segerak terikat kepada benang yang membinanya. Oleh itu
+        setiap pelayar dilancar dan ditutup di dalam benang pekerjanya sendiri.
+        - URL yang gagal direkodkan dalam atribut 'gagal' bersama mesej ralatnya,
+        dalam format yang sama dengan 'simpan_lejar'.
+    '''
+
+    def __init__(
+            self,
+            jumlah_url: int,
+            bil_pelayar: int = 4,
+            folder: str = "laman_saham",
+            masa_tamat: int = 30000,
+            manifest: Manifest = None,
+            sekat_sumber: bool = False,
+            fragmen_sahaja: bool = False,
+            argumen_pelayar: list = None,
+        ) -> None:
+        self.jumlah_url: int = jumlah_url
+        self.bil_pelayar: int = bil_pelayar
+        self.folder: str = folder
+        self.masa_tamat: int = masa_tamat
+        self.manifest: Manifest = manifest
+        self.sekat_sumber: bool = sekat_sumber
+        self.fragmen_sahaja: bool = fragmen_sahaja
+        self.argumen_pelayar: list = argumen_pelayar
+        self.gagal: dict = dict()
+
+        self._setempat: threading.local = threading.local()
+        self._kunci: threading.Lock = threading.Lock()
+        self._bil_siap: int = 0
+        self._pelaksana: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=bil_pelayar)
+
+    def __enter__(self) -> "Perayap":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.tutup()
+
+    def _dapatkan_pelayar(self):
+        '''
+        Mengembalikan pelayar milik benang semasa, dan melancarkannya jika belum ada.
+        '''
+        pelayar = getattr(self._setempat, "pelayar", None)
+
+        if pelayar is None:
+            playwright = sync_playwright().start()
+            pelayar = playwright.chromium.launch(headless=True, args=self.argumen_pelayar)
+            self._setempat.playwright = playwright
+            self._setempat.pelayar = pelayar
+
+        return pelayar
+
+    def _tutup_pelayar(self, penghalang: threading.Barrier) -> None:
+        '''
+        Menutup pelayar milik benang semasa (jika ada).
+
+        Penghalang memastikan setiap tugasan penutup berjalan dalam benang yang berbeza,
+        supaya setiap pelayar ditutup oleh benang yang melancarkannya. Penghalang tetap
+        ditunggu walaupun penutupan gagal, supaya tugasan penutup lain tidak tergantung.
+        '''
+        pelayar = getattr(self._setempat, "pelayar", None)
+
+        try:
+            if pelayar is not None:
+                self._setempat.pelayar = None
+                pelayar.close()
+                playwright = self._setempat.playwright
+                self._setempat.playwright = None
+                playwright.stop()
+        finally:
+            penghalang.wait()
+
+    def simpan_laman(self, url: str) -> str:
+        '''
+        Memuat turun satu URL menggunakan pelayar benang semasa dan menyimpannya.
+
+        Args:
+            url (str): URL halaman web yang akan disimpan.
+
+        Returns:
+            str: Alamat file HTML yang disimpan.
+
+        Contoh:
+            Jika url = "https://www.klsescreener.com/v2/stocks/view/1234/ABC",
+            maka file yang disimpan akan bernama "1234.htm" di dalam folder.
+        '''
+        pelayar = self._dapatkan_pelayar()
+        konteks = pelayar.new_context()
+
+        if self.sekat_sumber:
+            konteks.route("**/*", _sekat_sync)
+
+        try:
+            page = konteks.new_page()
+            respons = page.goto(url=url, timeout=self.masa_tamat)
+
+            if self.fragmen_sahaja:
+                page_source: str = page.evaluate(JS_FRAGMEN)
+            else:
+                page_source = page.content()
+        finally:
+            konteks.close()
+
+        status: int = respons.status if respons is not None else 0
+        nama_file_laman: str = _tulis_laman(url, self.folder, status, page_source, self.manifest)
+
+        with self._kunci:
+            self._bil_siap += 1
+            bil_laman: int = self._bil_siap
+
+        peratus_siap: float = bil_laman / self.jumlah_url
+        print(f'   {bil_laman} / {self.jumlah_url} = {peratus_siap:.2%}', end="\r")
+
+        return nama_file_laman
+
+    def rayap(self, semua_url) -> int:
+        '''
+        Memuat turun dan menyimpan semua URL menggunakan kumpulan pelayar.
+
+        Args:
+            semua_url (iterable): URL-URL halaman web yang akan disimpan.
+
+        Returns:
+            int: Bilangan laman yang berjaya disimpan.
+        '''
+        os.makedirs(self.folder, exist_ok=True)
+
+        semua_tugasan: dict = {
+            self._pelaksana.submit(self.simpan_laman, url): url for url in semua_url
+        }
+
+        bil_berjaya: int = 0
+
+        for tugasan in as_completed(semua_tugasan):
+            url: str = semua_tugasan[tugasan]
+            ralat = tugasan.exception()
+
+            if ralat is None:
+                bil_berjaya += 1
+            else:
+                self.gagal[url] = {"ralat": repr(ralat), "bil_cubaan": 1}
+
+        return bil_berjaya
+
+    def tutup(self) -> None:
+        '''
+        Menutup semua pelayar dalam kumpulan dan menamatkan benang pekerja.
+        '''
+        penghalang: threading.Barrier = threading.Barrier(self.bil_pelayar)
+        semua_penutup: list = [
+            self._pelaksana.submit(self._tutup_pelayar, penghalang)
+            for _ in range(self.bil_pelayar)
+        ]
+
+        try:
+            for penutup in semua_penutup:
+                penutup.result()
+        finally:
+            self._pelaksana.shutdown(wait=True)
+
+
+class PerayapAsync:
+    '''
+    Perayap laman saham tak segerak dengan had keserentakan, cubaan semula dan lejar
+    kegagalan.
+
+    Perayap ini menggunakan 'async_playwright' dengan beberapa pelayar Chromium yang
+    dikongsi. Bilangan laman yang dimuatkan serentak dihadkan oleh semafor. Setiap laman
+    mempunyai had masa tersendiri, dan laman yang gagal dicuba semula dengan kelewatan
+    yang meningkat secara eksponen. URL yang masih gagal selepas semua cubaan direkodkan
+    dalam atribut 'gagal' untuk disimpan sebagai lejar.
+
+    Args:
+        jumlah_url (int): Jumlah URL yang akan dirayap, untuk paparan kemajuan.
+        serentak (int): Bilangan maksimum laman yang dimuatkan serentak.
+        bil_pelayar (int): Bilangan pelayar Chromium yang dikongsi.
+        folder (str): Folder untuk menyimpan laman yang dimuat turun.
+        masa_tamat (int): Had masa setiap laman dalam milisaat.
+        cubaan_maks (int): Bilangan maksimum cubaan bagi setiap URL.
+        kelewatan_asas (float): Kelewatan sebelum cubaan kedua dalam saat. Kelewatan
+        digandakan bagi setiap cubaan seterusnya.
+        manifest (Manifest): Manifest rayapan untuk merekodkan setiap laman, atau None.
+        sekat_sumber (bool): Jika True, sumber yang tidak diperlukan disekat.
+        fragmen_sahaja (bool): Jika True, hanya fragmen yang diperlukan disimpan.
+        argumen_pelayar (list): Argumen baris perintah tambahan bagi Chromium, atau None.
+
+    Contoh:
+        perayap = PerayapAsync(jumlah_url=len(semua_url), serentak=16)
+        bil_berjaya = perayap.rayap(semua_url)
+        simpan_lejar(perayap.gagal, "laman_gagal.json")
+    '''
+
+    def __init__(
+            self,
+            jumlah_url: int,
+            serentak: int = 16,
+            bil_pelayar: int = 2,
+            folder: str = "laman_saham",
+            masa_tamat: int = 30000,
+            cubaan_maks: int = 3,
+            kelewatan_asas: float = 1.,
+            manifest: Manifest = None,
+            sekat_sumber: bool = False,
+            fragmen_sahaja: bool = False,
+            argumen_pelayar: list = None,
+        ) -> None:
+        self.jumlah_url: int = jumlah_url
+        self.serentak: int = serentak
+        self.bil_pelayar: int = bil_pelayar
+        self.folder: str = folder
+        self.masa_tamat: int = masa_tamat
+        self.cubaan_maks: int = cubaan_maks
+        self.kelewatan_asas: float = kelewatan_asas
+        self.manifest: Manifest = manifest
+        self.sekat_sumber: bool = sekat_sumber
+        self.fragmen_sahaja: bool = fragmen_sahaja
+        self.argumen_pelayar: list = argumen_pelayar
+        self.gagal: dict = dict()
+
+        self._bil_siap: int = 0
+
+    async def _simpan_laman(self, pelayar, url: str) -> str:
+        '''
+        Memuat turun satu URL dalam konteks baharu dan menyimpannya.
+        '''
+        konteks = await pelayar.new_context()
+
+        if self.sekat_sumber:
+            await konteks.route("**/*", _sekat_async)
+
+        try:
+            page = await konteks.new_page()
+            respons = await page.goto(url=url, timeout=self.masa_tamat)
+
+            if self.fragmen_sahaja:
+                page_source: str = await page.evaluate(JS_FRAGMEN)
+            else:
+                page_source = await page.content()
+        finally:
+            await konteks.close()
+
+        status: int = respons.status if respons is not None else 0
+
+        return _tulis_laman(url, self.folder, status, page_source, self.manifest)
+
+    async def _cuba_simpan(self, semafor: asyncio.Semaphore, pelayar, url: str) -> bool:
+        '''
+        Mencuba menyimpan satu URL sehingga 'cubaan_maks' kali.
+
+        Returns:
+            bool: True jika laman berjaya disimpan.
+        '''
+        for cubaan in range(1, self.cubaan_maks + 1):
+            try:
+                async with semafor:
+                    await asyncio.wait_for(
+                        self._simpan_laman(pelayar, url),
+                        timeout=self.masa_tamat / 1000 * 2,
+                    )
+            except Exception as ralat:
+                if cubaan == self.cubaan_maks:
+                    self.gagal[url] = {"ralat": repr(ralat), "bil_cubaan": cubaan}
+                    return False
+
+# tunggu di luar semafor supaya laman lain boleh diteruskan.
+                await asyncio.sleep(self.kelewatan_asas * 2 ** (cubaan - 1))
+            else:
+                self._bil_siap += 1
+                peratus_siap: float = self._bil_siap / self.jumlah_url
+                print(f'   {self._bil_siap} / {self.jumlah_url} = {peratus_siap:.2%}', end="\r")
+                return True
+
+    async def _rayap(self, semua_url: list) -> int:
+        os.makedirs(self.folder, exist_ok=True)
+        semafor: asyncio.Semaphore = asyncio.Semaphore(self.serentak)
+
+        async with async_playwright() as p:
+            semua_pelayar: list = [
+                await p.chromium.launch(headless=True, args=self.argumen_pelayar)
+                for _ in range(self.bil_pelayar)
+            ]
+
+            try:
+                hasil: list = await asyncio.gather(*[
+                    self._cuba_simpan(semafor, semua_pelayar[i % self.bil_pelayar], url)
+                    for i, url in enumerate(semua_url)
+                ])
+            finally:
+                for pelayar in semua_pelayar:
+                    await pelayar.close()
+
+        return sum(hasil)
+
+    def rayap(self, semua_url) -> int:
+        '''
+        Memuat turun dan menyimpan semua URL secara tak segerak.
+
+        Args:
+            semua_url (iterable): URL-URL halaman web yang akan disimpan.
+
+        Returns:
+            int: Bilangan laman yang berjaya disimpan.
+        '''
+        return asyncio.run(self._rayap(list(semua_url)))
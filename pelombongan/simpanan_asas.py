@@ -0,0 +1,154 @@
+import hashlib
+import os
+import pandas as pd
+
+
+from multiprocessing import Pool
+
+
+from pelombongan import pelombong
+
+
+LAJUR_PANEL: list = [
+    "fail", "hash", "saiz", "mtime_ns", "kod", "nama", "harga", "fy", "eps", "dps"
+]
+
+
+def _ekstrak_fail(laman: str) -> pd.DataFrame:
+    '''
+    Mengekstrak satu laman saham kepada baris-baris panel asas.
+
+    Returns:
+        pd.DataFrame: Satu baris bagi setiap fy dengan lajur LAJUR_PANEL. Laman tanpa
+        data EPS/DPS menghasilkan satu baris dengan fy kosong (NA) supaya ia juga
+        disimpan dan tidak dihurai semula.
+    '''
+    with open(laman, mode="rb") as l:
+        bait: bytes = l.read()
+
+    stat: os.stat_result = os.stat(laman)
+    nama, kod, harga, df = pelombong.ekstrak_laman(bait.decode("utf-8"))
+
+    if df.empty:
+        df = pd.DataFrame({"fy": [pd.NA], "eps": [float("nan")], "dps": [float("nan")]})
+
+    df["fy"] = df["fy"].astype("Int64")
+    df["fail"] = laman
+    df["hash"] = hashlib.sha256(bait).hexdigest()
+    df["saiz"] = stat.st_size
+    df["mtime_ns"] = stat.st_mtime_ns
+    df["kod"] = kod
+    df["nama"] = nama
+    df["harga"] = harga
+
+    return df[LAJUR_PANEL]
+
+
+def _hash_fail(laman: str) -> str:
+    with open(laman, mode="rb") as l:
+        return hashlib.sha256(l.read()).hexdigest()
+
+
+def muat_panel(
+        semua_laman: list,
+        fail_simpanan: str = "simpanan/asas.parquet",
+    ) -> pd.DataFrame:
+    '''
+    Memuatkan panel asas (nama, kod, harga, EPS dan DPS) bagi semua laman saham,
+    menggunakan simpanan Parquet supaya hanya laman yang berubah dihurai semula.
+
+    Setiap laman dikenal pasti oleh hash kandungannya. Laman yang sama (alamat dan hash)
+    dengan rekod dalam simpanan tidak dihurai semula. Untuk mengelakkan membaca semua
+    laman bagi mengira hash pada setiap larian, saiz dan masa ubah suai file turut
+    disimpan; hash hanya dikira semula jika salah satunya berubah. Laman baharu atau
+    yang berubah dihurai secara selari dengan Pool, dan laman yang tiada lagi dibuang
+    daripada simpanan.
+
+    Args:
+        semua_laman (list): Senarai alamat file HTML laman saham.
+        fail_simpanan (str): Alamat file Parquet simpanan panel.
+
+    Returns:
+        pd.DataFrame: Panel dalam format panjang dengan lajur:
+            - fail (str): Alamat file laman.
+            - hash (str): Hash SHA-256 kandungan laman.
+            - saiz (int), mtime_ns (int): Saiz dan masa ubah suai file.
+            - kod (str), nama (str): Kod dan nama saham daripada tajuk laman.
+            - harga (float): Harga saham.
+            - fy (Int64): Tahun kewangan, NA jika laman tiada data EPS/DPS.
+            - eps (float), dps (float): Jumlah EPS dan DPS bagi fy tersebut.
+
+    Contoh:
+        panel = muat_panel(glob("laman_saham/*.htm"))
+        for kod, df in panel.groupby("kod"):
+            ...
+
+    Catatan:
+        - Laman yang gagal dihurai dicetak dan tidak disimpan, supaya ia dicuba semula
+        pada larian seterusnya.
+    '''
+    if os.path.exists(fail_simpanan):
+        panel_lama: pd.DataFrame = pd.read_parquet(fail_simpanan)
+    else:
+        panel_lama = pd.DataFrame(columns=LAJUR_PANEL)
+
+    identiti_lama: pd.DataFrame = panel_lama.drop_duplicates("fail").set_index("fail")
+
+    laman_kekal: list = []
+    laman_baharu: list = []
+    stat_dikemas_kini: dict = dict()
+
+    for laman in semua_laman:
+        if laman not in identiti_lama.index:
+            laman_baharu.append(laman)
+            continue
+
+        lama: pd.Series = identiti_lama.loc[laman]
+        stat: os.stat_result = os.stat(laman)
+
+        if (stat.st_size, stat.st_mtime_ns) == (lama["saiz"], lama["mtime_ns"]):
+            laman_kekal.append(laman)
+        elif _hash_fail(laman) == lama["hash"]:
+            laman_kekal.append(laman)
+            stat_dikemas_kini[laman] = (stat.st_size, stat.st_mtime_ns)
+        else:
+            laman_baharu.append(laman)
+
+    df_kekal: pd.DataFrame = panel_lama[panel_lama["fail"].isin(laman_kekal)].copy()
+
+# kandungan sama tetapi masa ubah suai berubah: simpan saiz dan masa baharu.
+    for laman, (saiz, mtime_ns) in stat_dikemas_kini.items():
+        df_kekal.loc[df_kekal["fail"] == laman, ["saiz", "mtime_ns"]] = (saiz, mtime_ns)
+
+    semua_df: list = [df_kekal]
+
+    if laman_baharu:
+        with Pool() as p:
+            for laman, df in zip(laman_baharu, p.imap(_cuba_ekstrak_fail, laman_baharu)):
+                if isinstance(df, str):
+                    print(f'   {laman}: {df}')
+                else:
+                    semua_df.append(df)
+
+    panel: pd.DataFrame = pd.concat(
+        [df for df in semua_df if not df.empty] or [panel_lama.iloc[:0]],
+        ignore_index=True,
+    )
+
+    folder: str = os.path.dirname(fail_simpanan)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    panel.to_parquet(fail_simpanan, index=False)
+
+    return panel
+
+
+def _cuba_ekstrak_fail(laman: str):
+    '''
+    Seperti '_ekstrak_fail', tetapi mengembalikan mesej ralat (str) jika gagal.
+    '''
+    try:
+        return _ekstrak_fail(laman)
+    except Exception as ralat:
+        return repr(ralat)
@@ -0,0 +1,199 @@
+import numpy as np
+
+
+SBHGN_URL: str = "/v2/stocks/view/"
+
+# hos pihak ketiga (iklan dan analitik) yang dirujuk oleh laman sintetik. Dalam penanda
+# aras, hos ini dipetakan kepada pelayan tempatan yang berasingan ('pelayan_tempatan').
+HOS_PIHAK_KETIGA: tuple = ("www.googletagmanager.com", "pagead2.googlesyndication.com")
+
+
+def jana_laman_saham(
+        kod: str,
+        nama: str,
+        harga: float,
+        tahun_akhir: int = 2024,
+        bil_tahun: int = 13,
+        saiz_sasaran: int = 400_000,
+        benih: int = 0,
+        pihak_ketiga: bool = True,
+    ) -> str:
+    '''
+    Menjana laman saham sintetik yang menyerupai laman KLSEScreener.
+
+    Laman yang dijana mengandungi tajuk dalam format "NAMA: Nama Penuh (KOD)", elemen
+    dengan ID "price", dan jadual "financial_reports" dengan 4 baris suku tahunan bagi
+    setiap tahun kewangan. Laman juga merujuk kepada aset sendiri (CSS, gambar dan skrip)
+    di bawah laluan '/aset/' dan skrip iklan serta analitik pada HOS_PIHAK_KETIGA, dan
+    dipadatkan dengan kandungan pengisi sehingga mencapai saiz sasaran.
+
+    Args:
+        kod (str): Kod saham, contohnya "1234".
+        nama (str): Nama pendek saham, contohnya "ABC".
+        harga (float): Harga saham semasa.
+        tahun_akhir (int): Tahun kewangan terakhir dalam jadual.
+        bil_tahun (int): Bilangan tahun kewangan dalam jadual.
+        saiz_sasaran (int): Anggaran saiz laman dalam bait.
+        benih (int): Benih penjana nombor rawak.
+        pihak_ketiga (bool): Jika False, skrip HOS_PIHAK_KETIGA tidak dirujuk, untuk
+        pelayar yang tidak dapat memetakan hos tersebut kepada pelayan tempatan.
+
+    Returns:
+        str: Kandungan HTML laman saham sintetik.
+
+    Contoh:
+        jana_laman_saham("1234", "ABC", 1.23) akan mengembalikan laman dengan tajuk
+        "ABC: ABC Berhad (1234)".
+    '''
+    rng: np.random.Generator = np.random.default_rng(benih)
+
+    trend_eps: float = rng.normal(0.2, 0.5)
+    trend_dps: float = rng.normal(0.1, 0.2)
+
+    semua_baris: list = []
+
+    for i, fy in enumerate(range(tahun_akhir, tahun_akhir - bil_tahun, -1)):
+        for suku in range(4, 0, -1):
+            eps: float = 2. + trend_eps * (bil_tahun - i) + rng.normal(0, 1.)
+            dps: float = max(0., 1. + trend_dps * (bil_tahun - i) + rng.normal(0, .5))
+            hasil: int = int(rng.integers(1_000_000, 900_000_000))
+            untung: int = int(hasil * rng.normal(.08, .05))
+
+            semua_baris.append(
+                "<tr>"
+                f"<td>{eps / 4:.2f}</td>"
+                f"<td>{dps / 4:.2f}</td>"
+                f"<td>{rng.uniform(.2, 5.):.4f}</td>"
+                f"<td>{hasil:,}</td>"
+                f"<td>{untung:,}</td>"
+                f"<td>{suku}</td>"
+                f"<td>30 Sep, {fy}</td>"
+                f"<td>31 Dec, {fy}</td>"
+                f"<td>25 Nov, {fy}</td>"
+                f"<td>{rng.normal(5, 10):.2f}%</td>"
+                "</tr>"
+            )
+
+        semua_baris.append('<tr class="more"><td colspan="10">Lagi</td></tr>')
+
+    jadual: str = (
+        '<table class="financial_reports table table-hover table-sm table-theme">'
+        "<thead><tr><th>EPS</th><th>DPS</th><th>NTA</th><th>Revenue</th><th>PL</th>"
+        "<th>Quarter</th><th>Q Date</th><th>Financial Year</th><th>Announced</th>"
+        "<th>%</th></tr></thead>"
+        f"<tbody>{''.join(semua_baris)}</tbody></table>"
+    )
+
+    iklan: str = (
+        f'<script async src="http://{HOS_PIHAK_KETIGA[0]}/gtag/js?id=G-SINTETIK"></script>'
+        f'<script async src="http://{HOS_PIHAK_KETIGA[1]}/pagead/js/adsbygoogle.js"></script>'
+    ) if pihak_ketiga else ""
+
+    kepala: str = (
+        f"<head><meta charset='utf-8'><title>{nama}: {nama} Berhad ({kod})</title>"
+        '<link rel="stylesheet" href="/aset/gaya.css">'
+        '<script src="/aset/skrip.js"></script>'
+        f"{iklan}</head>"
+    )
+
+    gambar: str = "".join(f'<img src="/aset/gambar_{i}.png">' for i in range(8))
+
+    badan: str = (
+        f'<div class="header">{gambar}</div>'
+        f'<div class="stock"><span id="price">{harga:.3f}</span></div>'
+        f"<div class='reports'>{jadual}</div>"
+    )
+
+    saiz_semasa: int = len(kepala) + len(badan)
+    perenggan: str = "<p>Lorem ipsum dolor sit amet, berita pasaran dan komen forum.</p>"
+    bil_pengisi: int = max(0, (saiz_sasaran - saiz_semasa) // len(perenggan))
+    pengisi: str = f"<div class='forum'>{perenggan * bil_pengisi}</div>"
+
+    return f"<!DOCTYPE html><html>{kepala}<body>{badan}{pengisi}</body></html>"
+
+
+def jana_semua_laman(
+        bil_saham: int,
+        saiz_sasaran: int = 400_000,
+        benih: int = 0,
+        pihak_ketiga: bool = True,
+    ) -> dict:
+    '''
+    Menjana sekumpulan laman saham sintetik.
+
+    Args:
+        bil_saham (int): Bilangan laman saham.
+        saiz_sasaran (int): Anggaran saiz setiap laman dalam bait.
+        benih (int): Benih penjana nombor rawak.
+        pihak_ketiga (bool): Seperti 'jana_laman_saham'.
+
+    Returns:
+        dict: Kamus di mana kunci adalah kod saham (str) dan nilai adalah kandungan
+        HTML laman (str).
+    '''
+    rng: np.random.Generator = np.random.default_rng(benih)
+    semua_laman: dict = dict()
+
+    for i in range(bil_saham):
+        kod: str = f'{1000 + i:04d}'
+        harga: float = float(rng.uniform(.1, 20.))
+        semua_laman[kod] = jana_laman_saham(
+            kod,
+            f'SAHAM{i}',
+            harga,
+            saiz_sasaran=saiz_sasaran,
+            benih=benih + i,
+            pihak_ketiga=pihak_ketiga,
+        )
+
+    return semua_laman
+
+
+def jana_laman_screener(
+        semua_kod: list,
+        saiz_sasaran: int = 2_000_000,
+        benih: int = 0,
+    ) -> str:
+    '''
+    Menjana laman screener sintetik yang menyerupai hasil carian KLSEScreener.
+
+    Laman mengandungi satu baris jadual bagi setiap saham dengan dua pautan ke laman
+    saham (jadi URL berulang, seperti laman sebenar), serta pautan navigasi lain yang
+    mesti ditapis oleh 'pelombong.dapatkan_semua_url'. Baris tambahan tanpa pautan
+    saham ditambah sehingga mencapai saiz sasaran.
+
+    Args:
+        semua_kod (list): Kod saham bagi pautan laman saham.
+        saiz_sasaran (int): Anggaran saiz laman dalam bait.
+        benih (int): Benih penjana nombor rawak.
+
+    Returns:
+        str: Kandungan HTML laman screener sintetik.
+    '''
+    rng: np.random.Generator = np.random.default_rng(benih)
+    url: str = f'https://www.klsescreener.com{SBHGN_URL}'
+
+    semua_baris: list = [
+        "<tr>"
+        f'<td><a href="{url}{kod}">{kod}</a></td>'
+        f'<td><a href="{url}{kod}">SAHAM {kod} BERHAD</a></td>'
+        f"<td>{rng.uniform(.1, 20.):.3f}</td>"
+        f"<td>{rng.normal(0, 3):.2f}%</td>"
+        f'<td><a href="https://www.klsescreener.com/v2/charting/{kod}">Carta</a></td>'
+        "</tr>"
+        for kod in semua_kod
+    ]
+
+    navigasi: str = "".join(
+        f'<a href="https://www.klsescreener.com/v2/{halaman}">{halaman}</a>'
+        for halaman in ["screener", "news", "forum", "markets", "portfolio"]
+    )
+    kandungan: str = (
+        f"<!DOCTYPE html><html><head><title>Screener</title></head><body>"
+        f"<nav>{navigasi}</nav><table class='table'><tbody>{''.join(semua_baris)}"
+    )
+
+    baris_pengisi: str = "<tr><td>-</td><td>Lorem ipsum dolor sit amet</td><td>0.000</td></tr>"
+    bil_pengisi: int = max(0, (saiz_sasaran - len(kandungan)) // len(baris_pengisi))
+
+    return f"{kandungan}{baris_pengisi * bil_pengisi}</tbody></table></body></html>"
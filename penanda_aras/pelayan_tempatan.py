@@ -0,0 +1,100 @@
+import os
+import threading
+
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+from penanda_aras.data_sintetik import HOS_PIHAK_KETIGA, SBHGN_URL
+
+
+@contextmanager
+def pelayan_tempatan(folder: str, saiz_aset: int = 50_000):
+    '''
+    Pengurus konteks yang menjalankan pelayan HTTP tempatan sebagai pengganti KLSEScreener.
+
+    Pelayan utama menyajikan laman '{folder}/{kod}.htm' pada laluan
+    '/v2/stocks/view/{kod}/{nama}' dan aset palsu bersaiz 'saiz_aset' bait pada
+    laluan '/aset/...'. Pelayan kedua yang berasingan menyajikan aset palsu yang sama
+    bagi semua laluan, sebagai hos iklan dan analitik HOS_PIHAK_KETIGA. Bilangan
+    permintaan dan bait yang dihantar oleh kedua-dua pelayan dikira supaya penggunaan
+    lebar jalur boleh diukur.
+
+    Args:
+        folder (str): Folder yang mengandungi laman '{kod}.htm'.
+        saiz_aset (int): Saiz setiap aset palsu dalam bait.
+
+    Yields:
+        tuple: Alamat asas pelayan utama (str), kamus statistik dengan kunci
+        'permintaan' dan 'bait', dan senarai argumen Chromium (untuk 'argumen_pelayar'
+        dalam 'Perayap') yang memetakan HOS_PIHAK_KETIGA kepada pelayan kedua.
+
+    Contoh:
+        with pelayan_tempatan("laman_saham") as (url_asas, statistik, argumen_pelayar):
+            url = f'{url_asas}/v2/stocks/view/1234/ABC'
+    '''
+    statistik: dict = {"permintaan": 0, "bait": 0}
+    kunci: threading.Lock = threading.Lock()
+    aset: bytes = b"/* aset */" + b"x" * max(0, saiz_aset - 10)
+
+    class Pengendali(BaseHTTPRequestHandler):
+        def kandungan(self) -> tuple:
+            if self.path.startswith(SBHGN_URL):
+                kod: str = self.path[len(SBHGN_URL):].split("/")[0]
+                laluan: str = os.path.join(folder, f'{kod}.htm')
+
+                if not os.path.exists(laluan):
+                    return None, None
+
+                with open(laluan, "rb") as l:
+                    return l.read(), "text/html; charset=utf-8"
+
+            if self.path.startswith("/aset/"):
+                return aset, "application/octet-stream"
+
+            return None, None
+
+        def do_GET(self):
+            kandungan, jenis = self.kandungan()
+
+            if kandungan is None:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", jenis)
+            self.send_header("Content-Length", str(len(kandungan)))
+            self.end_headers()
+            self.wfile.write(kandungan)
+
+            with kunci:
+                statistik["permintaan"] += 1
+                statistik["bait"] += len(kandungan)
+
+        def log_message(self, *args):
+            pass
+
+    class PengendaliPihakKetiga(Pengendali):
+        def kandungan(self) -> tuple:
+            return aset, "application/javascript"
+
+    semua_pelayan: list = [
+        ThreadingHTTPServer(("127.0.0.1", 0), Pengendali),
+        ThreadingHTTPServer(("127.0.0.1", 0), PengendaliPihakKetiga),
+    ]
+
+    for pelayan in semua_pelayan:
+        threading.Thread(target=pelayan.serve_forever, daemon=True).start()
+
+    port_pihak_ketiga: int = semua_pelayan[1].server_port
+    argumen_pelayar: list = ["--host-resolver-rules=" + ", ".join(
+        f'MAP {hos} 127.0.0.1:{port_pihak_ketiga}' for hos in HOS_PIHAK_KETIGA
+    )]
+
+    try:
+        yield f'http://127.0.0.1:{semua_pelayan[0].server_port}', statistik, argumen_pelayar
+    finally:
+        for pelayan in semua_pelayan:
+            pelayan.shutdown()
+            pelayan.server_close()
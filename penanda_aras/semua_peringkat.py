@@ -0,0 +1,297 @@
+'''
+Suite Penanda Aras bagi Setiap Peringkat dengan Sejarah Keputusan.
+
+Suite ini menjana semua input secara sintetik dan mengukur masa setiap fungsi utama
+saluran paip secara berasingan, tanpa internet:
+1. url: 'pelombong.dapatkan_semua_url' pada laman screener sintetik.
+2. ekstrak: 'pelombong.ekstrak_laman' pada laman saham sintetik bersaiz sebenar.
+3. inlier, min_cerun: 'regresi.dapatkan_inlier' dan 'regresi.dapatkan_min_cerun' bagi
+   setiap saham, serta 'inlier_berkelompok' dan 'min_cerun_berkelompok' (versi
+   serentak yang digunakan oleh 'saringan.saring') pada panel EPS/DPS sintetik.
+4. penskalaan: 'PenskalaKumpulan.padan_jelmakan' pada panel harga harian sintetik.
+5. latih, ramal: 'menilai_saham.latih_model' (statistik bulanan) dan
+   'menilai_saham.ramal_baris' pada subset kecil ticker.
+
+Masa setiap peringkat ialah median beberapa ulangan. Setiap larian ditambah sebagai
+satu baris JSON dalam file sejarah (lalai 'simpanan/penanda_aras.jsonl') bersama commit
+git, versi Python dan parameter. Keputusan dibandingkan dengan larian terakhir yang
+parameternya sama, dan peringkat yang lebih perlahan daripada '--had-regresi' kali
+ditandakan.
+
+Penggunaan:
+    python -m penanda_aras.semua_peringkat --bil-saham 200 --bil-ticker 500
+    python -m penanda_aras.semua_peringkat --peringkat url ekstrak inlier --ulang 5
+'''
+import argparse
+import datetime
+import json
+import os
+import pandas as pd
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+
+from tabulate import tabulate
+
+
+import menilai_saham
+from analisis_stat import regresi
+from analisis_stat.penskalaan import PenskalaKumpulan
+from pelombongan import pelombong
+from penanda_aras.data_sintetik import jana_laman_screener, jana_semua_laman
+from penanda_aras.ukur_agregat import sediakan_data_sintetik
+from penanda_aras.ukur_ransac import jana_panel_eps
+
+
+SEMUA_PERINGKAT: list = [
+    "url",
+    "ekstrak",
+    "inlier",
+    "min_cerun",
+    "inlier_berkelompok",
+    "min_cerun_berkelompok",
+    "penskalaan",
+    "latih",
+    "ramal",
+]
+
+
+def _masa(fungsi, ulang: int) -> tuple:
+    '''
+    Mengembalikan hasil fungsi dan median masa (saat) bagi 'ulang' ulangan.
+    '''
+    semua_tempoh: list = []
+
+    for _ in range(ulang):
+        masa_mula: float = time.perf_counter()
+        hasil = fungsi()
+        semua_tempoh.append(time.perf_counter() - masa_mula)
+
+    return hasil, statistics.median(semua_tempoh)
+
+
+def commit_git() -> str:
+    '''
+    Mengembalikan commit git semasa (dengan '+' jika ada perubahan belum di-commit), atau
+    None jika bukan repositori git.
+    '''
+    try:
+        commit: str = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        berubah: str = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return f'{commit}+' if berubah else commit
+
+
+def utama(
+        semua_peringkat: list,
+        bil_saham: int,
+        bil_ticker: int,
+        bil_ticker_model: int,
+        draw_tune: int,
+        ulang: int,
+    ) -> list:
+    '''
+    Menjalankan penanda aras bagi peringkat yang dipilih.
+
+    Returns:
+        list: Senarai kamus dengan kunci 'peringkat', 'bil' (bilangan item yang
+        diproses), 'saat' dan 'ms_setiap' (milisaat bagi setiap item).
+    '''
+    semua_hasil: list = []
+
+    def catat(peringkat: str, bil: int, fungsi) -> object:
+        hasil, saat = _masa(fungsi, ulang)
+        semua_hasil.append({
+            "peringkat": peringkat, "bil": bil, "saat": saat, "ms_setiap": 1000 * saat / bil
+        })
+
+        return hasil
+
+    def pilih(*nama) -> bool:
+        return any(n in semua_peringkat for n in nama)
+
+    if pilih("url"):
+        with tempfile.TemporaryDirectory() as folder:
+            laman_screener: str = os.path.join(folder, "Screener.html")
+
+            with open(laman_screener, mode="w") as s:
+                s.write(jana_laman_screener([f'{1000 + i:04d}' for i in range(bil_saham)]))
+
+            catat("url", bil_saham, lambda: pelombong.dapatkan_semua_url(laman_screener))
+
+    if pilih("ekstrak"):
+        semua_laman: dict = jana_semua_laman(bil_saham)
+        catat("ekstrak", bil_saham, lambda: [
+            pelombong.ekstrak_laman(kandungan) for kandungan in semua_laman.values()
+        ])
+
+    if pilih("inlier", "min_cerun", "inlier_berkelompok", "min_cerun_berkelompok"):
+        panel: pd.DataFrame = jana_panel_eps(bil_saham)
+        semua_df: list = [df for _, df in panel.groupby("kod")]
+
+    if pilih("inlier"):
+        catat("inlier", bil_saham, lambda: [
+            regresi.dapatkan_inlier(df, "fy", "eps", benih=0) for df in semua_df
+        ])
+
+    if pilih("min_cerun"):
+        catat("min_cerun", bil_saham, lambda: [
+            regresi.dapatkan_min_cerun(df, "fy", "eps", .05) for df in semua_df
+        ])
+
+    if pilih("inlier_berkelompok"):
+        catat("inlier_berkelompok", bil_saham, lambda: regresi.dapatkan_inlier_berkelompok(
+            panel, "kod", "fy", "eps", benih=0
+        ))
+
+    if pilih("min_cerun_berkelompok"):
+        catat(
+            "min_cerun_berkelompok",
+            bil_saham,
+            lambda: regresi.dapatkan_min_cerun_berkelompok(panel, "kod", "fy", "eps", .05),
+        )
+
+    if pilih("penskalaan"):
+        _, data, _, _ = sediakan_data_sintetik(bil_ticker)
+        catat("penskalaan", bil_ticker, lambda: PenskalaKumpulan().padan_jelmakan(
+            data["Ticker"], data["Close"]
+        ))
+
+    if pilih("latih", "ramal"):
+        _, data, _, penskala = sediakan_data_sintetik(bil_ticker_model)
+        data = menilai_saham.agregat_data(data)
+        tahun: int = int(data["tahun"].max())
+        bulan: int = int(data.loc[data["tahun"] == tahun, "bulan"].max())
+
+        model, idata = catat("latih", bil_ticker_model, lambda: menilai_saham.latih_model(
+            data, draw_tune, .95, agregat=True
+        ))
+
+        if pilih("ramal"):
+            catat("ramal", bil_ticker_model, lambda: menilai_saham.ramal_baris(
+                model, idata, tahun, [bulan], penskala
+            ))
+
+    return [hasil for hasil in semua_hasil if hasil["peringkat"] in semua_peringkat]
+
+
+def bandingkan(semua_hasil: list, rekod_lama: dict, had_regresi: float) -> list:
+    '''
+    Menambah nisbah masa berbanding rekod lama dan tanda regresi bagi setiap peringkat.
+    '''
+    masa_lama: dict = {
+        hasil["peringkat"]: hasil["saat"] for hasil in (rekod_lama or {}).get("hasil", [])
+    }
+
+    for hasil in semua_hasil:
+        nisbah: float = (
+            hasil["saat"] / masa_lama[hasil["peringkat"]]
+            if masa_lama.get(hasil["peringkat"]) else None
+        )
+        hasil["nisbah"] = nisbah
+        hasil["regresi"] = nisbah is not None and nisbah > had_regresi
+
+    return semua_hasil
+
+
+def rekod_terakhir(fail_sejarah: str, parameter: dict) -> dict:
+    '''
+    Mengembalikan rekod terakhir dalam file sejarah dengan parameter yang sama, atau
+    None.
+    '''
+    if not os.path.exists(fail_sejarah):
+        return None
+
+    terakhir: dict = None
+
+    with open(fail_sejarah, mode="r", encoding="utf-8") as s:
+        for baris in s:
+            try:
+                rekod: dict = json.loads(baris)
+            except json.JSONDecodeError:
+                continue
+
+            if rekod.get("parameter") == parameter:
+                terakhir = rekod
+
+    return terakhir
+
+
+def simpan_rekod(fail_sejarah: str, parameter: dict, semua_hasil: list) -> dict:
+    '''
+    Menambah satu rekod larian ke dalam file sejarah (satu objek JSON setiap baris).
+    '''
+    rekod: dict = {
+        "masa": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit_git(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameter": parameter,
+        "hasil": [
+            {k: v for k, v in hasil.items() if k not in ["nisbah", "regresi"]}
+            for hasil in semua_hasil
+        ],
+    }
+
+    folder: str = os.path.dirname(fail_sejarah)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    with open(fail_sejarah, mode="a", encoding="utf-8") as s:
+        s.write(json.dumps(rekod, ensure_ascii=False) + "\n")
+
+    return rekod
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument(
+        "--peringkat", nargs="+", choices=SEMUA_PERINGKAT, default=SEMUA_PERINGKAT
+    )
+    penghurai.add_argument("--bil-saham", type=int, default=200)
+    penghurai.add_argument("--bil-ticker", type=int, default=500)
+    penghurai.add_argument("--bil-ticker-model", type=int, default=10)
+    penghurai.add_argument("--draw-tune", type=int, default=300)
+    penghurai.add_argument("--ulang", type=int, default=3)
+    penghurai.add_argument("--fail-sejarah", default="simpanan/penanda_aras.jsonl")
+    penghurai.add_argument("--had-regresi", type=float, default=1.2)
+    hujah = penghurai.parse_args()
+
+    parameter: dict = {
+        k: getattr(hujah, k) for k in [
+            "peringkat", "bil_saham", "bil_ticker", "bil_ticker_model", "draw_tune", "ulang"
+        ]
+    }
+    rekod_lama: dict = rekod_terakhir(hujah.fail_sejarah, parameter)
+
+    semua_hasil: list = utama(
+        hujah.peringkat,
+        hujah.bil_saham,
+        hujah.bil_ticker,
+        hujah.bil_ticker_model,
+        hujah.draw_tune,
+        hujah.ulang,
+    )
+    simpan_rekod(hujah.fail_sejarah, parameter, semua_hasil)
+
+    print(tabulate(
+        bandingkan(semua_hasil, rekod_lama, hujah.had_regresi),
+        headers="keys",
+        tablefmt="fancy_grid",
+        floatfmt=".4f",
+    ))
+
+    if rekod_lama is not None:
+        print(f'   Dibandingkan dengan commit {rekod_lama["commit"]} ({rekod_lama["masa"]}).')
@@ -0,0 +1,149 @@
+'''
+Semakan Ketepatan Likelihood Agregat: Harga Harian Berbanding Statistik Bulanan.
+
+Penanda aras ini menjana harga harian sintetik (lalai 10 ticker selama 3 tahun),
+melatih model FORMULA dalam 'menilai_saham.py' dua kali, iaitu dengan harga harian
+dan dengan statistik bulanan daripada 'menilai_saham.agregat_data', dan
+membandingkan:
+1. Bilangan baris likelihood dan masa latihan.
+2. Bagi setiap pemboleh ubah posterior, beza purata posterior dibahagi sisihan
+   piawai posterior harian (median dan maksimum bagi semua elemen), dan nisbah
+   sisihan piawai posterior agregat kepada harian.
+3. Persetujuan senarai tren daripada 'menilai_saham.tentukan_tren'.
+
+Beza purata yang kecil berbanding ralat Monte Carlo (kira-kira 0.1 sisihan piawai
+bagi beberapa ratus draw) dan nisbah sisihan piawai hampir 1 menunjukkan posterior
+yang sama.
+
+Penggunaan:
+    python -m penanda_aras.ukur_agregat --bil-ticker 10 --draw-tune 500 --cores 2
+'''
+import argparse
+import arviz as az
+import numpy as np
+import os
+import pandas as pd
+import tempfile
+import time
+
+
+from tabulate import tabulate
+
+
+import menilai_saham
+from pelombongan.pembekal_harga import PembekalFail, SimpananHarga
+from penanda_aras.ukur_panel_harga import jana_harga
+
+
+def sediakan_data_sintetik(bil_ticker: int, benih: int = 0) -> tuple:
+    '''
+    Menjana harga harian sintetik dan menyediakannya dengan 'menilai_saham.sediakan_data'.
+
+    Returns:
+        tuple: Kamus ticker, diikuti data, harga_semasa dan penskala daripada
+        'menilai_saham.sediakan_data'.
+    '''
+    lebar, ticker = jana_harga(bil_ticker, benih=benih)
+    panjang: pd.DataFrame = lebar["Close"].stack().rename("Close").reset_index()
+
+    with tempfile.TemporaryDirectory() as folder:
+        fail_harga: str = os.path.join(folder, "harga.parquet")
+        panjang.to_parquet(fail_harga, index=False)
+
+        return ticker, *menilai_saham.sediakan_data(
+            ticker, SimpananHarga(PembekalFail(fail_harga), os.path.join(folder, "simpanan"))
+        )
+
+
+def bandingkan_posterior(harian: az.InferenceData, agregat: az.InferenceData) -> list:
+    '''
+    Membandingkan purata dan sisihan piawai posterior bagi setiap pemboleh ubah yang
+    wujud dalam kedua-dua model. 'sigma' harian dibandingkan dengan
+    exp(sigma_Intercept) dalam model agregat.
+
+    Returns:
+        list: Senarai kamus dengan kunci 'pemboleh_ubah', 'elemen', 'beza_median',
+        'beza_maks' dan 'nisbah_sd'.
+    '''
+    posterior_agregat = agregat.posterior.assign(
+        sigma=np.exp(agregat.posterior["sigma_Intercept"])
+    )
+    semua_hasil: list = []
+
+    for nama in harian.posterior.data_vars:
+        if nama not in posterior_agregat or nama == "mu":
+            continue
+
+        h = harian.posterior[nama]
+        a = posterior_agregat[nama]
+
+        purata_h: np.ndarray = h.mean(("chain", "draw")).to_numpy().ravel()
+        sd_h: np.ndarray = h.std(("chain", "draw")).to_numpy().ravel()
+        purata_a: np.ndarray = a.mean(("chain", "draw")).to_numpy().ravel()
+        sd_a: np.ndarray = a.std(("chain", "draw")).to_numpy().ravel()
+
+        beza: np.ndarray = np.abs(purata_a - purata_h) / sd_h
+
+        semua_hasil.append({
+            "pemboleh_ubah": nama,
+            "elemen": beza.size,
+            "beza_median": np.median(beza),
+            "beza_maks": beza.max(),
+            "nisbah_sd": np.median(sd_a / sd_h),
+        })
+
+    return semua_hasil
+
+
+def utama(bil_ticker: int, draw_tune: int, cores: int) -> tuple:
+    '''
+    Melatih kedua-dua model dan mengembalikan ringkasan masa dan perbandingan posterior.
+
+    Returns:
+        tuple: Senarai kamus masa bagi setiap mod, senarai perbandingan posterior
+        daripada 'bandingkan_posterior' dan peratus senarai tren yang sama.
+    '''
+    _, data, _, _ = sediakan_data_sintetik(bil_ticker)
+    tahun: int = int(data["tahun"].max())
+
+    semua_masa: list = []
+    semua_idata: dict = dict()
+    semua_tren: dict = dict()
+
+    for agregat in [False, True]:
+        data_model: pd.DataFrame = menilai_saham.agregat_data(data) if agregat else data
+
+        masa_mula: float = time.perf_counter()
+        _, idata = menilai_saham.latih_model(
+            data_model, draw_tune, .95, cores=cores, agregat=agregat
+        )
+        tempoh: float = time.perf_counter() - masa_mula
+
+        mod: str = "agregat" if agregat else "harian"
+        semua_idata[mod] = idata
+        semua_tren[mod] = menilai_saham.tentukan_tren(idata, tahun)
+        semua_masa.append({"mod": mod, "baris": len(data_model), "saat": tempoh})
+
+    perbandingan: list = bandingkan_posterior(semua_idata["harian"], semua_idata["agregat"])
+    tren_sama: float = 100 * np.mean([
+        set(semua_tren["harian"][k]) == set(semua_tren["agregat"][k])
+        for k in semua_tren["harian"]
+    ])
+
+    return semua_masa, perbandingan, tren_sama
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-ticker", type=int, default=10)
+    penghurai.add_argument("--draw-tune", type=int, default=500)
+    penghurai.add_argument("--cores", type=int, default=2)
+    hujah = penghurai.parse_args()
+
+    semua_masa, perbandingan, tren_sama = utama(
+        hujah.bil_ticker, hujah.draw_tune, hujah.cores
+    )
+
+    print(tabulate(semua_masa, headers="keys", tablefmt="fancy_grid", floatfmt=".2f"))
+    print(tabulate(perbandingan, headers="keys", tablefmt="fancy_grid", floatfmt=".3f"))
+    print(f'Senarai tren yang sama: {tren_sama:.0f}%')
@@ -0,0 +1,137 @@
+'''
+Penanda Aras Kaedah Inferens: Masa Berbanding Ketepatan Relatif kepada NUTS.
+
+Penanda aras ini menjana harga harian sintetik (lalai 10 ticker selama 3 tahun) dan
+melatih model dalam 'menilai_saham.py' dengan setiap kaedah dalam
+'menilai_saham.SEMUA_KAEDAH'. Bagi setiap kaedah, ia melaporkan:
+1. Masa latihan (saat) dan ESS bulk minimum bagi semua pemboleh ubah posterior,
+   serta ESS minimum sesaat. Bagi 'advi' dan 'pathfinder', draw adalah bebas jadi
+   ESS hampir sama dengan bilangan draw.
+2. Peratus ticker dengan tren tahunan dan bulanan yang sama seperti rujukan NUTS.
+3. Hanyutan ramalan bulan terakhir: median beza harga ramalan daripada rujukan
+   dibahagi lebar HDI rujukan, dan median nisbah lebar HDI kepada lebar HDI rujukan.
+
+Kaedah yang pakejnya tidak dipasang (nutpie, numpyro atau pymc-extras) dilangkau.
+Model dilatih dengan statistik bulanan ('--agregat') secara lalai supaya penanda aras
+cepat; gunakan '--harian' untuk harga harian.
+
+Penggunaan:
+    python -m penanda_aras.ukur_inferens --bil-ticker 10 --draw-tune 1000 --cores 2
+'''
+import argparse
+import arviz as az
+import pandas as pd
+import time
+
+
+from tabulate import tabulate
+
+
+import menilai_saham
+from penanda_aras.ukur_agregat import sediakan_data_sintetik
+
+
+def bandingkan_ramalan(ramalan: pd.DataFrame, rujukan: pd.DataFrame) -> dict:
+    '''
+    Membandingkan jadual 'menilai_saham.ramal' dengan jadual rujukan NUTS.
+
+    Returns:
+        dict: Kamus dengan kunci 'tren_sama' (%), 'hanyut_ramalan' dan 'nisbah_hdi'.
+    '''
+    gabung: pd.DataFrame = ramalan.merge(rujukan, on="Ticker", suffixes=("", "_rujukan"))
+    lebar_rujukan: pd.Series = gabung["atas_rujukan"] - gabung["bawah_rujukan"]
+
+    tren_sama: pd.Series = (
+        (gabung["tren_tahun"] == gabung["tren_tahun_rujukan"])
+        & (gabung["tren_bulan"] == gabung["tren_bulan_rujukan"])
+    )
+
+    return {
+        "tren_sama": 100 * tren_sama.mean(),
+        "hanyut_ramalan": (
+            (gabung["harga_ramalan"] - gabung["harga_ramalan_rujukan"]).abs() / lebar_rujukan
+        ).median(),
+        "nisbah_hdi": ((gabung["atas"] - gabung["bawah"]) / lebar_rujukan).median(),
+    }
+
+
+def utama(
+        bil_ticker: int,
+        draw_tune: int,
+        cores: int,
+        agregat: bool = True,
+        semua_kaedah: list = None,
+    ) -> list:
+    '''
+    Melatih model dengan setiap kaedah dan mengembalikan satu baris keputusan bagi
+    setiap kaedah. Kaedah pertama ('nuts') menjadi rujukan.
+
+    Returns:
+        list: Senarai kamus dengan kunci 'kaedah', 'saat', 'ess_min', 'ess_sesaat',
+        'tren_sama', 'hanyut_ramalan' dan 'nisbah_hdi'.
+    '''
+    semua_kaedah = menilai_saham.SEMUA_KAEDAH if semua_kaedah is None else semua_kaedah
+    ticker, data, harga_semasa, penskala = sediakan_data_sintetik(bil_ticker)
+    tahun: int = int(data["tahun"].max())
+    bulan: int = int(data.loc[data["tahun"] == tahun, "bulan"].max())
+
+    if agregat:
+        data = menilai_saham.agregat_data(data)
+
+    semua_hasil: list = []
+    rujukan: pd.DataFrame = None
+
+    for kaedah in ["nuts", *[k for k in semua_kaedah if k != "nuts"]]:
+        masa_mula: float = time.perf_counter()
+
+        try:
+            model, idata = menilai_saham.latih_model(
+                data, draw_tune, .95, cores=cores, agregat=agregat, kaedah=kaedah
+            )
+        except ImportError as e:
+            print(f'{kaedah} dilangkau: {e}')
+            continue
+
+        tempoh: float = time.perf_counter() - masa_mula
+        ess_min: float = float(az.ess(idata, method="bulk").to_array().min())
+
+        ramalan: pd.DataFrame = menilai_saham.ramal(
+            model,
+            idata,
+            tahun,
+            bulan,
+            ticker,
+            penskala,
+            harga_semasa,
+            menilai_saham.tentukan_tren(idata, tahun),
+        )
+        rujukan = ramalan if rujukan is None else rujukan
+
+        semua_hasil.append({
+            "kaedah": kaedah,
+            "saat": tempoh,
+            "ess_min": ess_min,
+            "ess_sesaat": ess_min / tempoh,
+            **bandingkan_ramalan(ramalan, rujukan),
+        })
+
+    return semua_hasil
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-ticker", type=int, default=10)
+    penghurai.add_argument("--draw-tune", type=int, default=1000)
+    penghurai.add_argument("--cores", type=int, default=2)
+    penghurai.add_argument("--harian", action="store_true")
+    penghurai.add_argument(
+        "--kaedah", nargs="+", choices=menilai_saham.SEMUA_KAEDAH, default=None
+    )
+    hujah = penghurai.parse_args()
+
+    print(tabulate(
+        utama(hujah.bil_ticker, hujah.draw_tune, hujah.cores, not hujah.harian, hujah.kaedah),
+        headers="keys",
+        tablefmt="fancy_grid",
+        floatfmt=".2f",
+    ))
@@ -0,0 +1,151 @@
+'''
+Penanda Aras Memori Panel Harga: Format Asal Berbanding Format Padat.
+
+Penanda aras ini menjana harga harian sintetik (lalai 500 ticker selama 3 tahun) dan
+mengukur saiz akhir (memory_usage deep) dan memori puncak (tracemalloc) panel harga
+yang dilaraskan kepada skala piawai, bagi:
+1. Asal: bingkai lebar gaya yfinance (Open, High, Low, Close, Volume) yang di-stack,
+   dengan Ticker dan nama sebagai object, tahun dan bulan sebagai int32/int64, dan
+   lajur harga_piawai float64 daripada gelung StandardScaler.
+2. Padat: 'menilai_saham.sediakan_data' dengan 'pelombong.dapatkan_data_saham'
+   (Ticker dan nama categorical, tahun int16, bulan int8), diambil dalam ketul
+   melalui 'SimpananHarga' dan 'PembekalFail', dengan harga float64 dan float32.
+
+Penggunaan:
+    python -m penanda_aras.ukur_panel_harga --bil-ticker 500
+'''
+import argparse
+import numpy as np
+import os
+import pandas as pd
+import tempfile
+import time
+import tracemalloc
+
+
+from sklearn.preprocessing import StandardScaler
+from tabulate import tabulate
+
+
+import menilai_saham
+from pelombongan.pembekal_harga import PembekalFail, SimpananHarga
+
+
+def jana_harga(bil_ticker: int, tempoh_tahun: int = 3, benih: int = 0) -> tuple:
+    '''
+    Menjana harga harian sintetik dalam format lebar gaya yfinance.
+
+    Returns:
+        tuple: Bingkai lebar (lajur MultiIndex Price x Ticker) dan kamus ticker.
+    '''
+    rng: np.random.Generator = np.random.default_rng(benih)
+    hari_ini: pd.Timestamp = pd.Timestamp.today().normalize()
+    tarikh: pd.DatetimeIndex = pd.bdate_range(
+        hari_ini - pd.DateOffset(years=tempoh_tahun), hari_ini, name="Date"
+    )
+
+    ticker: dict = {f'{1000 + i:04d}.KL': f'SAHAM {i} BERHAD' for i in range(bil_ticker)}
+    tutup: np.ndarray = 5 * np.exp(np.cumsum(rng.normal(0, .01, (len(tarikh), bil_ticker)), axis=0))
+
+    lebar: pd.DataFrame = pd.concat(
+        {
+            "Close": pd.DataFrame(tutup, index=tarikh, columns=[*ticker]),
+            "High": pd.DataFrame(tutup * 1.01, index=tarikh, columns=[*ticker]),
+            "Low": pd.DataFrame(tutup * .99, index=tarikh, columns=[*ticker]),
+            "Open": pd.DataFrame(tutup, index=tarikh, columns=[*ticker]),
+            "Volume": pd.DataFrame(
+                rng.integers(0, 10**6, tutup.shape), index=tarikh, columns=[*ticker]
+            ),
+        },
+        axis=1,
+        names=["Price", "Ticker"],
+    )
+
+    return lebar, ticker
+
+
+def panel_asal(lebar: pd.DataFrame, ticker: dict) -> pd.DataFrame:
+    '''
+    Membina panel seperti 'dapatkan_data_saham' dan 'menilai_saham.py' yang asal.
+    '''
+    data: pd.DataFrame = lebar.stack(future_stack=True).reset_index()
+    data["nama"] = data["Ticker"].map(ticker)
+    data["tahun"] = data["Date"].dt.year
+    data["bulan"] = data["Date"].dt.month
+    data = data[["Date", "Ticker", "nama", "tahun", "bulan", "Close"]]
+
+    for saham, kumpulan in data.groupby("Ticker", observed=False):
+        penskala = StandardScaler()
+        data.loc[kumpulan.index, "harga_piawai"] = penskala.fit_transform(kumpulan[["Close"]])
+
+    return data
+
+
+def _ukur(fungsi) -> tuple:
+    '''
+    Mengembalikan hasil fungsi, saiz hasil (MB), memori puncak (MB) dan masa (saat).
+    '''
+    tracemalloc.start()
+    masa_mula: float = time.perf_counter()
+    hasil = fungsi()
+    tempoh: float = time.perf_counter() - masa_mula
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if isinstance(hasil, tuple):
+        hasil = hasil[0]
+
+    return hasil, hasil.memory_usage(deep=True).sum() / 2**20, puncak / 2**20, tempoh
+
+
+def utama(bil_ticker: int) -> list:
+    '''
+    Menjalankan penanda aras dan mengembalikan satu baris keputusan bagi setiap format.
+
+    Returns:
+        list: Senarai kamus dengan kunci 'format', 'baris', 'mb_panel', 'mb_puncak'
+        dan 'saat'.
+    '''
+    lebar, ticker = jana_harga(bil_ticker)
+    semua_hasil: list = []
+
+    data, mb_panel, mb_puncak, saat = _ukur(lambda: panel_asal(lebar, ticker))
+    semua_hasil.append({
+        "format": "asal (float64)", "baris": len(data),
+        "mb_panel": mb_panel, "mb_puncak": mb_puncak, "saat": saat,
+    })
+
+    with tempfile.TemporaryDirectory() as folder:
+        fail_harga: str = os.path.join(folder, "harga.parquet")
+        data[["Date", "Ticker", "Close"]].to_parquet(fail_harga, index=False)
+        del lebar, data
+
+        simpanan: SimpananHarga = SimpananHarga(
+            PembekalFail(fail_harga), os.path.join(folder, "simpanan")
+        )
+# larian pertama mengisi simpanan; yang diukur adalah larian dengan simpanan.
+        simpanan.ambil([*ticker])
+
+        for jenis_harga in ["float64", "float32"]:
+            data, mb_panel, mb_puncak, saat = _ukur(lambda: menilai_saham.sediakan_data(
+                ticker, simpanan, jenis_harga
+            ))
+            semua_hasil.append({
+                "format": f'padat ({jenis_harga})', "baris": len(data),
+                "mb_panel": mb_panel, "mb_puncak": mb_puncak, "saat": saat,
+            })
+
+    return semua_hasil
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-ticker", type=int, default=500)
+    hujah = penghurai.parse_args()
+
+    print(tabulate(
+        utama(hujah.bil_ticker),
+        headers="keys",
+        tablefmt="fancy_grid",
+        floatfmt=".2f",
+    ))
@@ -0,0 +1,124 @@
+'''
+Penanda Aras Pengekstrak: BeautifulSoup Berbanding lxml dan XPath.
+
+Penanda aras ini mengukur masa hurai setiap laman bagi dua cara mengekstrak nama, kod,
+harga dan data EPS/DPS:
+1. Sebelum: BeautifulSoup "html.parser" dengan 'dapatkan_nama_saham',
+   'dapatkan_harga' dan 'dapatkan_data_eps_dps'.
+2. Selepas: 'pelombong.ekstrak_laman' dalam satu laluan.
+
+Laman yang digunakan adalah laman dalam folder 'laman_saham/' jika ada, atau laman
+sintetik bersaiz sebenar jika tiada. Penanda aras juga memastikan kedua-dua cara
+menghasilkan data yang sama, termasuk bagi laman dengan dua jadual financial_reports
+(hanya jadual pertama dibaca).
+
+Penggunaan:
+    python -m penanda_aras.ukur_pengekstrak --bil-laman 50
+'''
+import argparse
+import time
+
+
+from bs4 import BeautifulSoup
+from glob import glob
+
+
+from pelombongan import pelombong
+from penanda_aras.data_sintetik import jana_semua_laman
+
+
+def _ekstrak_bs4(kandungan: str) -> tuple:
+    sup: BeautifulSoup = BeautifulSoup(kandungan, "html.parser")
+    nama, kod = pelombong.dapatkan_nama_saham(sup)
+    harga: float = pelombong.dapatkan_harga(sup)
+    df = pelombong.dapatkan_data_eps_dps(sup)
+
+    return nama, kod, harga, df
+
+
+def _sama(a: tuple, b: tuple) -> bool:
+    return a[:3] == b[:3] and (a[3].astype(float).values == b[3].astype(float).values).all()
+
+
+def _tambah_jadual_kedua(kandungan: str, kandungan_lain: str) -> str:
+    '''
+    Menyisipkan jadual financial_reports daripada kandungan_lain selepas jadual pertama
+    dalam kandungan, supaya laman mempunyai dua jadual financial_reports.
+    '''
+    mula: int = kandungan_lain.index('<table class="financial_reports')
+    jadual: str = kandungan_lain[mula:kandungan_lain.index("</table>", mula) + len("</table>")]
+    hujung: int = kandungan.index("</table>") + len("</table>")
+
+    return kandungan[:hujung] + f"<div class='annual'>{jadual}</div>" + kandungan[hujung:]
+
+
+def _masa_setiap_laman(fungsi, semua_kandungan: list) -> tuple:
+    '''
+    Mengembalikan purata masa setiap laman (ms) dan senarai hasil fungsi.
+    '''
+    masa_mula: float = time.perf_counter()
+    semua_hasil: list = [fungsi(k) for k in semua_kandungan]
+    tempoh: float = time.perf_counter() - masa_mula
+
+    return tempoh / len(semua_kandungan) * 1000, semua_hasil
+
+
+def utama(bil_laman: int, saiz_laman: int) -> dict:
+    '''
+    Menjalankan penanda aras dan mengembalikan purata masa setiap laman.
+
+    Args:
+        bil_laman (int): Bilangan laman yang dihurai.
+        saiz_laman (int): Anggaran saiz laman sintetik dalam bait.
+
+    Returns:
+        dict: Kamus dengan kunci 'sebelum' dan 'selepas' (ms setiap laman), 'sama'
+        (bool) yang menunjukkan sama ada hasilnya sepadan, dan 'sama_dua_jadual' (bool)
+        bagi laman dengan dua jadual financial_reports.
+    '''
+    semua_laman: list = sorted(glob("laman_saham/*.htm"))[:bil_laman]
+
+    if semua_laman:
+        semua_kandungan: list = []
+        for laman in semua_laman:
+            with open(laman, mode="r", encoding="utf-8") as l:
+                semua_kandungan.append(l.read())
+    else:
+        semua_kandungan = list(jana_semua_laman(bil_laman, saiz_laman).values())
+
+    ms_sebelum, hasil_sebelum = _masa_setiap_laman(_ekstrak_bs4, semua_kandungan)
+    ms_selepas, hasil_selepas = _masa_setiap_laman(pelombong.ekstrak_laman, semua_kandungan)
+
+    sama: bool = all(_sama(a, b) for a, b in zip(hasil_sebelum, hasil_selepas))
+
+# laman dengan dua jadual: kedua-dua cara mesti membaca jadual pertama sahaja.
+    laman_sintetik: list = list(jana_semua_laman(2, saiz_laman).values())
+    dua_jadual: str = _tambah_jadual_kedua(*laman_sintetik)
+    sama_dua_jadual: bool = (
+        _sama(_ekstrak_bs4(dua_jadual), pelombong.ekstrak_laman(dua_jadual))
+        and _sama(pelombong.ekstrak_laman(dua_jadual), pelombong.ekstrak_laman(laman_sintetik[0]))
+    )
+
+    return {
+        "sebelum": ms_sebelum,
+        "selepas": ms_selepas,
+        "sama": sama,
+        "sama_dua_jadual": sama_dua_jadual,
+    }
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-laman", type=int, default=50)
+    penghurai.add_argument("--saiz-laman", type=int, default=400_000)
+    hujah = penghurai.parse_args()
+
+    hasil: dict = utama(hujah.bil_laman, hujah.saiz_laman)
+
+    print(f'''
+ Masa setiap laman (BeautifulSoup): {hasil["sebelum"]:.2f} ms
+ Masa setiap laman (lxml + XPath):  {hasil["selepas"]:.2f} ms
+ Kelajuan: {hasil["sebelum"] / hasil["selepas"]:.1f}x
+ Hasil sepadan: {hasil["sama"]}
+ Hasil sepadan (dua jadual): {hasil["sama_dua_jadual"]}
+    ''')
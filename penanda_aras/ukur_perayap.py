@@ -0,0 +1,115 @@
+'''
+Penanda Aras Perayap: Pelayar Per URL Berbanding Kumpulan Pelayar Tahan Lama.
+
+Penanda aras ini menjana laman saham sintetik, menyajikannya melalui pelayan HTTP
+tempatan, dan mengukur bilangan laman sesaat bagi dua cara muat turun:
+1. Sebelum: seperti 'simpan_laman' yang asal, satu pelayar Chromium dilancar untuk
+   setiap URL, laman screener dibaca semula dan folder disenaraikan selepas setiap
+   simpanan.
+2. Selepas: kelas 'Perayap' dengan kumpulan pelayar yang digunakan semula.
+
+Penggunaan:
+    python -m penanda_aras.ukur_perayap --bil-laman 300 --bil-pelayar 4
+'''
+import argparse
+import os
+import tempfile
+import time
+
+
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+
+
+from pelombongan import pelombong
+from pelombongan.perayap import Perayap
+from penanda_aras.data_sintetik import SBHGN_URL, jana_semua_laman
+from penanda_aras.pelayan_tempatan import pelayan_tempatan
+
+
+def _simpan_laman_asal(url: str, laman_screener: str, folder: str) -> None:
+    '''
+    Meniru kos 'simpan_laman' yang asal bagi setiap URL.
+    '''
+    jumlah_url: int = len(pelombong.dapatkan_semua_url(laman_screener))
+    pelombong.simpan_laman(url, folder=folder)
+    bil_laman: int = len(glob(f'{folder}/*.htm'))
+    print(f'   {bil_laman} / {jumlah_url}', end="\r")
+
+
+def utama(bil_laman: int, bil_pelayar: int, saiz_laman: int) -> dict:
+    '''
+    Menjalankan penanda aras dan mengembalikan laman sesaat bagi setiap cara.
+
+    Args:
+        bil_laman (int): Bilangan laman sintetik yang dimuat turun.
+        bil_pelayar (int): Bilangan benang (dan pelayar) serentak.
+        saiz_laman (int): Anggaran saiz setiap laman dalam bait.
+
+    Returns:
+        dict: Kamus dengan kunci 'sebelum' dan 'selepas' dan nilai laman sesaat.
+    '''
+    with tempfile.TemporaryDirectory() as folder_kerja:
+        folder_sumber: str = os.path.join(folder_kerja, "sumber")
+        os.makedirs(folder_sumber)
+
+# 'pelombong.simpan_laman' tidak menerima argumen pelayar, jadi laman tanpa skrip pihak
+# ketiga supaya kedua-dua cara hanya menghubungi pelayan tempatan.
+        for kod, kandungan in jana_semua_laman(
+            bil_laman, saiz_laman, pihak_ketiga=False
+        ).items():
+            with open(os.path.join(folder_sumber, f'{kod}.htm'), "w", encoding="utf-8") as l:
+                l.write(kandungan)
+
+        hasil: dict = dict()
+
+        with pelayan_tempatan(folder_sumber) as (url_asas, _, _):
+            semua_url: list = [
+                f'{url_asas}{SBHGN_URL}{os.path.basename(f)[:-4]}/SAHAM'
+                for f in glob(f'{folder_sumber}/*.htm')
+            ]
+
+            laman_screener: str = os.path.join(folder_kerja, "Screener.html")
+            with open(laman_screener, "w") as s:
+                s.write("".join(
+                    f'<a href="https://www.klsescreener.com/v2/stocks/view/{i}">{i}</a>'
+                    for i in range(bil_laman)
+                ))
+
+            folder_sebelum: str = os.path.join(folder_kerja, "sebelum")
+            os.makedirs(folder_sebelum)
+            masa_mula: float = time.perf_counter()
+
+            with ThreadPoolExecutor(max_workers=bil_pelayar) as executor:
+                list(executor.map(
+                    lambda url: _simpan_laman_asal(url, laman_screener, folder_sebelum),
+                    semua_url,
+                ))
+
+            hasil["sebelum"] = bil_laman / (time.perf_counter() - masa_mula)
+
+            folder_selepas: str = os.path.join(folder_kerja, "selepas")
+            masa_mula = time.perf_counter()
+
+            with Perayap(len(semua_url), bil_pelayar, folder_selepas) as perayap:
+                perayap.rayap(semua_url)
+
+            hasil["selepas"] = bil_laman / (time.perf_counter() - masa_mula)
+
+    return hasil
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-laman", type=int, default=300)
+    penghurai.add_argument("--bil-pelayar", type=int, default=4)
+    penghurai.add_argument("--saiz-laman", type=int, default=400_000)
+    hujah = penghurai.parse_args()
+
+    hasil: dict = utama(hujah.bil_laman, hujah.bil_pelayar, hujah.saiz_laman)
+
+    print(f'''
+ Laman sesaat (sebelum): {hasil["sebelum"]:.2f}
+ Laman sesaat (selepas): {hasil["selepas"]:.2f}
+ Kelajuan: {hasil["selepas"] / hasil["sebelum"]:.1f}x
+    ''')
@@ -0,0 +1,153 @@
+'''
+Penanda Aras Penilaian Ramalan: Matriks Draw Penuh Berbanding Cebisan Draw.
+
+Penanda aras ini menjana posterior sintetik dengan pemboleh ubah FORMULA dalam
+'menilai_saham.py' (lalai 4 rantai x 4000 draw) bagi 50, 200 dan 500 ticker, dan
+mengira purata serta HDI 94% peramal linear (seperti 'ramal_baris') bagi setiap ticker
+dan setiap bulan ufuk ramalan, dengan:
+1. Penuh: matriks draw x baris float64 yang lengkap dan 'az.hdi'.
+2. Cebisan: 'penilai_draw.ringkas_draw' dengan float64 dan float32.
+
+Bagi setiap mod, ia melaporkan memori puncak (tracemalloc, tidak termasuk posterior),
+masa dan beza mutlak maksimum berbanding mod penuh.
+
+Penggunaan:
+    python -m penanda_aras.ukur_ramalan --bil-ticker 50 200 500 --bil-bulan 12
+'''
+import argparse
+import arviz as az
+import numpy as np
+import pandas as pd
+import time
+import tracemalloc
+import xarray as xr
+
+
+from tabulate import tabulate
+
+
+from analisis_stat.penilai_draw import nilai_draw, ringkas_draw
+
+
+ISTILAH: list = ["Intercept", "1|Ticker", "1|tahun:Ticker", "bulan|tahun:Ticker"]
+HDI_PROB: float = .94
+
+
+def jana_posterior(
+        bil_ticker: int,
+        semua_tahun: list,
+        bil_rantai: int = 4,
+        bil_draw: int = 4000,
+        benih: int = 0,
+    ) -> xr.Dataset:
+    '''
+    Menjana posterior sintetik dengan koordinat dan nama pemboleh ubah seperti Bambi.
+    '''
+    rng: np.random.Generator = np.random.default_rng(benih)
+    ticker: list = [f'{1000 + i:04d}.KL' for i in range(bil_ticker)]
+    tahun_ticker: list = [f'{t}:{k}' for t in semua_tahun for k in ticker]
+
+    def draw(*aras) -> np.ndarray:
+        return rng.normal(0, 1, (bil_rantai, bil_draw, *aras))
+
+    return xr.Dataset(
+        {
+            "Intercept": (("chain", "draw"), draw()),
+            "1|Ticker": (("chain", "draw", "Ticker__factor_dim"), draw(len(ticker))),
+            "1|tahun:Ticker": (
+                ("chain", "draw", "tahun:Ticker__factor_dim"), draw(len(tahun_ticker))
+            ),
+            "bulan|tahun:Ticker": (
+                ("chain", "draw", "tahun:Ticker__factor_dim"), .1 * draw(len(tahun_ticker))
+            ),
+        },
+        coords={
+            "chain": np.arange(bil_rantai),
+            "draw": np.arange(bil_draw),
+            "Ticker__factor_dim": ticker,
+            "tahun:Ticker__factor_dim": tahun_ticker,
+        },
+    )
+
+
+def ringkas_penuh(posterior: xr.Dataset, baris: pd.DataFrame) -> np.ndarray:
+    '''
+    Membina matriks penuh draw x baris float64 dan meringkaskannya dengan 'az.hdi'.
+    '''
+    bil_sampel: int = posterior.sizes["chain"] * posterior.sizes["draw"]
+    penuh: np.ndarray = next(nilai_draw(posterior, baris, ISTILAH, bil_sampel))
+
+    return np.column_stack([penuh.mean(axis=0), az.hdi(penuh[np.newaxis], hdi_prob=HDI_PROB)])
+
+
+def _ukur(fungsi) -> tuple:
+    '''
+    Mengembalikan hasil fungsi, memori puncak (MB) dan masa (saat).
+    '''
+    tracemalloc.start()
+    masa_mula: float = time.perf_counter()
+    hasil = fungsi()
+    tempoh: float = time.perf_counter() - masa_mula
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return hasil, puncak / 2**20, tempoh
+
+
+def utama(
+        semua_bil_ticker: list,
+        bil_bulan: int,
+        bil_draw: int,
+        saiz_cebisan: int,
+    ) -> list:
+    '''
+    Menjalankan penanda aras dan mengembalikan satu baris keputusan bagi setiap
+    bilangan ticker dan mod.
+
+    Returns:
+        list: Senarai kamus dengan kunci 'bil_ticker', 'baris', 'mod', 'mb_puncak',
+        'saat' dan 'beza_maks'.
+    '''
+    semua_hasil: list = []
+
+    for bil_ticker in semua_bil_ticker:
+        posterior: xr.Dataset = jana_posterior(bil_ticker, [2024, 2025], bil_draw=bil_draw)
+        baris: pd.DataFrame = pd.DataFrame(
+            [(k, 2025, b) for k in posterior["Ticker__factor_dim"].to_numpy()
+            for b in range(1, bil_bulan + 1)],
+            columns=["Ticker", "tahun", "bulan"],
+        )
+
+        rujukan, mb_puncak, saat = _ukur(lambda: ringkas_penuh(posterior, baris))
+        semua_hasil.append({
+            "bil_ticker": bil_ticker, "baris": len(baris), "mod": "penuh (float64)",
+            "mb_puncak": mb_puncak, "saat": saat, "beza_maks": 0.,
+        })
+
+        for jenis in ["float64", "float32"]:
+            hasil, mb_puncak, saat = _ukur(lambda: ringkas_draw(
+                posterior, baris, ISTILAH, [], saiz_cebisan, jenis, HDI_PROB
+            ))
+            semua_hasil.append({
+                "bil_ticker": bil_ticker, "baris": len(baris), "mod": f'cebisan ({jenis})',
+                "mb_puncak": mb_puncak, "saat": saat,
+                "beza_maks": float(np.abs(hasil - rujukan).max()),
+            })
+
+    return semua_hasil
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-ticker", type=int, nargs="+", default=[50, 200, 500])
+    penghurai.add_argument("--bil-bulan", type=int, default=12)
+    penghurai.add_argument("--bil-draw", type=int, default=4000)
+    penghurai.add_argument("--saiz-cebisan", type=int, default=500)
+    hujah = penghurai.parse_args()
+
+    print(tabulate(
+        utama(hujah.bil_ticker, hujah.bil_bulan, hujah.bil_draw, hujah.saiz_cebisan),
+        headers="keys",
+        tablefmt="fancy_grid",
+        floatfmt=".4f",
+    ))
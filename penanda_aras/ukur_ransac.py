@@ -0,0 +1,149 @@
+'''
+Penanda Aras dan Ujian Persetujuan RANSAC Berkelompok.
+
+Penanda aras ini menjana panel sintetik siri EPS tahunan (sekitar 12 titik bagi setiap
+saham, dengan beberapa pencilan), kemudian:
+1. Mengukur masa 'regresi.dapatkan_inlier' (RANSACRegressor sklearn bagi setiap saham)
+   berbanding 'regresi.dapatkan_inlier_berkelompok' (semua saham serentak).
+2. Menguji persetujuan topeng inlier antara kedua-duanya: peratus saham dengan topeng
+   yang sama, dan purata indeks Jaccard. Sebagai rujukan, persetujuan sklearn dengan
+   dirinya sendiri (benih berbeza) turut dikira, kerana RANSAC adalah rawak dan
+   inlier bagi data yang kabur berubah mengikut benih.
+3. Memastikan 'dapatkan_inlier_berkelompok' memberi hasil yang sama bagi benih yang
+   sama, dan inlier setiap saham tidak berubah apabila separuh saham lain dibuang
+   daripada panel.
+
+Penggunaan:
+    python -m penanda_aras.ukur_ransac --bil-saham 2000
+'''
+import argparse
+import numpy as np
+import pandas as pd
+import time
+
+
+from analisis_stat import regresi
+
+
+def jana_panel_eps(bil_saham: int, bil_tahun: int = 12, benih: int = 0) -> pd.DataFrame:
+    '''
+    Menjana panel sintetik format panjang dengan lajur 'kod', 'fy', 'eps' dan 'dps'.
+
+    Setiap saham mempunyai trend linear dengan hingar normal, dan sekitar 15% titik
+    digantikan dengan pencilan yang besar.
+
+    Args:
+        bil_saham (int): Bilangan saham.
+        bil_tahun (int): Bilangan tahun kewangan bagi setiap saham.
+        benih (int): Benih penjana nombor rawak.
+
+    Returns:
+        pd.DataFrame: Panel EPS dan DPS sintetik.
+    '''
+    rng: np.random.Generator = np.random.default_rng(benih)
+
+    fy: np.ndarray = np.tile(np.arange(2012, 2012 + bil_tahun), bil_saham)
+    kod: np.ndarray = np.repeat([f'{1000 + i:04d}' for i in range(bil_saham)], bil_tahun)
+    t: np.ndarray = fy - 2012
+
+    def siri(skala: float) -> np.ndarray:
+        cerun: np.ndarray = np.repeat(rng.normal(.2, .5, bil_saham), bil_tahun)
+        pintasan: np.ndarray = np.repeat(rng.normal(5, 2, bil_saham), bil_tahun)
+        nilai: np.ndarray = skala * (pintasan + cerun * t + rng.normal(0, .5, len(t)))
+        pencilan: np.ndarray = rng.random(len(t)) < .15
+        nilai[pencilan] += skala * rng.normal(0, 8, pencilan.sum())
+        return nilai
+
+    return pd.DataFrame({"kod": kod, "fy": fy, "eps": siri(1.), "dps": siri(.5)})
+
+
+def _banding_topeng(kod: pd.Series, a: np.ndarray, b: np.ndarray) -> pd.DataFrame:
+    '''
+    Mengembalikan, bagi setiap saham, sama ada topeng a dan b sama, serta bilangan
+    titik dalam persilangan dan kesatuan kedua-duanya.
+    '''
+    return pd.DataFrame({
+        "kod": kod, "sama": a == b, "dan": a & b, "atau": a | b,
+    }).groupby("kod").agg({"sama": "all", "dan": "sum", "atau": "sum"})
+
+
+def utama(bil_saham: int, benih: int) -> dict:
+    '''
+    Menjalankan penanda aras dan ujian persetujuan.
+
+    Returns:
+        dict: Kamus dengan masa (saat) bagi sklearn dan berkelompok, saham sesaat,
+        peratus topeng sama dan purata Jaccard (berbanding sklearn, dan sklearn
+        berbanding sklearn dengan benih lain), sama ada hasil boleh diulang, dan sama
+        ada inlier setiap saham bebas daripada saham lain dalam panel.
+    '''
+    panel: pd.DataFrame = jana_panel_eps(bil_saham, benih=benih)
+
+    masa_mula: float = time.perf_counter()
+    topeng_sklearn: np.ndarray = np.zeros(len(panel), dtype=bool)
+
+    for i, (_, df) in enumerate(panel.groupby("kod")):
+        topeng_sklearn[regresi.dapatkan_inlier(df, "fy", "eps", benih=benih + i).index] = True
+
+    masa_sklearn: float = time.perf_counter() - masa_mula
+
+    topeng_rujukan: np.ndarray = np.zeros(len(panel), dtype=bool)
+
+    for i, (_, df) in enumerate(panel.groupby("kod")):
+        topeng_rujukan[regresi.dapatkan_inlier(df, "fy", "eps", benih=benih + i + bil_saham).index] = True
+
+    masa_mula = time.perf_counter()
+    inlier: pd.DataFrame = regresi.dapatkan_inlier_berkelompok(
+        panel, "kod", "fy", "eps", benih=benih
+    )
+    masa_berkelompok: float = time.perf_counter() - masa_mula
+
+    topeng_berkelompok: np.ndarray = panel.index.isin(inlier.index)
+    ulang: pd.DataFrame = regresi.dapatkan_inlier_berkelompok(
+        panel, "kod", "fy", "eps", benih=benih
+    )
+
+    separuh: np.ndarray = np.sort(panel["kod"].unique())[bil_saham // 2:]
+    inlier_separuh: pd.DataFrame = regresi.dapatkan_inlier_berkelompok(
+        panel[panel["kod"].isin(separuh)], "kod", "fy", "eps", benih=benih
+    )
+    bebas_panel: bool = inlier_separuh.index.equals(
+        inlier.index[inlier["kod"].isin(separuh)]
+    )
+    assert bebas_panel, "Inlier saham berubah apabila saham lain dibuang daripada panel."
+
+    banding: pd.DataFrame = _banding_topeng(panel["kod"], topeng_sklearn, topeng_berkelompok)
+    rujukan: pd.DataFrame = _banding_topeng(panel["kod"], topeng_sklearn, topeng_rujukan)
+
+    return {
+        "masa_sklearn": masa_sklearn,
+        "masa_berkelompok": masa_berkelompok,
+        "saham_sesaat_sklearn": bil_saham / masa_sklearn,
+        "saham_sesaat_berkelompok": bil_saham / masa_berkelompok,
+        "peratus_sama": banding["sama"].mean(),
+        "purata_jaccard": (banding["dan"] / banding["atau"]).mean(),
+        "peratus_sama_rujukan": rujukan["sama"].mean(),
+        "purata_jaccard_rujukan": (rujukan["dan"] / rujukan["atau"]).mean(),
+        "boleh_diulang": inlier.index.equals(ulang.index),
+        "bebas_panel": bebas_panel,
+    }
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-saham", type=int, default=2000)
+    penghurai.add_argument("--benih", type=int, default=0)
+    hujah = penghurai.parse_args()
+
+    hasil: dict = utama(hujah.bil_saham, hujah.benih)
+
+    print(f'''
+ Masa sklearn (setiap saham):  {hasil["masa_sklearn"]:.2f} s ({hasil["saham_sesaat_sklearn"]:.0f} saham/s)
+ Masa berkelompok (NumPy):     {hasil["masa_berkelompok"]:.3f} s ({hasil["saham_sesaat_berkelompok"]:.0f} saham/s)
+ Kelajuan: {hasil["masa_sklearn"] / hasil["masa_berkelompok"]:.0f}x
+
+ Topeng inlier sama dengan sklearn: {hasil["peratus_sama"]:.1%} saham (rujukan sklearn lwn sklearn: {hasil["peratus_sama_rujukan"]:.1%})
+ Purata indeks Jaccard:             {hasil["purata_jaccard"]:.3f} (rujukan sklearn lwn sklearn: {hasil["purata_jaccard_rujukan"]:.3f})
+ Boleh diulang dengan benih sama:   {hasil["boleh_diulang"]}
+ Bebas daripada saham lain:         {hasil["bebas_panel"]}
+    ''')
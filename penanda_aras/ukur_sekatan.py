@@ -0,0 +1,109 @@
+'''
+Penanda Aras Penyekatan Sumber dan Pengekstrakan Fragmen.
+
+Penanda aras ini menjana laman saham sintetik (dengan gambar, CSS, skrip, iklan dan
+analitik), menyajikannya melalui pelayan HTTP tempatan (skrip iklan dan analitik
+daripada hos pihak ketiga yang berasingan), dan mengukur bagi setiap laman:
+- lebar jalur: bait yang dihantar oleh pelayan,
+- masa memuatkan laman,
+- saiz file yang disimpan,
+bagi tiga mod muat turun: penuh, sekat (sumber tidak perlu disekat) dan fragmen (sekat
+dan simpan hanya <title>, #price dan jadual financial_reports).
+
+Penggunaan:
+    python -m penanda_aras.ukur_sekatan --bil-laman 50
+'''
+import argparse
+import os
+import tempfile
+import time
+
+
+from glob import glob
+from tabulate import tabulate
+
+
+from pelombongan.perayap import Perayap
+from penanda_aras.data_sintetik import SBHGN_URL, jana_semua_laman
+from penanda_aras.pelayan_tempatan import pelayan_tempatan
+
+
+SEMUA_MOD: dict = {
+    "penuh": {"sekat_sumber": False, "fragmen_sahaja": False},
+    "sekat": {"sekat_sumber": True, "fragmen_sahaja": False},
+    "fragmen": {"sekat_sumber": True, "fragmen_sahaja": True},
+}
+
+
+def utama(bil_laman: int, saiz_laman: int, saiz_aset: int) -> list:
+    '''
+    Menjalankan penanda aras dan mengembalikan satu baris keputusan bagi setiap mod.
+
+    Args:
+        bil_laman (int): Bilangan laman sintetik yang dimuat turun bagi setiap mod.
+        saiz_laman (int): Anggaran saiz setiap laman dalam bait.
+        saiz_aset (int): Saiz setiap aset (gambar, CSS, skrip) dalam bait.
+
+    Returns:
+        list: Senarai kamus dengan kunci 'mod', 'kb_rangkaian', 'ms_laman' dan
+        'kb_cakera', semuanya purata bagi setiap laman.
+    '''
+    semua_hasil: list = []
+
+    with tempfile.TemporaryDirectory() as folder_kerja:
+        folder_sumber: str = os.path.join(folder_kerja, "sumber")
+        os.makedirs(folder_sumber)
+
+        for kod, kandungan in jana_semua_laman(bil_laman, saiz_laman).items():
+            with open(os.path.join(folder_sumber, f'{kod}.htm'), "w", encoding="utf-8") as l:
+                l.write(kandungan)
+
+        with pelayan_tempatan(folder_sumber, saiz_aset) as (
+            url_asas, statistik, argumen_pelayar
+        ):
+            semua_url: list = [
+                f'{url_asas}{SBHGN_URL}{os.path.basename(f)[:-4]}/SAHAM'
+                for f in glob(f'{folder_sumber}/*.htm')
+            ]
+
+            for mod, tetapan in SEMUA_MOD.items():
+                folder_mod: str = os.path.join(folder_kerja, mod)
+
+# satu pelayar sahaja supaya masa yang diukur adalah masa memuatkan setiap laman.
+                with Perayap(
+                    bil_laman, 1, folder_mod, argumen_pelayar=argumen_pelayar, **tetapan
+                ) as perayap:
+                    perayap.rayap(semua_url[:1])
+                    bait_mula: int = statistik["bait"]
+                    masa_mula: float = time.perf_counter()
+                    perayap.rayap(semua_url)
+                    tempoh: float = time.perf_counter() - masa_mula
+                    bait: int = statistik["bait"] - bait_mula
+
+                saiz_cakera: int = sum(
+                    os.path.getsize(f) for f in glob(f'{folder_mod}/*.htm')
+                )
+
+                semua_hasil.append({
+                    "mod": mod,
+                    "kb_rangkaian": bait / bil_laman / 1024,
+                    "ms_laman": tempoh / bil_laman * 1000,
+                    "kb_cakera": saiz_cakera / bil_laman / 1024,
+                })
+
+    return semua_hasil
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-laman", type=int, default=50)
+    penghurai.add_argument("--saiz-laman", type=int, default=400_000)
+    penghurai.add_argument("--saiz-aset", type=int, default=50_000)
+    hujah = penghurai.parse_args()
+
+    print(tabulate(
+        utama(hujah.bil_laman, hujah.saiz_laman, hujah.saiz_aset),
+        headers="keys",
+        tablefmt="fancy_grid",
+        floatfmt=".1f",
+    ))
@@ -0,0 +1,115 @@
+'''
+Penanda Aras Latihan Berserpihan: Satu Model Berbanding Serpihan Ticker Selari.
+
+Penanda aras ini menjana harga harian sintetik bagi beberapa bilangan ticker (lalai
+50, 100 dan 200) dan melatih model dalam 'menilai_saham.py' dengan statistik bulanan
+('--agregat'):
+1. Satu model bagi semua ticker ('dapatkan_posterior').
+2. Serpihan kira-kira '--saiz-serpihan' ticker yang dilatih secara selari
+   ('latih_berserpihan'), dengan pengumpulan 'bebas' dan 'hiper'.
+
+Bagi setiap mod, ia melaporkan masa latihan, serta hanyutan ramalan bulan terakhir
+dan nisbah lebar HDI berbanding satu model (seperti 'ukur_inferens'). Masa latihan
+serpihan sepatutnya kekal hampir malar apabila bilangan ticker bertambah, selagi
+bilangan serpihan tidak melebihi bilangan teras.
+
+Penggunaan:
+    python -m penanda_aras.ukur_serpihan --bil-ticker 50 100 200 --saiz-serpihan 25
+'''
+import argparse
+import math
+import pandas as pd
+import tempfile
+import time
+
+
+from tabulate import tabulate
+
+
+import menilai_saham
+from modulam.simpanan_posterior import SimpananPosterior
+from penanda_aras.ukur_agregat import sediakan_data_sintetik
+from penanda_aras.ukur_inferens import bandingkan_ramalan
+
+
+def utama(
+        semua_bil_ticker: list,
+        saiz_serpihan: int,
+        draw_tune: int,
+        cores: int,
+        proses: int = None,
+    ) -> list:
+    '''
+    Menjalankan penanda aras dan mengembalikan satu baris keputusan bagi setiap
+    bilangan ticker dan mod.
+
+    Returns:
+        list: Senarai kamus dengan kunci 'bil_ticker', 'mod', 'bil_serpihan', 'saat',
+        'tren_sama', 'hanyut_ramalan' dan 'nisbah_hdi'.
+    '''
+    semua_hasil: list = []
+
+    for bil_ticker in semua_bil_ticker:
+        ticker, data, harga_semasa, penskala = sediakan_data_sintetik(bil_ticker)
+        data = menilai_saham.agregat_data(data)
+        tahun: int = int(data["tahun"].max())
+        bulan: int = int(data.loc[data["tahun"] == tahun, "bulan"].max())
+        bil_serpihan: int = math.ceil(bil_ticker / saiz_serpihan)
+        rujukan: pd.DataFrame = None
+
+        for mod in ["satu", "bebas", "hiper"]:
+# folder sementara supaya setiap mod dilatih dan tidak dimuat daripada simpanan.
+            with tempfile.TemporaryDirectory() as folder:
+                simpanan: SimpananPosterior = SimpananPosterior(folder)
+                masa_mula: float = time.perf_counter()
+
+                if mod == "satu":
+                    _, _, folder_posterior = menilai_saham.dapatkan_posterior(
+                        data, penskala, draw_tune, .95, cores, True, simpanan=simpanan
+                    )
+                    semua_folder: list = [folder_posterior]
+                else:
+                    semua_folder = menilai_saham.latih_berserpihan(
+                        data,
+                        penskala,
+                        bil_serpihan,
+                        draw_tune,
+                        .95,
+                        agregat=True,
+                        simpanan=simpanan,
+                        pengumpulan=mod,
+                        proses=proses,
+                    )
+
+                tempoh: float = time.perf_counter() - masa_mula
+                ramalan: pd.DataFrame = menilai_saham.ramal_berserpihan(
+                    semua_folder, tahun, bulan, ticker, harga_semasa
+                )
+
+            rujukan = ramalan if rujukan is None else rujukan
+            semua_hasil.append({
+                "bil_ticker": bil_ticker,
+                "mod": mod,
+                "bil_serpihan": len(semua_folder),
+                "saat": tempoh,
+                **bandingkan_ramalan(ramalan, rujukan),
+            })
+
+    return semua_hasil
+
+
+if __name__ == "__main__":
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--bil-ticker", type=int, nargs="+", default=[50, 100, 200])
+    penghurai.add_argument("--saiz-serpihan", type=int, default=25)
+    penghurai.add_argument("--draw-tune", type=int, default=500)
+    penghurai.add_argument("--cores", type=int, default=4)
+    penghurai.add_argument("--proses", type=int, default=None)
+    hujah = penghurai.parse_args()
+
+    print(tabulate(
+        utama(hujah.bil_ticker, hujah.saiz_serpihan, hujah.draw_tune, hujah.cores, hujah.proses),
+        headers="keys",
+        tablefmt="fancy_grid",
+        floatfmt=".2f",
+    ))
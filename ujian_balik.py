@@ -0,0 +1,351 @@
+'''
+Ujian Balik Walk-Forward bagi Saringan Cerun dan Isyarat Ramalan.
+
+File ini mengukur sama ada saringan cerun EPS/DPS ('melombong_data.py') dan isyarat
+'harga_beli' serta 'peluang' ('menilai_saham.py') berjaya pada suku tahun yang lepas,
+tanpa menjalankan saluran paip penuh berulang kali. Setiap lipatan ialah satu tarikh
+potong (hujung suku tahun):
+1. Saringan: 'saringan.saring' dengan panel asas yang tersimpan dan tahun_ini = tahun
+   tarikh potong, jadi hanya tahun kewangan sebelum tahun tersebut digunakan.
+2. Model: Harga 3 tahun hingga tarikh potong bagi saham bagus dipiawaikan dan model
+   dilatih (atau dimuat daripada simpanan posterior) dengan 'dapatkan_posterior'.
+3. Ramalan: 'ramal_baris' bagi bulan-bulan ufuk selepas tarikh potong.
+4. Penilaian: Harga sebenar ialah purata harga tutup setiap bulan ufuk. Pulangan
+   dikira berbanding harga tutup pada tarikh potong.
+
+Lipatan adalah bebas, jadi ia dijalankan secara selari dalam kumpulan proses. Panel
+harga dikongsi dengan semua proses melalui memori kongsi ('PanelKongsi') dan tidak
+di-pickle bagi setiap lipatan.
+
+Inferens dipilih dengan '--kaedah-inferens' (contohnya 'advi' atau 'pathfinder' yang
+pantas, atau 'nuts'), dan posterior setiap lipatan disimpan dalam '--folder-posterior'
+supaya larian semula (contohnya dengan ufuk atau tempoh lain) memuat posterior tanpa
+melatih semula. '--tanpa-simpanan' melatih setiap lipatan dalam folder sementara.
+
+Catatan:
+    - Hanya suku tahun yang ufuk ramalannya masih dalam tahun yang sama diuji, kerana
+      kesan tahun:Ticker bagi tahun baharu tiada dalam model.
+    - Panel asas ialah data EPS/DPS terkini, jadi angka yang dinyatakan semula selepas
+      tarikh potong turut digunakan.
+
+Penggunaan:
+    python ujian_balik.py --mula 2023-01-01 --tamat 2025-09-30 --kaedah-inferens advi
+    python ujian_balik.py --fail-harga harga.parquet --ufuk 3 --proses 8
+'''
+import argparse
+import pandas as pd
+import tempfile
+
+
+from functools import partial
+from multiprocessing import Pool
+from tabulate import tabulate
+
+
+import menilai_saham
+from analisis_stat import saringan
+from modulam.panel_kongsi import PanelKongsi
+from modulam.simpanan_posterior import SimpananPosterior
+from pelombongan import pelombong
+from pelombongan.pembekal_harga import PembekalFail, PembekalYahoo, SimpananHarga
+
+
+# bilangan tahun sejarah harga bagi setiap lipatan, sama seperti 'sediakan_data'.
+TEMPOH_SEJARAH: int = 3
+
+# panel harga dalam proses pekerja, dibuka sekali oleh '_mula_pekerja'.
+_PANEL: pd.DataFrame = None
+
+
+def tarikh_potong(mula: str, tamat: str, ufuk: int) -> list:
+    '''
+    Mengembalikan hujung setiap suku tahun antara mula dan tamat yang ufuk ramalannya
+    ('ufuk' bulan) masih dalam tahun yang sama.
+    '''
+    return [
+        potong for potong in pd.date_range(mula, tamat, freq="QE")
+        if potong.month + ufuk <= 12
+    ]
+
+
+def nilai_lipatan(
+        data: pd.DataFrame,
+        potong: pd.Timestamp,
+        hasil_saringan: pd.DataFrame,
+        ufuk: int,
+        draw_tune: int,
+        target_accept: float,
+        agregat: bool,
+        kaedah: str,
+        folder_posterior: str,
+    ) -> dict:
+    '''
+    Menilai satu lipatan: melatih model pada sejarah hingga tarikh potong, meramal
+    bulan ufuk dan membandingkan isyarat dengan harga sebenar.
+
+    Args:
+        data (pd.DataFrame): Panel harga daripada 'pelombong.dapatkan_data_saham' bagi
+        semua saham yang disaring, termasuk harga selepas tarikh potong.
+        potong (pd.Timestamp): Tarikh potong.
+        hasil_saringan (pd.DataFrame): Hasil 'saringan.saring' bagi tahun tarikh potong.
+        ufuk (int): Bilangan bulan selepas tarikh potong yang diramal.
+        draw_tune, target_accept, agregat, kaedah: Seperti 'dapatkan_posterior'.
+        folder_posterior (str): Folder simpanan posterior.
+
+    Returns:
+        dict: Kamus dengan kunci:
+            - potong (str): Tarikh potong.
+            - bil_saring (int): Bilangan saham bagus.
+            - pulangan_saring, pulangan_semua (float): Purata pulangan saham bagus dan
+            semua saham yang disaring.
+            - bil_peluang, kena_peluang, pulangan_peluang: Bilangan baris (Ticker, bulan)
+            dengan harga potong di bawah batas bawah ramalan, pecahan yang pulangannya
+            positif dan purata pulangannya.
+            - bil_beli, kena_beli, pulangan_beli: Seperti di atas, bagi harga potong di
+            bawah 'harga_beli'.
+            - liputan (float): Pecahan harga sebenar dalam selang ramalan.
+        Lipatan tanpa harga saham bagus hanya mempunyai empat kunci pertama.
+    '''
+    semua_bulan: list = list(range(potong.month + 1, potong.month + ufuk + 1))
+    saham_bagus: pd.Series = hasil_saringan.loc[hasil_saringan["cerun"] > 0, "kod"]
+
+    sejarah: pd.DataFrame = data[
+        (data["Date"] > potong - pd.DateOffset(years=TEMPOH_SEJARAH)) & (data["Date"] <= potong)
+    ]
+    masa_depan: pd.DataFrame = data[
+        (data["tahun"] == potong.year) & data["bulan"].isin(semua_bulan)
+    ]
+
+# pulangan setiap (Ticker, bulan) ialah purata harga bulan itu berbanding harga potong.
+    harga_potong: pd.Series = sejarah.sort_values("Date").groupby(
+        "Ticker", observed=True
+    )["Close"].last().astype("float64")
+    harga_potong.index = harga_potong.index.astype(str)
+    sebenar: pd.DataFrame = masa_depan.groupby(
+        ["Ticker", "bulan"], observed=True
+    )["Close"].mean().astype("float64").rename("harga_sebenar").reset_index()
+    sebenar["Ticker"] = sebenar["Ticker"].astype(str)
+    sebenar["pulangan"] = sebenar["harga_sebenar"] / sebenar["Ticker"].map(harga_potong) - 1
+
+    pulangan_saham: pd.Series = sebenar.groupby("Ticker")["pulangan"].mean()
+
+    hasil: dict = {
+        "potong": potong.date().isoformat(),
+        "bil_saring": len(saham_bagus),
+        "pulangan_saring": pulangan_saham[pulangan_saham.index.isin(saham_bagus)].mean(),
+        "pulangan_semua": pulangan_saham[
+            pulangan_saham.index.isin(hasil_saringan["kod"])
+        ].mean(),
+    }
+
+    data_model: pd.DataFrame = sejarah[sejarah["Ticker"].isin(saham_bagus)].reset_index(drop=True)
+
+    if data_model.empty:
+        return hasil
+
+    for lajur in ["Ticker", "nama"]:
+        data_model[lajur] = data_model[lajur].cat.remove_unused_categories()
+
+    data_model, _, penskala = menilai_saham.piawaikan_data(data_model)
+
+    if agregat:
+        data_model = menilai_saham.agregat_data(data_model)
+
+    model, idata, _ = menilai_saham.dapatkan_posterior(
+        data_model,
+        penskala,
+        draw_tune,
+        target_accept,
+        cores=1,
+        agregat=agregat,
+        kaedah=kaedah,
+        simpanan=SimpananPosterior(folder_posterior),
+    )
+
+    ramalan: pd.DataFrame = menilai_saham.ramal_baris(
+        model, idata, potong.year, semua_bulan, penskala
+    )
+    ramalan["Ticker"] = ramalan["Ticker"].astype(str)
+    ramalan["bulan"] = ramalan["bulan"].astype(sebenar["bulan"].dtype)
+    ramalan = ramalan.merge(sebenar, on=["Ticker", "bulan"])
+    ramalan["harga_potong"] = ramalan["Ticker"].map(harga_potong)
+
+    isyarat: dict = {
+        "peluang": ramalan["harga_potong"] < ramalan["bawah"],
+        "beli": ramalan["harga_potong"] <= ramalan["harga_ramalan"] / 1.05,
+    }
+
+    for nama, pilihan in isyarat.items():
+        hasil[f'bil_{nama}'] = int(pilihan.sum())
+        hasil[f'kena_{nama}'] = (ramalan.loc[pilihan, "pulangan"] > 0).mean()
+        hasil[f'pulangan_{nama}'] = ramalan.loc[pilihan, "pulangan"].mean()
+
+    hasil["liputan"] = ramalan["harga_sebenar"].between(
+        ramalan["bawah"], ramalan["atas"]
+    ).mean()
+
+    return hasil
+
+
+def _mula_pekerja(keterangan: dict) -> None:
+    '''
+    Membuka panel harga dalam memori kongsi sekali bagi setiap proses pekerja.
+    '''
+    global _PANEL
+    _PANEL = PanelKongsi.buka(keterangan)
+
+
+def _lipatan(tugasan: tuple, **tetapan) -> dict:
+    potong, hasil_saringan = tugasan
+
+    return nilai_lipatan(_PANEL, potong, hasil_saringan, **tetapan)
+
+
+def ujian_balik(
+        panel_asas: pd.DataFrame,
+        pembekal,
+        semua_potong: list,
+        ufuk: int = 1,
+        min_inlier: int = 7,
+        alpha: float = 0.05,
+        draw_tune: int = 1000,
+        target_accept: float = .95,
+        agregat: bool = True,
+        kaedah: str = "advi",
+        folder_posterior: str = "simpanan/posterior",
+        proses: int = None,
+    ) -> pd.DataFrame:
+    '''
+    Menjalankan ujian balik walk-forward bagi semua tarikh potong.
+
+    Saringan dikira sekali bagi setiap tahun dalam proses utama (ia sudah dikira
+    serentak bagi semua saham). Harga semua saham yang disaring diambil sekali, diletak
+    dalam memori kongsi, dan setiap lipatan dinilai dengan 'nilai_lipatan' dalam
+    kumpulan proses dengan satu teras bagi setiap lipatan.
+
+    Args:
+        panel_asas (pd.DataFrame): Panel asas daripada 'simpanan/asas.parquet'.
+        pembekal: Pembekal harga bagi 'pelombong.dapatkan_data_saham'.
+        semua_potong (list): Tarikh potong daripada 'tarikh_potong'.
+        ufuk (int): Bilangan bulan yang diramal selepas setiap tarikh potong.
+        min_inlier, alpha: Seperti 'saringan.saring'.
+        draw_tune, target_accept, agregat, kaedah, folder_posterior: Seperti
+        'nilai_lipatan'.
+        proses (int): Bilangan proses. Jika None, bilangan teras komputer.
+
+    Returns:
+        pd.DataFrame: Satu baris 'nilai_lipatan' bagi setiap tarikh potong.
+    '''
+    semua_saringan: dict = {
+        tahun: saringan.saring(panel_asas, tahun, min_inlier, alpha)
+        for tahun in sorted({potong.year for potong in semua_potong})
+    }
+    semua_saham: pd.DataFrame = pd.concat(semua_saringan.values()).drop_duplicates("kod")
+
+    data: pd.DataFrame = pelombong.dapatkan_data_saham(
+        dict(zip(semua_saham["kod"], semua_saham["nama"])),
+        pembekal,
+        tempoh_tahun=pd.Timestamp.today().year - min(semua_saringan) + TEMPOH_SEJARAH + 1,
+    )
+
+    with PanelKongsi(data) as panel:
+        del data
+
+        with Pool(proses, initializer=_mula_pekerja, initargs=(panel.keterangan,)) as p:
+            semua_hasil: list = p.map(
+                partial(
+                    _lipatan,
+                    ufuk=ufuk,
+                    draw_tune=draw_tune,
+                    target_accept=target_accept,
+                    agregat=agregat,
+                    kaedah=kaedah,
+                    folder_posterior=folder_posterior,
+                ),
+                [(potong, semua_saringan[potong.year]) for potong in semua_potong],
+                chunksize=1,
+            )
+
+    return pd.DataFrame(semua_hasil)
+
+
+def hurai_hujah(hujah: list = None) -> argparse.Namespace:
+    '''
+    Menghurai parameter ujian balik daripada baris perintah.
+    '''
+    hari_ini: pd.Timestamp = pd.Timestamp.today().normalize()
+
+    penghurai = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    penghurai.add_argument("--fail-panel", default="simpanan/asas.parquet")
+    penghurai.add_argument(
+        "--fail-harga", help="File harga CSV/Parquet (Date, Ticker, Close) untuk larian tanpa internet."
+    )
+    penghurai.add_argument("--folder-harga", default="simpanan/harga")
+    penghurai.add_argument(
+        "--mula", default=(hari_ini - pd.DateOffset(years=2)).date().isoformat()
+    )
+    penghurai.add_argument("--tamat", default=hari_ini.date().isoformat())
+    penghurai.add_argument("--ufuk", type=int, default=1)
+    penghurai.add_argument("--min-inlier", type=int, default=7)
+    penghurai.add_argument("--alpha", type=float, default=0.05)
+    penghurai.add_argument(
+        "--kaedah-inferens",
+        choices=menilai_saham.SEMUA_KAEDAH,
+        default="advi",
+        help="'advi' dan 'pathfinder' pantas; 'nuts' paling tepat tetapi perlahan.",
+    )
+    penghurai.add_argument("--draw-tune", type=int, default=1000)
+    penghurai.add_argument("--target-accept", type=float, default=0.95)
+    penghurai.add_argument(
+        "--harian",
+        action="store_true",
+        help="Latih dengan harga harian dan bukan statistik bulanan ('--agregat').",
+    )
+    penghurai.add_argument("--folder-posterior", default="simpanan/posterior")
+    penghurai.add_argument(
+        "--tanpa-simpanan",
+        action="store_true",
+        help="Latih setiap lipatan tanpa memuat atau menyimpan posterior.",
+    )
+    penghurai.add_argument("--proses", type=int, help="Bilangan proses bagi lipatan.")
+    penghurai.add_argument("--fail-output", help="File CSV bagi keputusan setiap lipatan.")
+
+    return penghurai.parse_args(hujah)
+
+
+if __name__ == "__main__":
+    tetapan: argparse.Namespace = hurai_hujah()
+    pembekal: SimpananHarga = SimpananHarga(
+        PembekalFail(tetapan.fail_harga) if tetapan.fail_harga else PembekalYahoo(),
+        tetapan.folder_harga,
+    )
+
+    with tempfile.TemporaryDirectory() as folder_sementara:
+        keputusan: pd.DataFrame = ujian_balik(
+            pd.read_parquet(tetapan.fail_panel),
+            pembekal,
+            tarikh_potong(tetapan.mula, tetapan.tamat, tetapan.ufuk),
+            tetapan.ufuk,
+            tetapan.min_inlier,
+            tetapan.alpha,
+            tetapan.draw_tune,
+            tetapan.target_accept,
+            not tetapan.harian,
+            tetapan.kaedah_inferens,
+            folder_sementara if tetapan.tanpa_simpanan else tetapan.folder_posterior,
+            tetapan.proses,
+        )
+
+    if tetapan.fail_output:
+        keputusan.to_csv(tetapan.fail_output, index=False)
+
+    print(tabulate(
+        pd.concat([
+            keputusan,
+            keputusan.drop(columns="potong").mean().to_frame().T.assign(potong="purata"),
+        ]),
+        headers="keys",
+        showindex=False,
+        tablefmt="fancy_grid",
+        floatfmt=".3f",
+    ))